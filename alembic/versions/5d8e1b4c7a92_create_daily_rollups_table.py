@@ -0,0 +1,47 @@
+"""create daily_rollups table
+
+Revision ID: 5d8e1b4c7a92
+Revises: a3f9c2d71e48
+Create Date: 2026-10-17 11:03:52.271904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e1b4c7a92'
+down_revision: Union[str, Sequence[str], None] = 'a3f9c2d71e48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'metric', 'shard')
+    )
+    
+    # 기존 데이터로 채움 (샤드 0, AI 분석 수는 기록이 없어 이후부터)
+    op.execute("""
+        INSERT INTO daily_rollups (day, metric, shard, count)
+        SELECT CAST(created_at AT TIME ZONE 'UTC' AS date), 'worldcups_created', 0, count(*)
+        FROM worldcups WHERE created_at IS NOT NULL GROUP BY 1
+        UNION ALL
+        SELECT CAST(completed_at AT TIME ZONE 'UTC' AS date), 'worldcups_completed', 0, count(*)
+        FROM worldcups WHERE completed_at IS NOT NULL GROUP BY 1
+        UNION ALL
+        SELECT CAST(created_at AT TIME ZONE 'UTC' AS date), 'votes', 0, count(*)
+        FROM votes WHERE created_at IS NOT NULL GROUP BY 1
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_rollups')
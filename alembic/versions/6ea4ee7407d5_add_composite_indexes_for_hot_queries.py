@@ -0,0 +1,55 @@
+"""add composite indexes for hot queries
+
+Revision ID: 6ea4ee7407d5
+Revises: 6f0fc34f69c7
+Create Date: 2026-10-17 00:16:01.663253
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ea4ee7407d5'
+down_revision: Union[str, Sequence[str], None] = '6f0fc34f69c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 모델(__table_args__)에도 선언해 두어야 자동 생성 마이그레이션이 인덱스를 지우지 않음
+    
+    # 투표: 중복 체크 (worldcup_id, ip_address) + 월드컵별 투표 수/통계 (worldcup_id)
+    op.create_index('idx_votes_worldcup_ip', 'votes', ['worldcup_id', 'ip_address'])
+    
+    # 공개 피드: is_public인 공유만, (created_at, id) 내림차순 커서 페이지네이션
+    op.create_index(
+        'idx_shares_public_created',
+        'shares',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_public')
+    )
+    
+    # 공유 링크 중복 체크 (worldcup_id, user_id)
+    op.create_index('idx_shares_worldcup_user', 'shares', ['worldcup_id', 'user_id'])
+    
+    # 내 사진 목록: user_id별 (uploaded_at, id) 내림차순 커서 페이지네이션
+    op.create_index(
+        'idx_photos_user_uploaded',
+        'photos',
+        ['user_id', sa.text('uploaded_at DESC'), sa.text('id DESC')]
+    )
+    
+    # 월드컵별 매치 (6f03b45deb06 자동 생성 마이그레이션에서 삭제된 것 복구)
+    op.create_index('idx_matches_worldcup_id', 'matches', ['worldcup_id'])
+
+
+def downgrade() -> None:
+    # 인덱스 삭제 (역순)
+    op.drop_index('idx_matches_worldcup_id', table_name='matches')
+    op.drop_index('idx_photos_user_uploaded', table_name='photos')
+    op.drop_index('idx_shares_worldcup_user', table_name='shares')
+    op.drop_index('idx_shares_public_created', table_name='shares')
+    op.drop_index('idx_votes_worldcup_ip', table_name='votes')
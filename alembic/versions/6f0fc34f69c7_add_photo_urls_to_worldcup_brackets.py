@@ -0,0 +1,44 @@
+"""add photo urls to worldcup brackets
+
+Revision ID: 6f0fc34f69c7
+Revises: fa6c691eb131
+Create Date: 2026-10-17 00:14:59.183808
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f0fc34f69c7'
+down_revision: Union[str, Sequence[str], None] = 'fa6c691eb131'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 브라켓에 참가 사진 URL 채우기 (매치 응답을 조회 없이 만들기 위함)
+    conn = op.get_bind()
+    worldcups = conn.execute(sa.text("SELECT id, bracket FROM worldcups WHERE bracket IS NOT NULL")).fetchall()
+    urls = dict(conn.execute(sa.text("""
+        SELECT p.id, p.url FROM photos p
+        WHERE p.id IN (SELECT DISTINCT photo_a_id FROM matches UNION SELECT DISTINCT photo_b_id FROM matches)
+    """)).fetchall())
+    
+    for worldcup in worldcups:
+        bracket = worldcup.bracket if isinstance(worldcup.bracket, dict) else json.loads(worldcup.bracket)
+        bracket["urls"] = [urls.get(photo_id, "") for photo_id in bracket["entrants"]]
+        conn.execute(
+            sa.text("UPDATE worldcups SET bracket = :bracket WHERE id = :id"),
+            {"bracket": json.dumps(bracket), "id": worldcup.id}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    conn.execute(sa.text("UPDATE worldcups SET bracket = (bracket::jsonb - 'urls')::json WHERE bracket IS NOT NULL"))
@@ -0,0 +1,49 @@
+"""add trending score to shares
+
+Revision ID: 8c4b7e2f1d63
+Revises: 5d8e1b4c7a92
+Create Date: 2026-10-17 13:22:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4b7e2f1d63'
+down_revision: Union[str, Sequence[str], None] = '5d8e1b4c7a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('shares', sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+    op.add_column('shares', sa.Column('trending_decayed_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # 최근 7일 투표로 초기 점수 채움 (기본 반감기 24시간 기준, 공개 공유만)
+    op.execute("""
+        UPDATE shares SET trending_score = v.score, trending_decayed_at = now()
+        FROM (
+            SELECT worldcup_id, sum(exp(-ln(2) * extract(epoch FROM now() - created_at) / 86400)) AS score
+            FROM votes
+            WHERE created_at > now() - interval '7 days'
+            GROUP BY worldcup_id
+        ) v
+        WHERE shares.worldcup_id = v.worldcup_id AND shares.is_public
+    """)
+    
+    op.create_index(
+        'idx_shares_public_trending', 'shares',
+        [sa.text('trending_score DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_public')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_shares_public_trending', table_name='shares')
+    op.drop_column('shares', 'trending_decayed_at')
+    op.drop_column('shares', 'trending_score')
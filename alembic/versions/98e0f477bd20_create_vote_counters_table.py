@@ -0,0 +1,40 @@
+"""create vote_counters table
+
+Revision ID: 98e0f477bd20
+Revises: 6ea4ee7407d5
+Create Date: 2026-10-17 00:20:12.824069
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '98e0f477bd20'
+down_revision: Union[str, Sequence[str], None] = '6ea4ee7407d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vote_counters',
+    sa.Column('worldcup_id', sa.String(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['worldcup_id'], ['worldcups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('worldcup_id', 'shard')
+    )
+    
+    # 기존 투표 수 채우기 (샤드 0에 전체 합계)
+    op.execute("""
+        INSERT INTO vote_counters (worldcup_id, shard, count)
+        SELECT worldcup_id, 0, count(*) FROM votes GROUP BY worldcup_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vote_counters')
@@ -0,0 +1,39 @@
+"""add bracket_mask to votes
+
+Revision ID: a3f9c2d71e48
+Revises: e7d2f41a9c86
+Create Date: 2026-10-17 09:12:40.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2d71e48'
+down_revision: Union[str, Sequence[str], None] = 'e7d2f41a9c86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('votes', sa.Column('bracket_mask', sa.Integer(), nullable=True))
+    op.alter_column('votes', 'rankings', existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 브라켓 재현 투표는 정규화 순위(상위 4위)로 순위 JSON을 채움
+    op.execute("""
+        UPDATE votes SET rankings = (
+            SELECT json_agg(json_build_object('photo_id', photo_id, 'rank', rank) ORDER BY rank, photo_id)
+            FROM vote_rankings WHERE vote_rankings.vote_id = votes.id
+        )
+        WHERE rankings IS NULL
+    """)
+    op.execute("UPDATE votes SET rankings = '[]' WHERE rankings IS NULL")
+    op.alter_column('votes', 'rankings', existing_type=sa.JSON(), nullable=False)
+    op.drop_column('votes', 'bracket_mask')
@@ -0,0 +1,33 @@
+"""add token_version to users
+
+Revision ID: b7e3d9a41c25
+Revises: 8c4b7e2f1d63
+Create Date: 2026-10-17 14:41:09.736215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d9a41c25'
+down_revision: Union[str, Sequence[str], None] = '8c4b7e2f1d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(
+        'idx_users_token_version', 'users', ['id', 'token_version'],
+        postgresql_where=sa.text('token_version > 0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_users_token_version', table_name='users')
+    op.drop_column('users', 'token_version')
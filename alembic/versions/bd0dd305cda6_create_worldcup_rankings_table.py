@@ -0,0 +1,79 @@
+"""create worldcup_rankings table
+
+Revision ID: bd0dd305cda6
+Revises: 510e9c0afe9f
+Create Date: 2026-10-17 00:11:19.111021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd0dd305cda6'
+down_revision: Union[str, Sequence[str], None] = '510e9c0afe9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('worldcup_rankings',
+    sa.Column('worldcup_id', sa.String(), nullable=False),
+    sa.Column('photo_id', sa.String(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('eliminated_round', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['worldcup_id'], ['worldcups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('worldcup_id', 'photo_id')
+    )
+    op.create_index('idx_worldcup_rankings_worldcup_rank', 'worldcup_rankings', ['worldcup_id', 'rank'])
+    
+    # 이미 완료된 월드컵의 순위 채우기 (매치 기록으로 계산)
+    conn = op.get_bind()
+    matches = conn.execute(sa.text("""
+        SELECT m.worldcup_id, m.round_number, m.photo_a_id, m.photo_b_id, m.winner_photo_id
+        FROM matches m
+        JOIN worldcups w ON w.id = m.worldcup_id
+        WHERE w.status = 'COMPLETED' AND m.winner_photo_id IS NOT NULL
+    """)).fetchall()
+    
+    by_worldcup = {}
+    for row in matches:
+        by_worldcup.setdefault(row.worldcup_id, []).append(row)
+    
+    rows = []
+    for worldcup_id, worldcup_matches in by_worldcup.items():
+        final_round = max(m.round_number for m in worldcup_matches)
+        for m in worldcup_matches:
+            loser_id = m.photo_a_id if m.photo_b_id == m.winner_photo_id else m.photo_b_id
+            rows.append({
+                "worldcup_id": worldcup_id,
+                "photo_id": loser_id,
+                "rank": 2 ** (final_round - m.round_number) + 1,
+                "eliminated_round": m.round_number
+            })
+            if m.round_number == final_round:
+                rows.append({
+                    "worldcup_id": worldcup_id,
+                    "photo_id": m.winner_photo_id,
+                    "rank": 1,
+                    "eliminated_round": None
+                })
+    
+    if rows:
+        rankings = sa.table('worldcup_rankings',
+            sa.column('worldcup_id', sa.String),
+            sa.column('photo_id', sa.String),
+            sa.column('rank', sa.Integer),
+            sa.column('eliminated_round', sa.Integer)
+        )
+        op.bulk_insert(rankings, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_worldcup_rankings_worldcup_rank', table_name='worldcup_rankings')
+    op.drop_table('worldcup_rankings')
@@ -0,0 +1,52 @@
+"""create vote_rankings table
+
+Revision ID: bd137788142c
+Revises: 98e0f477bd20
+Create Date: 2026-10-17 00:21:30.377513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd137788142c'
+down_revision: Union[str, Sequence[str], None] = '98e0f477bd20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vote_rankings',
+    sa.Column('vote_id', sa.String(), nullable=False),
+    sa.Column('photo_id', sa.String(), nullable=False),
+    sa.Column('worldcup_id', sa.String(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['photo_id'], ['photos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vote_id'], ['votes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['worldcup_id'], ['worldcups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('vote_id', 'photo_id')
+    )
+    op.create_index('idx_vote_rankings_worldcup_photo_rank', 'vote_rankings', ['worldcup_id', 'photo_id', 'rank'])
+    
+    # 기존 투표의 rankings JSON 펼쳐 넣기 (존재하는 사진 + 숫자 순위만)
+    op.execute("""
+        INSERT INTO vote_rankings (vote_id, photo_id, worldcup_id, rank)
+        SELECT v.id, p.id, v.worldcup_id, (r.value ->> 'rank')::int
+        FROM votes v
+        CROSS JOIN LATERAL json_array_elements(
+            CASE WHEN json_typeof(v.rankings) = 'array' THEN v.rankings ELSE '[]'::json END
+        ) AS r(value)
+        JOIN photos p ON p.id = r.value ->> 'photo_id'
+        WHERE (r.value ->> 'rank') ~ '^[0-9]+$'
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_vote_rankings_worldcup_photo_rank', table_name='vote_rankings')
+    op.drop_table('vote_rankings')
@@ -0,0 +1,54 @@
+"""add unique vote per ip
+
+Revision ID: c41a7e9d2b53
+Revises: bd137788142c
+Create Date: 2026-10-17 01:12:08.514207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a7e9d2b53'
+down_revision: Union[str, Sequence[str], None] = 'bd137788142c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 같은 (월드컵, IP) 중복 투표는 가장 먼저 들어온 것만 남김 (vote_rankings는 CASCADE)
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_votes ON COMMIT DROP AS
+        SELECT id, worldcup_id FROM (
+            SELECT id, worldcup_id,
+                   row_number() OVER (PARTITION BY worldcup_id, ip_address ORDER BY created_at, id) AS n
+            FROM votes
+        ) v
+        WHERE n > 1
+    """)
+    op.execute("DELETE FROM votes WHERE id IN (SELECT id FROM duplicate_votes)")
+
+    # 중복을 지운 월드컵은 투표 수 카운터를 다시 계산
+    op.execute("""
+        DELETE FROM vote_counters
+        WHERE worldcup_id IN (SELECT DISTINCT worldcup_id FROM duplicate_votes)
+    """)
+    op.execute("""
+        INSERT INTO vote_counters (worldcup_id, shard, count)
+        SELECT worldcup_id, 0, count(*) FROM votes
+        WHERE worldcup_id IN (SELECT DISTINCT worldcup_id FROM duplicate_votes)
+        GROUP BY worldcup_id
+    """)
+
+    op.drop_index('idx_votes_worldcup_ip', table_name='votes')
+    op.create_unique_constraint('uq_votes_worldcup_ip', 'votes', ['worldcup_id', 'ip_address'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_votes_worldcup_ip', 'votes', type_='unique')
+    op.create_index('idx_votes_worldcup_ip', 'votes', ['worldcup_id', 'ip_address'], unique=False)
@@ -0,0 +1,36 @@
+"""add content_hash to photos and content_analyses table
+
+Revision ID: d4a8f6c3e917
+Revises: b7e3d9a41c25
+Create Date: 2026-10-17 15:32:18.064492
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f6c3e917'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d9a41c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('photos', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_table('content_analyses',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    # 기존 사진의 해시와 분석 결과는 scripts/backfill_content_hashes.py로 채움 (파일을 읽어야 함)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('content_analyses')
+    op.drop_column('photos', 'content_hash')
@@ -0,0 +1,38 @@
+"""create vote_analytics table
+
+Revision ID: e7d2f41a9c86
+Revises: c41a7e9d2b53
+Create Date: 2026-10-17 01:48:27.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d2f41a9c86'
+down_revision: Union[str, Sequence[str], None] = 'c41a7e9d2b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vote_analytics',
+    sa.Column('worldcup_id', sa.String(), nullable=False),
+    sa.Column('settled_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('vote_count', sa.Integer(), nullable=False),
+    sa.Column('stats', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['worldcup_id'], ['worldcups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('worldcup_id')
+    )
+    op.create_index('idx_votes_worldcup_created', 'votes', ['worldcup_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_votes_worldcup_created', table_name='votes')
+    op.drop_table('vote_analytics')
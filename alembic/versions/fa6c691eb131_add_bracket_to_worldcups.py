@@ -0,0 +1,77 @@
+"""add bracket to worldcups
+
+Revision ID: fa6c691eb131
+Revises: bd0dd305cda6
+Create Date: 2026-10-17 00:13:35.127610
+
+"""
+import json
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa6c691eb131'
+down_revision: Union[str, Sequence[str], None] = 'bd0dd305cda6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('worldcups', sa.Column('bracket', sa.JSON(), nullable=True))
+    
+    # 기존 월드컵의 브라켓을 매치 기록으로 복원하고, 매치 ID를 노드 기반 ID로 변경
+    conn = op.get_bind()
+    worldcups = conn.execute(sa.text("SELECT id, round_type FROM worldcups")).fetchall()
+    matches = conn.execute(sa.text("""
+        SELECT id, worldcup_id, round_number, match_order, photo_b_id, winner_photo_id
+        FROM matches
+    """)).fetchall()
+    
+    by_worldcup = {}
+    for row in matches:
+        by_worldcup.setdefault(row.worldcup_id, []).append(row)
+    
+    first_round = conn.execute(sa.text("""
+        SELECT worldcup_id, photo_a_id, photo_b_id
+        FROM matches
+        WHERE round_number = 1
+        ORDER BY worldcup_id, match_order
+    """)).fetchall()
+    entrants = {}
+    for row in first_round:
+        entrants.setdefault(row.worldcup_id, []).extend([row.photo_a_id, row.photo_b_id])
+    
+    for worldcup in worldcups:
+        size = worldcup.round_type
+        if len(entrants.get(worldcup.id, [])) != size:
+            continue  # 매치 기록이 불완전한 월드컵은 건너뜀
+        
+        decided = 0
+        right_won = 0
+        for match in by_worldcup.get(worldcup.id, []):
+            node = (size >> match.round_number) + match.match_order - 1
+            if match.winner_photo_id:
+                decided |= 1 << node
+                if match.winner_photo_id == match.photo_b_id:
+                    right_won |= 1 << node
+            
+            conn.execute(
+                sa.text("UPDATE matches SET id = :new_id WHERE id = :old_id"),
+                {"new_id": str(uuid.uuid5(uuid.UUID(worldcup.id), str(node))), "old_id": match.id}
+            )
+        
+        bracket = {"entrants": entrants[worldcup.id], "decided": decided, "right_won": right_won}
+        conn.execute(
+            sa.text("UPDATE worldcups SET bracket = :bracket WHERE id = :id"),
+            {"bracket": json.dumps(bracket), "id": worldcup.id}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('worldcups', 'bracket')
@@ -1,43 +1,87 @@
 # app/api/deps.py
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.core.security import decode_access_token
+from app.services.token_revocation import token_revocations
 
 # JWT Bearer 토큰 스킴
 security = HTTPBearer()
 
-def get_current_user(
-    token: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """JWT 토큰으로 현재 유저 가져오기"""
-    credentials_exception = HTTPException(
+class Principal:
+    """토큰 클레임으로 만든 현재 유저 (DB 조회 없음, is_premium은 토큰 발급 시점 값)"""
+    
+    def __init__(self, id: str, email: str, is_premium: bool, token_version: int):
+        self.id = id
+        self.email = email
+        self.is_premium = is_premium
+        self.token_version = token_version
+    
+    def __repr__(self):
+        return f"<Principal {self.email}>"
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보가 올바르지 않습니다",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+async def get_current_principal(
+    token: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """JWT 토큰으로 현재 유저 식별 (DB 조회 없이 서명, 만료, 무효화 목록만 확인)"""
     try:
         # 토큰 디코드
         payload = decode_access_token(token.credentials)
         if payload is None:
-            raise credentials_exception
-        
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-    
-    # DB에서 유저 조회
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+            raise _credentials_exception()
+    
+        user_id = payload.get("user_id")
+        email = payload.get("sub")
+        if user_id is None or email is None:
+            raise _credentials_exception()
+    
+        # ver 클레임 이전에 발급한 토큰은 버전 0
+        principal = Principal(
+            id=user_id,
+            email=email,
+            is_premium=bool(payload.get("premium", False)),
+            token_version=int(payload.get("ver", 0))
+        )
+    except (JWTError, TypeError, ValueError):
+        raise _credentials_exception()
+    
+    # 전체 로그아웃 이전에 발급한 토큰
+    if token_revocations.is_revoked(principal.id, principal.token_version):
+        raise _credentials_exception()
+    
+    return principal
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """현재 유저 전체 정보가 필요한 경우만 (PK로 한 번 조회)"""
+    user = await db.get(User, principal.id)
+    
+    # 조회한 김에 무효화 여부도 DB 기준으로 확인 (다른 워커에서 방금 전체 로그아웃한 경우)
+    if user is None or principal.token_version < user.token_version:
+        raise _credentials_exception()
     
     return user
+
+async def get_admin_user(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """관리자 계정만 (settings.admin_emails)"""
+    if principal.email not in settings.admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 접근할 수 있습니다"
+        )
+    
+    return principal
@@ -0,0 +1,22 @@
+# app/api/routes/admin.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+
+from app.database import get_read_db
+from app.api.deps import get_admin_user, Principal
+from app.services import rollup_service
+
+router = APIRouter(prefix="/api/v1/admin", tags=["관리자"])
+
+@router.get("/stats/daily")
+async def get_daily_stats(
+    days: int = Query(30, ge=1, le=366, description="조회할 일 수 (end 포함)"),
+    end: date | None = Query(None, description="마지막 날짜 (UTC, 기본 오늘)"),
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
+):
+    """일별 운영 지표 (월드컵 생성/완료, 완료율, 투표, AI 분석 - 롤업 테이블에서 날짜 수만큼만 읽음)"""
+    
+    end = end or rollup_service.today()
+    return await rollup_service.get_daily_rollups(db, end - timedelta(days=days - 1), end)
@@ -6,23 +6,28 @@ import logging
 
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_password, create_access_token, token_claims
 from app.config import settings
+from app.api.deps import get_current_principal, Principal
+from app.services.token_revocation import token_revocations
 
 router = APIRouter(prefix="/api/v1/auth", tags=["인증"])
 logger = logging.getLogger(__name__)
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """회원가입"""
     # 이메일 중복 체크
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -33,20 +38,21 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=hash_password(user_data.password)
+        # bcrypt는 CPU 작업이라 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+        hashed_password=await run_in_threadpool(hash_password, user_data.password)
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()  # id, created_at은 INSERT ... RETURNING으로 채워짐
     
     return new_user
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """로그인"""
     # 유저 조회
-    user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,7 +61,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
     
     # 비밀번호 검증
-    if not verify_password(user_data.password, user.hashed_password):
+    if not await run_in_threadpool(verify_password, user_data.password, user.hashed_password):
         raise HTTPException(
             detail="이메일 또는 비밀번호가 올바르지 않습니다",
             headers={"WWW-Authenticate": "Bearer"}
@@ -64,7 +70,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     # JWT 토큰 생성
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email, "user_id": user.id},
+        data=token_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -74,6 +80,28 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         "expires_in": settings.access_token_expire_minutes * 60
     }
 
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """모든 기기에서 로그아웃 (지금까지 발급한 토큰 모두 무효화)"""
+    
+    # 버전을 올리면 그보다 작은 ver 토큰은 거절됨
+    token_version = await db.scalar(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    await db.commit()
+    
+    # 이 워커에는 바로, 다른 워커에는 다음 목록 갱신 때 반영
+    if token_version is not None:
+        token_revocations.revoke(current_user.id, token_version)
+    
+    return None
+
 @router.get("/google")
 async def google_login(request: StarletteRequest):
     """Google 로그인 시작"""
@@ -83,7 +111,7 @@ async def google_login(request: StarletteRequest):
 @router.get("/google/callback")
 async def google_callback(
     request: StarletteRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Google OAuth 콜백"""
     try:
@@ -98,14 +126,15 @@ async def google_callback(
         email = user_info.get('email')
         provider_id = user_info.get('sub')
         
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
         
         if user:
             # 기존 유저 - OAuth 정보 업데이트
             user.provider = "google"
             user.provider_id = provider_id
             user.profile_image = user_info.get('picture')
-            db.commit()
+            await db.commit()
         else:
             # 새 유저 생성
             user = User(
@@ -117,11 +146,10 @@ async def google_callback(
                 profile_image=user_info.get('picture')
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
         
         # JWT 토큰 생성
-        access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
+        access_token = create_access_token(data=token_claims(user))
         
         # 프론트엔드로 리다이렉트 (토큰 포함)
         return RedirectResponse(
@@ -148,7 +176,7 @@ async def kakao_login():
 @router.get("/kakao/callback")
 async def kakao_callback(
     code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kakao OAuth 콜백"""
     try:
@@ -162,14 +190,15 @@ async def kakao_callback(
             raise HTTPException(status_code=400, detail="이메일 정보를 가져올 수 없습니다")
         
         # 이메일로 기존 유저 찾기
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
         
         if user:
             # 기존 유저 - OAuth 정보 업데이트
             user.provider = "kakao"
             user.provider_id = provider_id
             user.profile_image = user_info.get('profile_image')
-            db.commit()
+            await db.commit()
         else:
             # 새 유저 생성
             user = User(
@@ -181,11 +210,10 @@ async def kakao_callback(
                 profile_image=user_info.get('profile_image')
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
         
         # JWT 토큰 생성
-        access_token = create_access_token(data={"sub": user.email, "user_id": user.id})
+        access_token = create_access_token(data=token_claims(user))
         
         # 프론트엔드로 리다이렉트 (토큰 포함)
         return RedirectResponse(
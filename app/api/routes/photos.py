@@ -1,17 +1,19 @@
 # app/api/routes/photos.py
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+import hashlib
 import os
 import uuid
 import shutil
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_db, get_read_db
 from app.models.photo import Photo
-from app.schemas.photo import PhotoResponse, PhotoUploadResponse
-from app.api.deps import get_current_user
+from app.schemas.photo import PhotoResponse, PhotoUploadResponse, PhotoListResponse
+from app.api.deps import get_current_principal, Principal
 from app.core.file_security import validate_uploaded_file, sanitize_filename
+from app.core.pagination import keyset_after, next_cursor_of
 
 router = APIRouter(prefix="/api/v1/photos", tags=["사진"])
 
@@ -23,8 +25,8 @@ ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 @router.post("/upload", response_model=PhotoUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_photos(
     files: list[UploadFile],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """사진 업로드 (최대 16장)"""
     
@@ -57,17 +59,21 @@ async def upload_photos(
             content = await file.read()
             buffer.write(content)
         
+        # 내용 해시 (같은 파일은 AI 분석 결과 공유, 최대 10MB라 스레드풀에서)
+        content_hash = (await run_in_threadpool(hashlib.sha256, content)).hexdigest()
+        
         # DB 저장
         photo = Photo(
             user_id=current_user.id,
             filename=safe_filename,  # 원본 이름 (안전하게 변환됨)
             file_path=file_path,
-            url=f"/uploads/photos/{filename}"
+            url=f"/uploads/photos/{filename}",
+            content_hash=content_hash
         )
         db.add(photo)
         uploaded_photos.append(photo)
     
-    db.commit()
+    await db.commit()
     
     return PhotoUploadResponse(
         photos=[
@@ -81,39 +87,61 @@ async def upload_photos(
         total=len(uploaded_photos)
     )
 
-@router.get("/", response_model=List[PhotoResponse])
-def get_my_photos(
-    page: int = Query(1, ge=1, description="페이지 번호"),
+@router.get("/", response_model=PhotoListResponse)
+async def get_my_photos(
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    page: int = Query(1, ge=1, description="(레거시) 페이지 번호 - cursor 사용 권장"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 개수"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    include_total: bool = Query(False, description="전체 개수 포함 여부"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
 ):
-    """내 사진 목록 조회 (페이지네이션)"""
+    """내 사진 목록 조회 (커서 페이지네이션)"""
+    
+    query = (
+        select(Photo)
+        .where(Photo.user_id == current_user.id)
+        .order_by(Photo.uploaded_at.desc(), Photo.id.desc())
+        .limit(limit + 1)  # 다음 페이지 존재 여부 확인용 1개 더
+    )
     
-    # 전체 개수
-    total = db.query(Photo).filter(Photo.user_id == current_user.id).count()
+    if cursor:
+        # 커서 이후만 조회 (앞 페이지를 스캔하지 않음)
+        query = query.where(keyset_after(Photo.uploaded_at, Photo.id, cursor))
+    elif page > 1:
+        # 레거시 OFFSET 페이지네이션
+        query = query.offset((page - 1) * limit)
     
-    # 페이지네이션
-    skip = (page - 1) * limit
-    photos = db.query(Photo)\
-        .filter(Photo.user_id == current_user.id)\
-        .order_by(Photo.uploaded_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    result = await db.execute(query)
+    photos, next_cursor = next_cursor_of(
+        result.scalars().all(), limit,
+        sort_key=lambda photo: photo.uploaded_at,
+        id_key=lambda photo: photo.id
+    )
     
-    return photos
+    # 전체 개수 (요청한 경우에만)
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(Photo).where(Photo.user_id == current_user.id)
+        )
+    
+    return PhotoListResponse(
+        photos=photos,
+        next_cursor=next_cursor,
+        total=total
+    )
 
 @router.delete("/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_photo(
+async def delete_photo(
     photo_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """사진 삭제"""
     
     # 사진 조회
-    photo = db.query(Photo).filter(Photo.id == photo_id).first()
+    photo = await db.get(Photo, photo_id)
     
     if not photo:
         raise HTTPException(
@@ -133,7 +161,7 @@ def delete_photo(
         os.remove(photo.file_path)
     
     # DB에서 삭제
-    db.delete(photo)
-    db.commit()
+    await db.delete(photo)
+    await db.commit()
     
     return None
@@ -1,30 +1,34 @@
 # app/api/routes/share.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.responses import Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from datetime import timedelta, datetime, timezone
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_db, SessionLocal
 from app.models.worldcup import Worldcup
 from app.models.share import Share
 from app.schemas.share import ShareCreate, ShareResponse, SharedWorldcupResponse
 from app.schemas.worldcup import RankingPhoto, PhotoInMatch
-from app.api.deps import get_current_user
-from app.services import worldcup_service, ai_service
+from app.api.deps import get_current_principal, Principal
+from app.services import worldcup_service, ai_service, vote_service
+from app.services.share_cache import share_page_cache, etag_matches
+from app.services.feed_cache import invalidate_first_page
 
 router = APIRouter(prefix="/api/v1/share", tags=["공유"])
 
 @router.post("/worldcup/{worldcup_id}", response_model=ShareResponse, status_code=status.HTTP_201_CREATED)
-def create_share_link(
+async def create_share_link(
     worldcup_id: str,
     data: ShareCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """공유 링크 생성"""
     
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,17 +55,18 @@ def create_share_link(
         expires_at = datetime.now(timezone.utc) + timedelta(days=data.expires_days)
     
     # 기존 공유 확인 (같은 월드컵)
-    existing_share = db.query(Share).filter(
-        Share.worldcup_id == worldcup_id,
-        Share.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Share).where(
+            Share.worldcup_id == worldcup_id,
+            Share.user_id == current_user.id
+        )
+    )
+    existing_share = result.scalars().first()
     
     if existing_share:
         # 기존 공유 업데이트
         existing_share.is_public = data.is_public
         existing_share.expires_at = expires_at
-        db.commit()
-        db.refresh(existing_share)
         share = existing_share
     else:
         # 새 공유 생성
@@ -72,8 +77,11 @@ def create_share_link(
             expires_at=expires_at
         )
         db.add(share)
-        db.commit()
-        db.refresh(share)
+    
+    # 요청 전체를 한 번에 커밋 (id, created_at은 INSERT ... RETURNING으로 채워짐)
+    await db.commit()
+    share_page_cache.invalidate(share.id)  # 공개 여부/만료 변경 반영
+    invalidate_first_page()  # 공개 목록 첫 페이지에 새 공유/공개 여부 반영
     
     # 공유 URL 생성
     share_url = f"https://mycup.app/share/{share.id}"  # 프로덕션 URL
@@ -89,14 +97,38 @@ def create_share_link(
 
 @router.get("/{share_id}", response_model=SharedWorldcupResponse)
 @router.get("/{share_id}", response_model=SharedWorldcupResponse)
-def get_shared_worldcup(
+async def get_shared_worldcup(
     share_id: str,
-    db: Session = Depends(get_db)
+    if_none_match: str | None = Header(None)
 ):
-    """공유된 월드컵 조회 (인증 불필요)"""
+    """공유된 월드컵 조회 (인증 불필요, 워커 캐시 + ETag)"""
+    
+    # 캐시 미스가 동시에 몰려도 계산은 한 번 (app/services/share_cache.py)
+    body, etag = await share_page_cache.get_or_build(
+        share_id, lambda: _build_shared_worldcup(share_id)
+    )
+    
+    # 투표 수가 바뀔 수 있으므로 매번 재검증 (바뀌지 않았으면 304)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _build_shared_worldcup(share_id: str) -> tuple[SharedWorldcupResponse, str, datetime | None]:
+    """공유 페이지 응답 계산 (응답, 월드컵 ID, 공유 링크 만료 시각)"""
     
-    # 공유 링크 조회
-    share = db.query(Share).filter(Share.id == share_id).first()
+    # 결과가 캐시에 남으므로 복제 지연 없이 primary에서 (요청과 별개 세션 - 먼저 온 요청이 끊겨도 계속)
+    async with SessionLocal() as db:
+        return await _compute_shared_worldcup(db, share_id)
+
+async def _compute_shared_worldcup(db: AsyncSession, share_id: str) -> tuple[SharedWorldcupResponse, str, datetime | None]:
+    # 공유 링크 조회 (투표 수는 카운터에서 함께)
+    result = await db.execute(
+        select(Share, vote_service.vote_count_subquery(Share.worldcup_id).label("vote_count"))
+        .options(selectinload(Share.worldcup), selectinload(Share.user))
+        .where(Share.id == share_id)
+    )
+    share, vote_count = result.first() or (None, 0)
     if not share:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -122,7 +154,7 @@ def get_shared_worldcup(
     user = share.user
     
     # 순위 계산
-    rankings_data = worldcup_service.get_worldcup_rankings(db, worldcup.id)
+    rankings_data = await worldcup_service.get_worldcup_rankings(db, worldcup.id)
     rankings = [
         RankingPhoto(
             rank=item["rank"],
@@ -145,23 +177,30 @@ def get_shared_worldcup(
     else:
         # 실시간 분석 (느림, 첫 조회만)
         print("실시간 AI 분석 실행")
-        photo_paths = [item["photo"].file_path for item in rankings_data]
-        batch_analysis = ai_service.analyze_multiple_photos(photo_paths)
-        winner_analysis = ai_service.analyze_photo_from_path(rankings_data[0]["photo"].file_path)
-        insight_story = ai_service.generate_insight_story(batch_analysis, winner_analysis)
+        # 외부 API 호출 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션 먼저 종료
+        await db.commit()
+        
+        analyzer = ai_service.PhotoAnalyzer()  # 같은 사진은 한 번만, 결과는 사진에도 저장
+        batch_analysis = await analyzer.analyze_many([item["photo"] for item in rankings_data])
+        winner_analysis = await analyzer.analyze(rankings_data[0]["photo"])
+        insight_story = await ai_service.generate_insight_story(batch_analysis, winner_analysis)
         
         overall_keywords = batch_analysis["overall_keywords"]
         primary_emotion = batch_analysis["primary_emotion"]
         
         # 결과 저장 (다음번엔 빠름)
-        worldcup.analysis_result = {
-            "overall_keywords": overall_keywords,
-            "primary_emotion": primary_emotion,
-            "insight_story": insight_story
-        }
-        db.commit()
-    
-    return SharedWorldcupResponse(
+        await db.execute(
+            update(Worldcup)
+            .where(Worldcup.id == worldcup.id)
+            .values(analysis_result={
+                "overall_keywords": overall_keywords,
+                "primary_emotion": primary_emotion,
+                "insight_story": insight_story
+            })
+        )
+        await db.commit()
+    
+    response = SharedWorldcupResponse(
         worldcup_id=worldcup.id,
         username=user.username,
         round_type=worldcup.round_type,
@@ -170,5 +209,7 @@ def get_shared_worldcup(
         primary_emotion=primary_emotion,
         insight_story=insight_story,
         card_images=None,
+        vote_count=vote_count,
         created_at=worldcup.created_at
     )
+    return response, worldcup.id, share.expires_at
@@ -1,11 +1,14 @@
 # app/api/routes/worldcup.py
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Body, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db, SessionLocal, ReadSessionLocal
 from app.models.user import User
 from app.models.worldcup import Worldcup
-from app.models.match import Match
 from app.models.photo import Photo
 from app.models.share import Share
 from app.models.vote import Vote
@@ -19,87 +22,155 @@ from app.schemas.worldcup import (
     RankingPhoto,
     WorldcupInsightResponse, 
     PhotoAnalysis,
-    CardNewsResponse
+    CardNewsResponse,
+    BracketVoteRequest,
+    ReplayBracketResponse
 )
-from app.api.deps import get_current_user
-from app.services import worldcup_service, ai_service, cardnews_service, rate_limit_service
+from app.api.deps import get_current_user, get_current_principal, Principal
+from app.core.pagination import keyset_after, next_cursor_of
+from app.services import worldcup_service, ai_service, cardnews_service, rate_limit_service, vote_service, analytics_service, vote_export, pairwise_service, rollup_service
+from app.services.vote_buffer import vote_buffer
+from app.services.vote_stream import vote_stats_hub
+from app.services.trending_service import trending_updater
+from app.services.share_cache import share_page_cache
+from app.services.feed_cache import public_feed_cache
 
 from datetime import datetime, timezone
+from typing import Literal
+import asyncio
+import json
 import os
 
 router = APIRouter(prefix="/api/v1/worldcup", tags=["월드컵"])
 
+SSE_KEEPALIVE_SECONDS = 15  # 실시간 통계 스트림 keep-alive 주석 간격
+
 @router.get("/public")
-def get_public_worldcups(
-    page: int = 1,
-    limit: int = 20,
-    db: Session = Depends(get_db)
+async def get_public_worldcups(
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    sort: Literal["recent", "trending"] = Query("recent", description="정렬 (recent: 최신 공유순, trending: 인기순)"),
+    page: int = Query(1, ge=1, description="(레거시) 페이지 번호 - cursor 사용 권장"),
+    limit: int = Query(20, ge=1, le=100, description="페이지당 개수"),
+    include_total: bool = Query(False, description="전체 개수 포함 여부 (전체 스캔)"),
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
 ):
-    """공개 월드컵 목록 조회 (인증 불필요)"""
-    
-    # 페이지네이션 계산
-    offset = (page - 1) * limit
-    
-    # 공개된 월드컵 조회 (Share에서 is_public=True인 것들)
-    public_shares = db.query(Share)\
-        .filter(Share.is_public == True)\
-        .order_by(Share.created_at.desc())\
-        .offset(offset)\
-        .limit(limit)\
-        .all()
-    
-    # 월드컵 정보 수집
-    worldcups = []
-    for share in public_shares:
-        worldcup = share.worldcup
-        user = share.user
-        
-        # 투표 수 계산
-        vote_count = db.query(Vote)\
-            .filter(Vote.worldcup_id == worldcup.id)\
-            .count()
-        
-        worldcups.append({
-            "worldcup_id": worldcup.id,
-            "share_id": share.id,
-            "username": user.username,
-            "round_type": worldcup.round_type,
-            "created_at": worldcup.created_at,
-            "vote_count": vote_count
-        })
-    
-    # 전체 개수
-    total = db.query(Share).filter(Share.is_public == True).count()
+    """공개 월드컵 목록 조회 (인증 불필요, 커서 페이지네이션)"""
+    
+    # 앞쪽 페이지는 모든 방문자에게 같은 응답 - 워커 캐시 (만료돼도 조회는 한 번, app/services/feed_cache.py)
+    if cursor is None and page <= settings.public_feed_cache_pages:
+        return await public_feed_cache.get(
+            (sort, page, limit, include_total),
+            lambda: _load_public_worldcups(sort, page, limit, include_total)
+        )
+    
+    return await _query_public_worldcups(db, sort, cursor, page, limit, include_total)
+
+async def _load_public_worldcups(sort: str, page: int, limit: int, include_total: bool) -> dict:
+    """캐시할 목록 조회 (요청이 끝나도 계속되도록 세션을 따로 열고, 무효화 직후 복제 지연이 캐시되지 않도록 primary에서)"""
+    async with SessionLocal() as db:
+        return await _query_public_worldcups(db, sort, None, page, limit, include_total)
+
+async def _query_public_worldcups(
+    db: AsyncSession,
+    sort: str,
+    cursor: str | None,
+    page: int,
+    limit: int,
+    include_total: bool
+) -> dict:
+    """공개 월드컵 목록 한 페이지"""
+    
+    # 정렬 기준 (둘 다 공개 공유 부분 인덱스로 앞에서부터 limit개만 읽음)
+    sort_column = Share.trending_score if sort == "trending" else Share.created_at
+    
+    # 공개된 월드컵 조회 (Share + Worldcup + User + 투표 수를 한 쿼리로)
+    query = (
+        select(
+            Share.id.label("share_id"),
+            Share.created_at.label("shared_at"),
+            Share.trending_score,
+            Worldcup.id.label("worldcup_id"),
+            Worldcup.round_type,
+            Worldcup.created_at,
+            User.username,
+            vote_service.vote_count_subquery(Worldcup.id).label("vote_count")  # 카운터 행 합계
+        )
+        .join(Worldcup, Worldcup.id == Share.worldcup_id)
+        .join(User, User.id == Share.user_id)
+        .where(Share.is_public == True)
+        .order_by(sort_column.desc(), Share.id.desc())
+        .limit(limit + 1)  # 다음 페이지 존재 여부 확인용 1개 더
+    )
+    
+    if cursor:
+        # 커서 이후만 조회 (앞 페이지를 스캔하지 않음)
+        query = query.where(keyset_after(sort_column, Share.id, cursor))
+    elif page > 1:
+        # 레거시 OFFSET 페이지네이션
+        query = query.offset((page - 1) * limit)
+    
+    result = await db.execute(query)
+    rows, next_cursor = next_cursor_of(
+        result.all(), limit,
+        sort_key=lambda row: row.trending_score if sort == "trending" else row.shared_at,
+        id_key=lambda row: row.share_id
+    )
+    
+    worldcups = [
+        {
+            "worldcup_id": row.worldcup_id,
+            "share_id": row.share_id,
+            "username": row.username,
+            "round_type": row.round_type,
+            "created_at": row.created_at,
+            "vote_count": row.vote_count,
+            "trending_score": round(row.trending_score, 2)
+        }
+        for row in rows
+    ]
+    
+    # 전체 개수 (요청한 경우에만)
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(Share).where(Share.is_public == True)
+        )
     
     return {
         "worldcups": worldcups,
+        "next_cursor": next_cursor,
         "total": total,
-        "page": page,
-        "pages": (total + limit - 1) // limit
+        "page": None if cursor else page,
+        "pages": (total + limit - 1) // limit if total is not None else None
     }
 
 @router.get("/limit")
-def get_worldcup_limit(
+async def get_worldcup_limit(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """월드컵 생성 제한 조회"""
     
-    # 최신 유저 정보 조회
-    db.refresh(current_user)
-    
+    # current_user는 이번 요청에서 방금 조회한 최신 정보 (재조회 불필요)
     return rate_limit_service.get_remaining_count(current_user)
 
 @router.post("", response_model=WorldcupResponse, status_code=status.HTTP_201_CREATED)
-def create_worldcup(
+async def create_worldcup(
     data: WorldcupCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """월드컵 생성"""
     
     # 제한 체크
-    rate_limit_service.check_worldcup_limit(db, current_user)
+    await rate_limit_service.check_worldcup_limit(db, current_user)
+    
+    # 라운드 검증 (브라켓은 2의 거듭제곱 크기만 가능)
+    if data.round_type not in (4, 8, 16):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="4강, 8강, 16강만 지원합니다"
+        )
     
     # 사진 개수 검증
     if len(data.photo_ids) != data.round_type:
@@ -108,51 +179,61 @@ def create_worldcup(
             detail=f"{data.round_type}강은 {data.round_type}장의 사진이 필요합니다"
         )
     
+    # 중복 사진 검증
+    if len(set(data.photo_ids)) != len(data.photo_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="같은 사진을 중복해서 선택할 수 없습니다"
+        )
+    
+    # 사진 존재 + 소유권 검증 (URL도 함께 가져와 브라켓에 저장)
+    photo_urls = await worldcup_service.get_owned_photo_urls(db, current_user.id, data.photo_ids)
+    if len(photo_urls) != len(data.photo_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="존재하지 않거나 권한이 없는 사진이 포함되어 있습니다"
+        )
+    
     # 월드컵 생성
     worldcup = Worldcup(
         user_id=current_user.id,
         round_type=data.round_type
     )
     db.add(worldcup)
-    db.commit()
-    db.refresh(worldcup)
+    
+    # 토너먼트 브라켓 생성 (월드컵 INSERT에 bracket까지 포함)
+    bracket = await worldcup_service.create_tournament_bracket(db, worldcup, photo_urls)
 
     # 카운터 증가 (한 번만!)
-    rate_limit_service.increment_worldcup_count(db, current_user)
-        
-    # 토너먼트 브라켓 생성
-    worldcup_service.create_tournament_bracket(db, worldcup, data.photo_ids)
+    await rate_limit_service.increment_worldcup_count(db, current_user)
+    await rollup_service.increment(db, rollup_service.WORLDCUPS_CREATED)
+    
+    # 첫 번째 매치 (브라켓에 URL까지 있어 추가 조회 없음)
+    first_match = worldcup_service.get_next_match(bracket)
     
-    # 첫 번째 매치 가져오기
-    first_match = worldcup_service.get_next_match(db, worldcup.id)
+    # 요청 전체를 한 번에 커밋
+    await db.commit()
     
     return WorldcupResponse(
         id=worldcup.id,
         round_type=worldcup.round_type,
         status=worldcup.status,
-        current_match=MatchResponse(
-            id=first_match.id,
-            round_number=first_match.round_number,
-            match_order=first_match.match_order,
-            photo_a=PhotoInMatch(id=first_match.photo_a.id, url=first_match.photo_a.url),
-            photo_b=PhotoInMatch(id=first_match.photo_b.id, url=first_match.photo_b.url),
-            winner_photo_id=None
-        ) if first_match else None,
+        current_match=MatchResponse(**first_match) if first_match else None,
         created_at=worldcup.created_at
     )
 
 @router.post("/{worldcup_id}/matches/{match_id}/select")
-def select_winner(
+async def select_winner(
     worldcup_id: str,
     match_id: str,
     data: MatchSelectRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """매치 승자 선택"""
     
-    # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    # 월드컵 조회 (동시 선택으로 브라켓이 덮어써지지 않도록 행 잠금)
+    worldcup = await db.get(Worldcup, worldcup_id, with_for_update=True)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -166,48 +247,63 @@ def select_winner(
             detail="권한이 없습니다"
         )
     
-    # 매치 조회
-    match = db.query(Match).filter(Match.id == match_id).first()
-    if not match:
+    # 브라켓 기록이 없는 예전 월드컵 (마이그레이션 때 매치 기록이 불완전해 복원하지 못함)
+    if not worldcup.bracket:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="브라켓 기록이 없어 진행할 수 없는 월드컵입니다"
+        )
+    
+    # 매치 조회 (브라켓에서 바로 찾음)
+    bracket = worldcup_service.TournamentBracket.from_worldcup(worldcup)
+    node = bracket.node_of(match_id)
+    if node is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="매치를 찾을 수 없습니다"
         )
     
     # 이미 선택했는지 확인
-    if match.winner_photo_id:
+    if bracket.is_decided(node):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 선택한 매치입니다"
         )
     
+    # 아직 대진이 정해지지 않은 매치
+    players = bracket.players(node)
+    if None in players:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="매치를 찾을 수 없습니다"
+        )
+    
     # 승자가 이 매치의 사진 중 하나인지 확인
-    if data.winner_photo_id not in [match.photo_a_id, match.photo_b_id]:
+    if data.winner_photo_id not in players:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 사진입니다"
         )
     
-    # 승자 저장
-    match.winner_photo_id = data.winner_photo_id
-    db.commit()
-    
-    # 다음 라운드 진행
-    worldcup_service.advance_to_next_round(db, worldcup)
+    # 승자 저장 (완료 시 매치 기록 + 순위도 함께 저장)
+    await worldcup_service.select_match_winner(db, worldcup, bracket, node, data.winner_photo_id)
     
     # 월드컵 완료되면 AI 분석 자동 실행
     if worldcup.status == "completed":
+        # 순위 계산
+        rankings_data = await worldcup_service.get_worldcup_rankings(db, worldcup_id)
+        
+        # 외부 API 호출 동안 트랜잭션(커넥션)을 잡고 있지 않도록 완료 결과 먼저 커밋
+        await db.commit()
+        
         try:
             print("===== 월드컵 완료! AI 분석 시작 =====")
             
-            # 순위 계산
-            rankings_data = worldcup_service.get_worldcup_rankings(db, worldcup_id)
-            
-            # AI 분석
-            photo_paths = [item["photo"].file_path for item in rankings_data]
-            batch_analysis = ai_service.analyze_multiple_photos(photo_paths)
-            winner_analysis = ai_service.analyze_photo_from_path(rankings_data[0]["photo"].file_path)
-            insight_story = ai_service.generate_insight_story(batch_analysis, winner_analysis)
+            # AI 분석 (같은 사진은 한 번만, 결과는 사진에도 저장)
+            analyzer = ai_service.PhotoAnalyzer()
+            batch_analysis = await analyzer.analyze_many([item["photo"] for item in rankings_data])
+            winner_analysis = await analyzer.analyze(rankings_data[0]["photo"])
+            insight_story = await ai_service.generate_insight_story(batch_analysis, winner_analysis)
             
             # 결과 저장
             worldcup.analysis_result = {
@@ -215,41 +311,39 @@ def select_winner(
                 "primary_emotion": batch_analysis["primary_emotion"],
                 "insight_story": insight_story
             }
-            db.commit()
+            await db.commit()
+            share_page_cache.invalidate_worldcup(worldcup.id)  # 공유 페이지에 새 분석 결과
             print("===== AI 분석 완료 및 저장 =====")
             
         except Exception as e:
             print(f"===== AI 분석 실패 (백그라운드): {e} =====")
             # AI 분석 실패해도 월드컵 완료는 정상 처리
             # 나중에 조회 시 실시간 분석으로 재시도
-            db.rollback()  # 분석 결과 저장 실패 시 롤백
+            await db.rollback()  # 분석 결과 저장 실패 시 롤백
+            await db.refresh(worldcup)  # 롤백으로 만료된 속성 다시 로드 (비동기 세션은 지연 로드 불가)
     
     # 다음 매치 가져오기
-    next_match = worldcup_service.get_next_match(db, worldcup_id)
+    next_match = worldcup_service.get_next_match(bracket)
+    
+    # 요청 전체를 한 번에 커밋
+    await db.commit()
     
     return {
         "is_completed": worldcup.status == "completed",
         "winner_photo_id": worldcup.winner_photo_id,
-        "next_match": MatchResponse(
-            id=next_match.id,
-            round_number=next_match.round_number,
-            match_order=next_match.match_order,
-            photo_a=PhotoInMatch(id=next_match.photo_a.id, url=next_match.photo_a.url),
-            photo_b=PhotoInMatch(id=next_match.photo_b.id, url=next_match.photo_b.url),
-            winner_photo_id=None
-        ) if next_match else None
+        "next_match": MatchResponse(**next_match) if next_match else None
     }
 
 @router.get("/{worldcup_id}/result", response_model=WorldcupResultResponse)
-def get_worldcup_result(
+async def get_worldcup_result(
     worldcup_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
 ):
     """월드컵 결과 조회"""
     
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -271,7 +365,7 @@ def get_worldcup_result(
         )
     
     # 순위 계산
-    rankings_data = worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    rankings_data = await worldcup_service.get_worldcup_rankings(db, worldcup_id)
     
     rankings = [
         RankingPhoto(
@@ -293,15 +387,15 @@ def get_worldcup_result(
     )
 
 @router.get("/{worldcup_id}/insights", response_model=WorldcupInsightResponse)
-def get_worldcup_insights(
+async def get_worldcup_insights(
     worldcup_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """월드컵 AI 인사이트 조회"""
     
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -323,7 +417,7 @@ def get_worldcup_insights(
         )
     
     # 순위 계산
-    rankings_data = worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    rankings_data = await worldcup_service.get_worldcup_rankings(db, worldcup_id)
     rankings = [
         RankingPhoto(
             rank=item["rank"],
@@ -335,6 +429,12 @@ def get_worldcup_insights(
         for item in rankings_data
     ]
     
+    # 외부 API 호출 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션 먼저 종료 (분석 결과는 마지막 커밋에서 저장)
+    await db.commit()
+    
+    # 사진 분석은 요청당 한 번씩 (워커 캐시 -> 사진에 저장된 결과 -> 내용 해시 -> GPT-4o)
+    analyzer = ai_service.PhotoAnalyzer()
+    
     # 캐시된 분석 결과 확인
     if worldcup.analysis_result:
         # 캐시 사용 (빠름!)
@@ -345,14 +445,14 @@ def get_worldcup_insights(
         insight_story = analysis_data["insight_story"]
         
         # 1위 사진 분석 (캐시에 없으면 실시간)
-        winner_analysis_result = ai_service.analyze_photo_from_path(rankings_data[0]["photo"].file_path)
+        winner_analysis_result = await analyzer.analyze(rankings_data[0]["photo"])
+        await db.commit()  # 새로 분석한 1위 사진 결과 저장 (없으면 빈 커밋)
     else:
         # 실시간 분석 (느림, 첫 조회만)
         print("실시간 AI 분석 실행")
-        photo_paths = [item["photo"].file_path for item in rankings_data]
-        batch_analysis = ai_service.analyze_multiple_photos(photo_paths)
-        winner_analysis_result = ai_service.analyze_photo_from_path(rankings_data[0]["photo"].file_path)
-        insight_story = ai_service.generate_insight_story(batch_analysis, winner_analysis_result)
+        batch_analysis = await analyzer.analyze_many([item["photo"] for item in rankings_data])
+        winner_analysis_result = await analyzer.analyze(rankings_data[0]["photo"])
+        insight_story = await ai_service.generate_insight_story(batch_analysis, winner_analysis_result)
         
         overall_keywords = batch_analysis["overall_keywords"]
         primary_emotion = batch_analysis["primary_emotion"]
@@ -363,7 +463,8 @@ def get_worldcup_insights(
             "primary_emotion": primary_emotion,
             "insight_story": insight_story
         }
-        db.commit()
+        await db.commit()
+        share_page_cache.invalidate_worldcup(worldcup.id)  # 공유 페이지에 새 분석 결과
     
     return WorldcupInsightResponse(
         worldcup_id=worldcup.id,
@@ -382,15 +483,15 @@ def get_worldcup_insights(
 @router.post("/{worldcup_id}/cardnews", response_model=CardNewsResponse)
 
 @router.post("/{worldcup_id}/cardnews", response_model=CardNewsResponse)
-def generate_cardnews(
+async def generate_cardnews(
     worldcup_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """카드뉴스 생성"""
     
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -412,10 +513,17 @@ def generate_cardnews(
         )
     
     # 순위 계산
-    rankings_data = worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    rankings_data = await worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    
+    # 외부 API 호출 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션 먼저 종료 (분석 결과는 마지막 커밋에서 저장)
+    await db.commit()
+    
+    # 사진 분석은 요청당 한 번씩 (워커 캐시 -> 사진에 저장된 결과 -> 내용 해시 -> GPT-4o)
+    analyzer = ai_service.PhotoAnalyzer()
     
     # AI 캐시 재사용
-    if worldcup.analysis_result:
+    new_analysis = not worldcup.analysis_result
+    if not new_analysis:
         print("===== 캐시된 AI 분석 결과 사용 (빠름!) =====")
         overall_keywords = worldcup.analysis_result["overall_keywords"]
         insight_story = worldcup.analysis_result["insight_story"]
@@ -423,11 +531,7 @@ def generate_cardnews(
         # 개별 사진 분석 (캐싱 적용!)
         rankings_for_card = []
         for item in rankings_data[:3]:
-            photo_analysis = ai_service.analyze_photo_from_path(
-                item["photo"].file_path,
-                photo_id=item["photo"].id,  # photo_id 전달
-                db=db  # db 전달
-            )
+            photo_analysis = await analyzer.analyze(item["photo"])
             rankings_for_card.append({
                 "rank": item["rank"],
                 "photo_path": item["photo"].file_path,
@@ -435,24 +539,15 @@ def generate_cardnews(
             })
     else:
         print("===== 새로운 AI 분석 실행 (느림) =====")
-        photo_paths = [item["photo"].file_path for item in rankings_data]
-        batch_analysis = ai_service.analyze_multiple_photos(photo_paths)
-        winner_analysis = ai_service.analyze_photo_from_path(
-            rankings_data[0]["photo"].file_path,
-            photo_id=rankings_data[0]["photo"].id,
-            db=db
-        )
-        insight_story = ai_service.generate_insight_story(batch_analysis, winner_analysis)
+        batch_analysis = await analyzer.analyze_many([item["photo"] for item in rankings_data])
+        winner_analysis = await analyzer.analyze(rankings_data[0]["photo"])
+        insight_story = await ai_service.generate_insight_story(batch_analysis, winner_analysis)
         overall_keywords = batch_analysis["overall_keywords"]
         
         # 개별 사진 분석 (캐싱 적용!)
         rankings_for_card = []
         for item in rankings_data[:3]:
-            photo_analysis = ai_service.analyze_photo_from_path(
-                item["photo"].file_path,
-                photo_id=item["photo"].id,
-                db=db
-            )
+            photo_analysis = await analyzer.analyze(item["photo"])
             rankings_for_card.append({
                 "rank": item["rank"],
                 "photo_path": item["photo"].file_path,
@@ -465,10 +560,16 @@ def generate_cardnews(
             "primary_emotion": batch_analysis["primary_emotion"],
             "insight_story": insight_story
         }
-        db.commit()
+    
+    # 분석 캐시(월드컵, 사진) 한 번에 커밋
+    await db.commit()
+    if new_analysis:
+        share_page_cache.invalidate_worldcup(worldcup.id)  # 공유 페이지에 새 분석 결과
     
     # 카드뉴스 생성
-    card_paths = cardnews_service.generate_cardnews(
+    # Pillow 렌더링은 CPU 작업이라 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+    card_paths = await run_in_threadpool(
+        cardnews_service.generate_cardnews,
         insight_story=insight_story,
         overall_keywords=overall_keywords,
         rankings=rankings_for_card,
@@ -485,19 +586,64 @@ def generate_cardnews(
         created_at=datetime.now(timezone.utc)
     )
 
+@router.get("/{worldcup_id}/vote/bracket", response_model=ReplayBracketResponse)
+async def get_replay_bracket(
+    worldcup_id: str,
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
+):
+    """브라켓 재현 투표용 대진표 (인증 불필요)
+    
+    노드 1..n-1이 매치, 첫 라운드는 노드 n/2..n-1 (노드 k의 두 자식 2k, 2k+1, entrants는 리프 n..2n-1)
+    노드 k 매치에서 photo_b(오른쪽)가 이기면 bracket_mask의 비트 k-1을 켜서 POST /vote에 {"bracket_mask": ...}
+    """
+    
+    # 월드컵 조회
+    worldcup = await db.get(Worldcup, worldcup_id)
+    if not worldcup:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="월드컵을 찾을 수 없습니다"
+        )
+    
+    # 완료된 월드컵만 투표 가능 (브라켓 기록이 없는 예전 월드컵은 재현 불가)
+    if worldcup.status != "completed" or not worldcup.bracket:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="브라켓 재현 투표를 할 수 없는 월드컵입니다"
+        )
+    
+    return ReplayBracketResponse(
+        worldcup_id=worldcup.id,
+        round_type=worldcup.round_type,
+        entrants=[
+            PhotoInMatch(id=photo_id, url=url)
+            for photo_id, url in zip(worldcup.bracket["entrants"], worldcup.bracket["urls"])
+        ]
+    )
+
 @router.post("/{worldcup_id}/vote")
-def vote_worldcup(
+async def vote_worldcup(
     worldcup_id: str,
-    rankings: list[dict] = Body(...),  # Body로 감싸기
+    rankings: list[dict] | BracketVoteRequest = Body(...),  # 순위 목록 또는 브라켓 재현 결과
     request: Request = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """월드컵 투표 (인증 선택)"""
     
     # current_user 제거 (선택적 인증 복잡해서 일단 빼기)
     
+    # IP 주소 가져오기
+    ip_address = request.client.host if request else "unknown"
+    
+    # 최근에 확인된 중복 투표는 DB 조회 없이 거절 (인기 공유 링크 투표 폭주 대비)
+    if vote_service.is_known_duplicate(worldcup_id, ip_address) or vote_buffer.is_pending(worldcup_id, ip_address):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이미 투표한 월드컵입니다"
+        )
+    
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -511,32 +657,59 @@ def vote_worldcup(
             detail="완료된 월드컵만 투표 가능합니다"
         )
     
-    # IP 주소 가져오기
-    ip_address = request.client.host if request else "unknown"
-    
-    # 중복 투표 체크
-    existing_vote = db.query(Vote)\
-        .filter(Vote.worldcup_id == worldcup_id, Vote.ip_address == ip_address)\
-        .first()
-    
-    if existing_vote:
+    bracket_mask = None
+    if isinstance(rankings, BracketVoteRequest):
+        # 브라켓 재현 투표: 매치별 결과 비트마스크 (상위 순위는 마스크에서 계산)
+        bracket_mask = rankings.bracket_mask
+        valid = bool(worldcup.bracket) and bracket_mask < 1 << (len(worldcup.bracket["entrants"]) - 1)
+        if valid:
+            rankings = worldcup_service.replay_rankings(worldcup, bracket_mask)
+    else:
+        # 투표 내용 검증 (이 월드컵의 사진, 사진별 1 ~ 참가 수 순위 하나씩, 최소 한 장)
+        if worldcup.bracket:
+            entrants = set(worldcup.bracket["entrants"])
+        else:
+            # 브라켓 기록이 없는 예전 월드컵은 저장된 순위(없으면 매치 기록)의 참가 사진으로
+            entrants = {
+                item["photo_id"]
+                for item in await worldcup_service.get_worldcup_rankings(db, worldcup_id, max_rank=None)
+            }
+        try:
+            vote_photo_ids = [item["photo_id"] for item in rankings]
+            valid = (
+                len(rankings) > 0
+                and all(type(item["rank"]) is int and 1 <= item["rank"] <= len(entrants) for item in rankings)
+                and len(set(vote_photo_ids)) == len(vote_photo_ids)
+                and set(vote_photo_ids) <= entrants
+            )
+        except (KeyError, TypeError):
+            valid = False
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 투표한 월드컵입니다"
+            detail="유효하지 않은 투표입니다"
         )
     
-    # 투표 저장
-    vote = Vote(
-        worldcup_id=worldcup_id,
-        user_id=None,  # 일단 익명만
-        ip_address=ip_address,
-        rankings=rankings
-    )
-    db.add(vote)
-    db.commit()
-    
     # 원본 결과 가져오기
-    original_rankings = worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    original_rankings = await worldcup_service.get_worldcup_rankings(db, worldcup_id)
+    
+    # 배치 저장 모드(VOTE_BUFFER_ENABLED)면 버퍼에 넣고 바로 응답 (저장은 다음 flush에서 모아서)
+    buffered = vote_buffer.add(worldcup_id, ip_address, rankings, bracket_mask)
+    if not buffered:
+        # 투표 저장 (중복이면 INSERT가 무시됨 - SELECT 없이 한 번에 판단)
+        vote_id = await vote_service.insert_vote(db, worldcup_id, ip_address, rankings, bracket_mask)
+        if vote_id is None:
+            vote_service.remember_vote(worldcup_id, ip_address)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미 투표한 월드컵입니다"
+            )
+        
+        # 요청 전체를 한 번에 커밋
+        await db.commit()
+        vote_service.remember_vote(worldcup_id, ip_address)
+        vote_stats_hub.notify(worldcup_id)  # 실시간 통계 구독자에게
+        trending_updater.record_vote(worldcup_id)  # 인기순 점수 (다음 반영 주기에)
     
     # 비교 분석
     match_count = 0
@@ -562,56 +735,159 @@ def vote_worldcup(
     }
 
 @router.get("/{worldcup_id}/votes/stats")
-def get_vote_stats(
+async def get_vote_stats(
     worldcup_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
 ):
     """월드컵 투표 통계 조회"""
     
     # 월드컵 조회
-    worldcup = db.query(Worldcup).filter(Worldcup.id == worldcup_id).first()
+    worldcup = await db.get(Worldcup, worldcup_id)
     if not worldcup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="월드컵을 찾을 수 없습니다"
         )
     
-    # 모든 투표 가져오기
-    votes = db.query(Vote).filter(Vote.worldcup_id == worldcup_id).all()
+    # 사진별 순위 통계 (DB에서 GROUP BY로 집계)
+    photo_stats = await vote_service.get_rank_stats(db, worldcup_id)
     
-    if not votes:
-        return {
-            "total_votes": 0,
-            "photo_stats": []
-        }
+    return {
+        "total_votes": await vote_service.get_vote_count(db, worldcup_id),
+        "photo_stats": photo_stats
+    }
+
+@router.get("/{worldcup_id}/votes/head-to-head")
+async def get_head_to_head(
+    worldcup_id: str,
+    photo_a: str = Query(..., description="사진 A ID"),
+    photo_b: str = Query(..., description="사진 B ID"),
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
+):
+    """두 사진의 맞대결 결과 (브라켓 재현 투표에서 직접 맞붙은 경우만)"""
     
-    # 사진별 순위 통계
-    photo_stats = {}
+    # 월드컵 조회
+    worldcup = await db.get(Worldcup, worldcup_id)
+    if not worldcup:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="월드컵을 찾을 수 없습니다"
+        )
     
-    for vote in votes:
-        for ranking in vote.rankings:
-            photo_id = ranking["photo_id"]
-            rank = ranking["rank"]
-            
-            if photo_id not in photo_stats:
-                photo_stats[photo_id] = {
-                    "photo_id": photo_id,
-                    "rank_1_count": 0,
-                    "rank_2_count": 0,
-                    "rank_3_count": 0,
-                    "rank_4_count": 0
-                }
-            
-            if rank == 1:
-                photo_stats[photo_id]["rank_1_count"] += 1
-            elif rank == 2:
-                photo_stats[photo_id]["rank_2_count"] += 1
-            elif rank == 3:
-                photo_stats[photo_id]["rank_3_count"] += 1
-            elif rank == 4:
-                photo_stats[photo_id]["rank_4_count"] += 1
+    # 브라켓 기록이 없는 예전 월드컵은 맞대결을 알 수 없음
+    if not worldcup.bracket:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="브라켓 기록이 없는 월드컵입니다"
+        )
     
-    return {
-        "total_votes": len(votes),
-        "photo_stats": list(photo_stats.values())
-    }
+    # 이 월드컵의 서로 다른 두 사진만
+    entrants = worldcup.bracket["entrants"]
+    if photo_a == photo_b or photo_a not in entrants or photo_b not in entrants:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이 월드컵의 서로 다른 두 사진을 선택해주세요"
+        )
+    
+    return await pairwise_service.get_head_to_head(db, worldcup, photo_a, photo_b)
+
+@router.get("/{worldcup_id}/votes/stream")
+async def stream_vote_stats(worldcup_id: str):
+    """월드컵 투표 통계 실시간 전송 (Server-Sent Events, 투표가 들어오면 stats 이벤트)"""
+    
+    # 월드컵 확인 (스트림이 열려 있는 동안 DB 커넥션을 잡지 않도록 의존성 대신 바로 닫는 세션)
+    async with ReadSessionLocal() as db:
+        worldcup = await db.get(Worldcup, worldcup_id)
+    if not worldcup:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="월드컵을 찾을 수 없습니다"
+        )
+    
+    async def event_stream():
+        # 같은 월드컵 구독자는 집계 결과 하나를 공유
+        async with vote_stats_hub.subscribe(worldcup_id) as updates:
+            while True:
+                try:
+                    stats = await asyncio.wait_for(updates.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # 프록시가 유휴 연결을 끊지 않도록
+                    continue
+                yield f"event: stats\ndata: {json.dumps(stats, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{worldcup_id}/votes/analytics")
+async def get_vote_analytics(
+    worldcup_id: str,
+    db: AsyncSession = Depends(get_read_db)  # 조회 전용 (복제본)
+):
+    """월드컵 투표 분석 (Borda 점수, 평균 순위, 만든 사람 순위와의 일치도, 합의 순위)"""
+    
+    # 월드컵 조회
+    worldcup = await db.get(Worldcup, worldcup_id)
+    if not worldcup:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="월드컵을 찾을 수 없습니다"
+        )
+    
+    # 투표는 완료된 월드컵만 가능
+    if worldcup.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="완료된 월드컵만 분석할 수 있습니다"
+        )
+    
+    # 브라켓 기록이 없는 예전 월드컵은 사진 순서(entrants)를 알 수 없음
+    if not worldcup.bracket:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="브라켓 기록이 없어 분석할 수 없는 월드컵입니다"
+        )
+    
+    return await analytics_service.get_vote_analytics(db, worldcup)
+
+@router.get("/{worldcup_id}/votes/export")
+async def export_votes(
+    worldcup_id: str,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="내보내기 형식"),
+    cursor: str | None = Query(None, description="이어받기 - 마지막으로 받은 행의 cursor"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """월드컵 투표 원본 내보내기 (만든 사람만, 스트리밍)
+    
+    최근 vote_late_slack_seconds 안의 투표는 빠지고 다음 이어받기(cursor) 때 포함
+    (늦게 커밋된 투표를 이어받기에서 건너뛰지 않도록)
+    """
+    
+    # 월드컵 조회
+    worldcup = await db.get(Worldcup, worldcup_id)
+    if not worldcup:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="월드컵을 찾을 수 없습니다"
+        )
+    
+    # 권한 확인
+    if worldcup.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="권한이 없습니다"
+        )
+    
+    chunks = vote_export.export_votes(worldcup_id, format, cursor)
+    
+    # 요청 세션은 스트리밍이 끝난 뒤에 닫히므로 여기서 커넥션 반환 (내보내기는 별도 세션)
+    await db.close()
+    
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="votes-{worldcup_id}.{format}"'}
+    )
@@ -13,13 +13,54 @@ class Settings(BaseSettings):
     # Database
     database_url: str
     
+    # Database 커넥션 풀 (워커당)
+    db_pool_size: int = 10  # 상시 유지 커넥션 수 (시작 시 미리 연결)
+    db_max_overflow: int = 20  # 피크 시 추가로 열 수 있는 커넥션 수
+    db_pool_timeout: float = 30.0  # 커넥션 대기 최대 시간 (초)
+    db_pool_recycle: int = 1800  # 커넥션 재생성 주기 (초)
+    db_pool_pre_ping: bool = True  # 사용 전 커넥션 유효성 검사
+    
+    # Database 읽기 전용 복제본 (없으면 모든 조회를 primary에서)
+    database_replica_url: str | None = None
+    db_replica_sticky_seconds: int = 10  # 쓰기 후 이 시간 동안은 조회도 primary에서 (복제 지연 대비)
+    
+    # 투표
+    vote_counter_shards: int = 8  # 월드컵당 투표 카운터 행 수 (인기 월드컵 동시 투표 시 락 경합 분산)
+    vote_dedup_cache_size: int = 100_000  # 워커당 기억하는 최근 (월드컵, IP) 투표 수 (중복 투표 DB 조회 없이 거절)
+    vote_buffer_enabled: bool = False  # 투표를 모았다가 배치로 저장 (write-behind, 내구성은 app/services/vote_buffer.py 참고)
+    vote_buffer_flush_ms: int = 200  # 버퍼 flush 주기 (밀리초)
+    vote_buffer_max_size: int = 500  # 이만큼 쌓이면 주기 전이라도 flush (배치당 최대 투표 수)
+    vote_buffer_max_pending: int = 10_000  # 버퍼가 이만큼 밀리면 (DB 장애 등) 새 투표는 요청 안에서 바로 저장
+    vote_stream_interval_ms: int = 500  # 실시간 통계(SSE) 집계 최소 간격 (월드컵당, 그 사이 투표는 합쳐서 한 번에)
+    vote_late_slack_seconds: float = 10.0  # 이보다 최근 투표는 앞선 투표가 아직 커밋 전일 수 있어 분석 캐시에 누적/내보내기에서 제외
+    vote_stream_poll_seconds: float = 2.0  # 다른 워커에서 들어온 투표 확인 주기 (투표 수만 조회)
+    trending_half_life_hours: float = 24.0  # 인기순 점수 반감기 (이 시간이 지나면 투표 하나의 점수가 절반)
+    trending_flush_seconds: float = 10.0  # 워커에 모은 투표를 인기순 점수에 반영하는 주기
+    trending_decay_minutes: float = 10.0  # 투표 없는 공유의 점수까지 감쇠하는 작업 주기
+    
+    # 공유 페이지 캐시
+    share_cache_ttl_seconds: float = 30.0  # 공유 페이지 응답 보관 시간 (투표 수는 최대 이만큼 늦게 반영)
+    share_cache_size: int = 10_000  # 워커당 보관하는 공유 페이지 수
+    
+    # 공개 월드컵 목록 캐시 (커서 없는 앞쪽 페이지만)
+    public_feed_cache_ttl_seconds: float = 5.0  # 이 시간 동안은 캐시 그대로
+    public_feed_cache_stale_seconds: float = 30.0  # TTL이 지나도 이 시간까지는 캐시로 응답하고 백그라운드에서 갱신
+    public_feed_cache_pages: int = 3  # 캐시하는 앞쪽 페이지 수 (page 파라미터 기준)
+    public_feed_cache_size: int = 256  # 워커당 보관하는 (정렬, 페이지, 개수) 조합 수
+    
+    # 운영 지표
+    rollup_shards: int = 8  # 날짜 × 지표당 카운터 행 수 (투표 폭주 시 하루 한 행에 락이 몰리지 않도록)
+    admin_emails: list[str] = []  # 관리자 API를 쓸 수 있는 계정 (ADMIN_EMAILS='["admin@example.com"]')
+    
     # JWT
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    token_revocation_refresh_seconds: float = 30.0  # 전체 로그아웃(토큰 무효화) 목록 갱신 주기 - 다른 워커에는 최대 이만큼 늦게 반영
     
     # OpenAI API
     openai_api_key: str = ""
+    ai_photo_cache_size: int = 10_000  # 워커당 메모리에 보관하는 사진 분석 결과 수 (DB 컬럼 앞단)
     
     @field_validator('secret_key')
     def validate_secret_key(cls, v):
@@ -0,0 +1,94 @@
+# app/core/cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from app.core.logger import logger
+
+class LRUCache:
+    """워커(프로세스) 단위 LRU 캐시 (최대 개수를 넘으면 가장 오래 안 쓴 항목부터 제거)"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def set(self, key: Hashable, value: Any = True) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+    
+    def keys(self) -> list:
+        return list(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SWRCache:
+    """TTL 캐시 + stale-while-revalidate + single-flight (워커 단위)
+    
+    - ttl 이내: 캐시 값
+    - ttl이 지났어도 ttl + stale 이내: 캐시 값을 바로 주고 백그라운드에서 한 번만 다시 계산
+    - 그보다 오래됐거나 없으면 계산 (동시 요청은 같은 계산을 기다림)
+    """
+    
+    def __init__(self, ttl_seconds: float, stale_seconds: float, maxsize: int):
+        self.ttl = ttl_seconds
+        self.stale = stale_seconds
+        self._entries = LRUCache(maxsize=maxsize)  # 키 -> (계산 완료 시각, 값)
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+    
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            loaded_at, value = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale:
+                self._refresh(key, loader)  # 기다리지 않음
+                return value
+    
+        # 기다리던 요청이 끊겨도 계산은 취소하지 않음
+        return await asyncio.shield(self._refresh(key, loader))
+    
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """조건에 맞는 키 삭제 (진행 중인 계산 결과도 저장하지 않음)"""
+        for key in [key for key in self._entries.keys() if predicate(key)]:
+            self._entries.pop(key)
+        for key in [key for key in self._inflight if predicate(key)]:
+            del self._inflight[key]
+    
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._load(key, loader))
+            # 백그라운드 갱신 실패는 _load에서 기록 (기다리는 요청이 없어도 경고가 남지 않도록)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+    
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            if self._inflight.get(key) is task:
+                self._entries.set(key, (time.monotonic(), value))
+            return value
+        except Exception as e:
+            logger.error(f"캐시 갱신 실패 ({key}): {e}")
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
@@ -0,0 +1,45 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+def encode_cursor(sort_value: datetime | float, row_id: str) -> str:
+    """(정렬 값, id)를 불투명 커서 문자열로 인코딩 (정렬 값은 시각 또는 점수)"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_type: type = datetime) -> tuple[datetime | float, str]:
+    """커서 문자열을 (정렬 값, id)로 디코딩 (sort_type: 정렬 컬럼의 파이썬 타입)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_type is datetime:
+            return datetime.fromisoformat(sort_value), str(row_id)
+        if isinstance(sort_value, bool) or not isinstance(sort_value, (int, float)):
+            raise ValueError("정렬 값 타입 불일치")
+        return float(sort_value), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다"
+        )
+
+def keyset_after(sort_column, id_column, cursor: str, descending: bool = True):
+    """(sort_column, id_column) 정렬 기준으로 커서 다음 행만 고르는 조건 (기본 내림차순)"""
+    sort_value, row_id = decode_cursor(cursor, sort_column.type.python_type)
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(sort_value, row_id)
+    return tuple_(sort_column, id_column) > tuple_(sort_value, row_id)
+
+def next_cursor_of(rows: list, limit: int, sort_key, id_key) -> tuple[list, str | None]:
+    """limit + 1개를 조회한 결과에서 현재 페이지와 다음 커서를 분리"""
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_key(last), id_key(last))
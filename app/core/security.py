@@ -26,6 +26,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+def token_claims(user) -> dict:
+    """액세스 토큰에 담는 클레임 (인증 시 DB 조회 없이 쓰는 정보)"""
+    return {
+        "sub": user.email,
+        "user_id": user.id,
+        "premium": bool(user.is_premium),
+        "ver": user.token_version or 0  # 전체 로그아웃 시 무효화 기준
+    }
+
 def decode_access_token(token: str) -> Optional[dict]:
     """JWT 토큰 디코드"""
     try:
@@ -1,26 +1,165 @@
 # app/database.py
-from sqlalchemy import create_engine
+import asyncio
+import time
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import exc, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
-# 데이터베이스 엔진 생성
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug  # SQL 쿼리 로그 출력
-)
+def to_async_url(url: str):
+    """비동기 드라이버 URL (alembic은 기존 psycopg2 URL 그대로 사용)"""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+# 현재 커넥션 획득 중 새 커넥션 생성에 쓴 시간 (동시 획득끼리 섞이지 않도록 컨텍스트별 기록)
+_connect_elapsed: ContextVar[float] = ContextVar("connect_elapsed", default=0.0)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션 획득 대기 시간을 누적 기록하는 풀"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquire_count = 0  # 커넥션 획득 횟수
+        self.wait_seconds = 0.0  # 누적 대기 시간 (커넥션 반환을 기다린 시간)
+        self.connect_seconds = 0.0  # 누적 새 커넥션 생성 시간
+        self.timeout_count = 0  # pool_timeout 초과 횟수
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.connect_seconds += elapsed
+            _connect_elapsed.set(_connect_elapsed.get() + elapsed)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        token = _connect_elapsed.set(0.0)
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeout_count += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.acquire_count += 1
+            self.wait_seconds += max(elapsed - _connect_elapsed.get(), 0.0)
+            _connect_elapsed.reset(token)
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        to_async_url(url),
+        echo=settings.debug,  # SQL 쿼리 로그 출력
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping
+    )
+
+# 데이터베이스 엔진 생성 (primary)
+engine = _create_engine(settings.database_url)
+
+# 읽기 전용 복제본 엔진 (설정된 경우만)
+replica_engine = _create_engine(settings.database_replica_url) if settings.database_replica_url else None
 
 # 세션 팩토리
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 요청 단위 트랜잭션(Unit of Work): 서비스는 flush만 하고, 커밋은 핸들러 마지막에 한 번
+# expire_on_commit=False: 커밋 후에도 로드한 객체를 다시 조회하지 않고 그대로 사용
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# 조회 전용 세션 팩토리 (복제본이 없으면 primary)
+ReadSessionLocal = async_sessionmaker(
+    bind=replica_engine or engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# 쓰기 후 primary 고정 시각 (세션 쿠키에 저장)
+PRIMARY_STICKY_KEY = "db_primary_until"
+
+def _mark_primary_sticky(session: Session):
+    """이 요청에서 쓰기가 일어났으면 한동안 조회도 primary로 (복제 지연으로 방금 쓴 데이터가 안 보이는 문제 방지)"""
+    request = session.info.get("request")
+    if request is not None and replica_engine is not None:
+        request.session[PRIMARY_STICKY_KEY] = time.time() + settings.db_replica_sticky_seconds
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    _mark_primary_sticky(session)
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    # flush를 거치지 않는 INSERT/UPDATE/DELETE 문 (bulk insert 등)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_primary_sticky(orm_execute_state.session)
 
 # Base 클래스 (모든 모델의 부모)
 Base = declarative_base()
 
 # DB 세션 의존성 (FastAPI에서 사용)
-def get_db():
-    """DB 세션 생성 및 종료"""
-    db = SessionLocal()
-    try:
+async def get_db(request: Request):
+    """DB 세션 생성 및 종료 (커밋하지 않은 변경은 종료 시 롤백)"""
+    async with SessionLocal(info={"request": request}) as db:
         yield db
-    finally:
-        db.close()
+
+async def get_read_db(request: Request):
+    """조회 전용 DB 세션 (복제본, 최근에 쓰기를 한 클라이언트는 primary)"""
+    sticky_until = request.session.get(PRIMARY_STICKY_KEY, 0)
+    if replica_engine is None or sticky_until > time.time():
+        session_factory = SessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    
+    async with session_factory() as db:
+        yield db
+
+async def warm_up_pool() -> int:
+    """서버 시작 시 pool_size만큼 커넥션을 미리 열어둠 (첫 요청 지연 제거)"""
+    engines = [engine] + ([replica_engine] if replica_engine is not None else [])
+    connections = await asyncio.gather(
+        *[e.connect() for e in engines for _ in range(settings.db_pool_size)]
+    )
+    for conn in connections:
+        await conn.close()  # 풀로 반환 (연결은 유지됨)
+    return len(connections)
+
+async def dispose_engines():
+    """서버 종료 시 모든 커넥션 정리"""
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+def get_pool_status() -> dict:
+    """커넥션 풀 현황 (워커 단위, 복제본은 replica 항목)"""
+    status = _pool_status(engine.pool)
+    status["replica"] = _pool_status(replica_engine.pool) if replica_engine is not None else None
+    return status
+
+def _pool_status(pool: InstrumentedQueuePool) -> dict:
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),  # 사용 중
+        "idle": pool.checkedin(),  # 대기 중 (풀에 반환된 커넥션)
+        "overflow": max(pool.overflow(), 0),  # pool_size를 넘어 추가로 연 커넥션
+        "max_overflow": settings.db_max_overflow,
+        "acquire_count": pool.acquire_count,
+        "wait_seconds_total": round(pool.wait_seconds, 4),
+        "connect_seconds_total": round(pool.connect_seconds, 4),
+        "timeout_count": pool.timeout_count
+    }
@@ -5,3 +5,9 @@ from app.models.worldcup import Worldcup
 from app.models.match import Match
 from app.models.share import Share
 from app.models.vote import Vote
+from app.models.vote_ranking import VoteRanking
+from app.models.vote_counter import VoteCounter
+from app.models.ranking import WorldcupRanking
+from app.models.vote_analytics import VoteAnalytics
+from app.models.daily_rollup import DailyRollup
+from app.models.content_analysis import ContentAnalysis
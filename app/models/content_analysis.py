@@ -0,0 +1,20 @@
+# app/models/content_analysis.py
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ContentAnalysis(Base):
+    """이미지 내용(SHA-256)별 AI 분석 결과 - 유저/업로드가 달라도 같은 파일이면 한 번만 분석"""
+    __tablename__ = "content_analyses"
+    
+    # 기본 필드
+    content_hash = Column(String(64), primary_key=True)  # 이미지 바이트 SHA-256 (hex)
+    
+    # 분석 결과 (Photo.analysis_result와 같은 형식)
+    result = Column(JSON, nullable=False)  # {"keywords": [...], "emotion": "...", "description": "..."}
+    
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ContentAnalysis {self.content_hash[:12]}>"
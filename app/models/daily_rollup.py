@@ -0,0 +1,18 @@
+# app/models/daily_rollup.py
+from sqlalchemy import Column, String, Integer, Date
+from app.database import Base
+
+class DailyRollup(Base):
+    """일별 운영 지표 카운터 (쓰기 경로에서 바로 증가, 날짜 × 지표마다 여러 행으로 나눠 락 경합 분산)"""
+    __tablename__ = "daily_rollups"
+    
+    # 기본 필드
+    day = Column(Date, primary_key=True)  # UTC 날짜
+    metric = Column(String, primary_key=True)  # worldcups_created, worldcups_completed, votes, ai_analyses
+    shard = Column(Integer, primary_key=True)  # 0 ~ rollup_shards - 1
+    
+    # 카운트 (날짜별 지표 값 = 모든 샤드의 합)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<DailyRollup {self.day} {self.metric}#{self.shard}: {self.count}>"
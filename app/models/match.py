@@ -1,5 +1,5 @@
 # app/models/match.py
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import uuid
@@ -29,5 +29,9 @@ class Match(Base):
     photo_b = relationship("Photo", foreign_keys=[photo_b_id])
     winner = relationship("Photo", foreign_keys=[winner_photo_id])
     
+    __table_args__ = (
+        Index("idx_matches_worldcup_id", "worldcup_id"),
+    )
+    
     def __repr__(self):
         return f"<Match Round {self.round_number} - {self.match_order}>"
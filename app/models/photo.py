@@ -1,5 +1,5 @@
 # app/models/photo.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,6 +17,7 @@ class Photo(Base):
     filename = Column(String, nullable=False)  # 원본 파일명
     file_path = Column(String, nullable=False)  # 저장 경로
     file_size = Column(String)  # 파일 크기 (bytes)
+    content_hash = Column(String(64), nullable=True)  # 파일 SHA-256 (hex) - AI 분석 공유 키 (content_analyses)
     
     # URL
     url = Column(String, nullable=False)  # 이미지 URL
@@ -30,5 +31,9 @@ class Photo(Base):
 
     analysis_result = Column(JSON, nullable=True)
     
+    __table_args__ = (
+        Index("idx_photos_user_uploaded", user_id, uploaded_at.desc(), id.desc()),  # 내 사진 목록 커서 페이지네이션
+    )
+    
     def __repr__(self):
         return f"<Photo {self.filename}>"
@@ -0,0 +1,26 @@
+# app/models/ranking.py
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class WorldcupRanking(Base):
+    """월드컵 최종 순위 모델 (완료 시 한 번 계산해 저장)"""
+    __tablename__ = "worldcup_rankings"
+    
+    # 기본 필드
+    worldcup_id = Column(String, ForeignKey("worldcups.id", ondelete="CASCADE"), primary_key=True)
+    photo_id = Column(String, ForeignKey("photos.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 순위 정보
+    rank = Column(Integer, nullable=False)  # 1, 2, 3, 5, 9 (같은 라운드 탈락자는 공동 순위)
+    eliminated_round = Column(Integer, nullable=True)  # 탈락한 라운드 번호 (우승은 None)
+    
+    # 관계
+    photo = relationship("Photo")
+    
+    __table_args__ = (
+        Index("idx_worldcup_rankings_worldcup_rank", "worldcup_id", "rank"),
+    )
+    
+    def __repr__(self):
+        return f"<WorldcupRanking {self.worldcup_id} #{self.rank}>"
@@ -1,5 +1,5 @@
 # app/models/share.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -21,6 +21,10 @@ class Share(Base):
     # 만료
     expires_at = Column(DateTime(timezone=True), nullable=True)
     
+    # 인기순 (투표마다 1점, 시간에 따라 감쇠 - app/services/trending_service.py 참고)
+    trending_score = Column(Float, nullable=False, default=0, server_default="0")
+    trending_decayed_at = Column(DateTime(timezone=True), nullable=True)  # trending_score를 마지막으로 감쇠한 시각
+    
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -28,6 +32,14 @@ class Share(Base):
     worldcup = relationship("Worldcup")
     user = relationship("User")
     
+    __table_args__ = (
+        # 공개 피드 커서 페이지네이션 (is_public인 것만)
+        Index("idx_shares_public_created", created_at.desc(), id.desc(), postgresql_where=text("is_public")),
+        # 공개 피드 인기순 (is_public인 것만, 감쇠 작업도 이 인덱스로 점수 있는 행만 훑음)
+        Index("idx_shares_public_trending", trending_score.desc(), id.desc(), postgresql_where=text("is_public")),
+        Index("idx_shares_worldcup_user", "worldcup_id", "user_id"),  # 공유 링크 중복 체크
+    )
+    
     def is_expired(self) -> bool:
         """만료 여부 확인"""
         if not self.expires_at:
@@ -1,5 +1,5 @@
 # app/models/user.py
-from sqlalchemy import Column, String, Boolean, DateTime, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Index, text
 from sqlalchemy.sql import func
 from app.database import Base
 import uuid
@@ -17,6 +17,7 @@ class User(Base):
     # 계정 상태
     is_active = Column(Boolean, default=True)
     is_premium = Column(Boolean, default=False)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # 올리면 이전에 발급한 토큰 모두 무효 (전체 로그아웃)
     
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -30,6 +31,11 @@ class User(Base):
     provider: str | None = Column(String, nullable=True)  # google, kakao, None
     provider_id: str | None = Column(String, nullable=True)  # OAuth 제공자의 user ID
     profile_image: str | None = Column(String, nullable=True)  # 프로필 이미지 URL
+    
+    __table_args__ = (
+        # 토큰 무효화 목록 (token_version을 올린 유저만, 워커마다 주기적으로 전체 조회)
+        Index("idx_users_token_version", "id", "token_version", postgresql_where=text("token_version > 0")),
+    )
 
     def __repr__(self):
         return f"<User {self.email}>"
@@ -1,5 +1,5 @@
 # app/models/vote.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -18,7 +18,8 @@ class Vote(Base):
     ip_address = Column(String, nullable=False)  # 중복 투표 방지
     
     # 투표 결과
-    rankings = Column(JSON, nullable=False)  # [{"photo_id": "...", "rank": 1}, ...]
+    rankings = Column(JSON, nullable=True)  # [{"photo_id": "...", "rank": 1}, ...] (원본 그대로, 브라켓 재현 투표는 NULL)
+    bracket_mask = Column(Integer, nullable=True)  # 브라켓 재현 투표 결과 (n-1비트, 비트 k-1 = 노드 k에서 오른쪽 사진 승리)
     
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -26,6 +27,12 @@ class Vote(Base):
     # 관계
     worldcup = relationship("Worldcup", backref="votes")
     user = relationship("User", backref="votes")
+    ranking_entries = relationship("VoteRanking", cascade="all, delete-orphan", passive_deletes=True)  # 통계용 정규화 순위
+    
+    __table_args__ = (
+        UniqueConstraint("worldcup_id", "ip_address", name="uq_votes_worldcup_ip"),  # 월드컵당 IP 하나만 투표
+        Index("idx_votes_worldcup_created", "worldcup_id", "created_at"),  # 투표 분석 증분 조회 (마지막 반영 이후 투표)
+    )
     
     def __repr__(self):
         return f"<Vote {self.id} for Worldcup {self.worldcup_id}>"
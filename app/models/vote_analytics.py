@@ -0,0 +1,24 @@
+# app/models/vote_analytics.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+class VoteAnalytics(Base):
+    """월드컵 투표 분석 누적값 스냅샷 (워커가 새로 떠도 처음부터 다시 계산하지 않도록)"""
+    __tablename__ = "vote_analytics"
+    
+    # 기본 필드
+    worldcup_id = Column(String, ForeignKey("worldcups.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 누적 범위 (created_at이 settled_until 이하인 투표까지 반영)
+    settled_until = Column(DateTime(timezone=True), nullable=False)
+    vote_count = Column(Integer, nullable=False, default=0)
+    
+    # 누적값 (사진 배열은 bracket entrants 순서)
+    stats = Column(JSON, nullable=False)  # {"ranked_count": [...], "rank_sum": [...], "rank_sq_sum": [...], "borda": [...], "tau_sum": ..., ...}
+    
+    # 타임스탬프
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<VoteAnalytics {self.worldcup_id}: {self.vote_count}>"
@@ -0,0 +1,17 @@
+# app/models/vote_counter.py
+from sqlalchemy import Column, String, Integer, ForeignKey
+from app.database import Base
+
+class VoteCounter(Base):
+    """월드컵 투표 수 카운터 (월드컵당 여러 행으로 나눠 동시 투표 시 한 행에 락이 몰리지 않도록)"""
+    __tablename__ = "vote_counters"
+    
+    # 기본 필드
+    worldcup_id = Column(String, ForeignKey("worldcups.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)  # 0 ~ vote_counter_shards - 1
+    
+    # 카운트 (월드컵 투표 수 = 모든 샤드의 합)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<VoteCounter {self.worldcup_id}#{self.shard}: {self.count}>"
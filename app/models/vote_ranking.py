@@ -0,0 +1,22 @@
+# app/models/vote_ranking.py
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
+from app.database import Base
+
+class VoteRanking(Base):
+    """투표 순위 모델 (투표 한 건의 사진별 순위, 통계를 SQL로 집계하기 위한 정규화 테이블)"""
+    __tablename__ = "vote_rankings"
+    
+    # 기본 필드
+    vote_id = Column(String, ForeignKey("votes.id", ondelete="CASCADE"), primary_key=True)
+    photo_id = Column(String, ForeignKey("photos.id", ondelete="CASCADE"), primary_key=True)
+    worldcup_id = Column(String, ForeignKey("worldcups.id", ondelete="CASCADE"), nullable=False)
+    
+    # 순위
+    rank = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("idx_vote_rankings_worldcup_photo_rank", "worldcup_id", "photo_id", "rank"),  # 투표 통계 GROUP BY
+    )
+    
+    def __repr__(self):
+        return f"<VoteRanking {self.vote_id} {self.photo_id} #{self.rank}>"
@@ -23,6 +23,9 @@ class Worldcup(Base):
     round_type = Column(Integer, nullable=False)  # 4, 8, 16
     status = Column(SQLEnum(WorldcupStatus), default=WorldcupStatus.IN_PROGRESS)
     
+    # 진행 상태 (힙 인덱스 브라켓: entrants, decided/right_won 비트마스크)
+    bracket = Column(JSON, nullable=True)
+    
     # 결과
     winner_photo_id = Column(String, ForeignKey("photos.id", ondelete="SET NULL"), nullable=True)
     
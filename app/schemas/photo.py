@@ -18,3 +18,9 @@ class PhotoUploadResponse(BaseModel):
     """사진 업로드 응답"""
     photos: list[PhotoResponse]
     total: int
+
+class PhotoListResponse(BaseModel):
+    """사진 목록 응답 (커서 페이지네이션)"""
+    photos: list[PhotoResponse]
+    next_cursor: str | None  # 다음 페이지 커서 (없으면 마지막 페이지)
+    total: int | None = None  # include_total=true일 때만
@@ -30,4 +30,5 @@ class SharedWorldcupResponse(BaseModel):
     primary_emotion: str
     insight_story: dict
     card_images: list[str] | None
+    vote_count: int = 0
     created_at: datetime
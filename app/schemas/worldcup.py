@@ -43,6 +43,16 @@ class MatchSelectRequest(BaseModel):
     """매치 선택 요청"""
     winner_photo_id: str
 
+class BracketVoteRequest(BaseModel):
+    """브라켓 재현 투표 (만든 사람과 같은 대진표로 진행한 결과)"""
+    bracket_mask: int = Field(..., ge=0, description="n-1비트, 비트 k-1 = 노드 k 매치에서 photo_b 승리")
+
+class ReplayBracketResponse(BaseModel):
+    """브라켓 재현 투표용 대진표 (entrants 순서 = 첫 라운드 photo_a, photo_b 순)"""
+    worldcup_id: str
+    round_type: int
+    entrants: List[PhotoInMatch]
+
 class RankingPhoto(BaseModel):
     """순위별 사진"""
     rank: int
@@ -1,17 +1,33 @@
 # app/services/ai_service.py
+import asyncio
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.core.cache import LRUCache
+from app.core.logger import logger
+from app.database import SessionLocal
+from app.models.photo import Photo
+from app.models.content_analysis import ContentAnalysis
+from app.services import rollup_service
 import base64
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from openai import APIError, APITimeoutError, RateLimitError
 
 # OpenAI 클라이언트 초기화 (타임아웃 설정)
-client = OpenAI(
+client = AsyncOpenAI(
     api_key=settings.openai_api_key,
     timeout=30.0  # 30초 타임아웃
 )
 
+# 내용 해시(없으면 사진 ID) -> 분석 결과 (워커 단위, DB 앞단 - PhotoAnalyzer 참고)
+_photo_cache = LRUCache(maxsize=settings.ai_photo_cache_size)
+
+def _cache_key(photo: Photo) -> str:
+    return photo.content_hash or photo.id
+
 def encode_image_to_base64(image_path: str) -> str:
     """이미지 파일을 base64로 인코딩"""
     with open(image_path, "rb") as image_file:
@@ -24,24 +40,12 @@ def encode_image_to_base64(image_path: str) -> str:
     reraise=True
 )
 
-def analyze_photo_from_path(file_path: str, photo_id: str = None, db = None) -> dict:
-    """사진 분석 (캐싱 지원)"""
-    from app.models.photo import Photo
-    
-    # ===== 캐시 확인 =====
-    if photo_id and db:
-        photo = db.query(Photo).filter(Photo.id == photo_id).first()
-        if photo and photo.analysis_result:
-            print(f"===== 사진 {photo_id} 캐시 사용 =====")
-            return photo.analysis_result
-    # ====================
-    
-    # 캐시 없으면 분석
-    print(f"===== 사진 {photo_id or file_path} 새 분석 =====")
+async def analyze_photo_from_path(file_path: str) -> dict:
+    """사진 분석 (GPT-4o 직접 호출, 캐시 없음 - 핸들러에서는 PhotoAnalyzer 사용)"""
+    print(f"===== 사진 {file_path} 새 분석 =====")
     
-    # Base64 인코딩
-    with open(file_path, "rb") as image_file:
-        base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+    # Base64 인코딩 (파일 읽기는 스레드에서 - 이벤트 루프 블로킹 방지)
+    base64_image = await run_in_threadpool(encode_image_to_base64, file_path)
     
     # GPT-4 Vision 호출
     prompt = """이 사진을 분석해주세요:
@@ -53,7 +57,7 @@ JSON 형식:
 {"keywords": ["키워드1", "키워드2", "키워드3"], "emotion": "happy", "description": "설명"}
 """
     
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o",
         messages=[
             {
@@ -71,68 +75,139 @@ JSON 형식:
     result_text = result_text.replace("```json", "").replace("```", "").strip()
     result = json.loads(result_text)
     
-    # ===== 캐시 저장 =====
-    if photo_id and db:
-        photo = db.query(Photo).filter(Photo.id == photo_id).first()
-        if photo:
-            photo.analysis_result = result
-            db.commit()
-            print(f"===== 사진 {photo_id} 캐시 저장 완료 =====")
-    # ====================
+    # 일별 AI 분석 수 (실제로 호출한 경우만)
+    await rollup_service.record(rollup_service.AI_ANALYSES)
     
     return result
 
-def analyze_multiple_photos(photo_paths: list[str]) -> dict:
-    """여러 사진 배치 분석 (에러 핸들링 강화)"""
+class PhotoAnalyzer:
+    """요청 하나의 사진 분석 (같은 사진은 요청당 한 번만, 핸들러마다 새로 만들어 사용)
+
+    조회 순서: 요청 내 메모 -> 워커 LRU -> Photo.analysis_result -> content_analyses(내용 해시) -> GPT-4o
+    - 내용 해시가 있는 사진은 해시로 공유 (다른 유저가 올린 같은 파일, 재업로드)
+    - content_analyses 조회/저장은 짧은 별도 세션 - GPT 호출 동안에는 커넥션을 잡지 않음
+      (호출하는 핸들러도 분석 전에 자기 트랜잭션을 끝내야 함)
+    - 새 결과는 LRU, content_analyses(바로 커밋), Photo.analysis_result(호출한 핸들러의 커밋에 반영)에 저장
+    """
     
-    results = []
-    all_keywords = []
-    emotions = []
-    failed_count = 0
+    def __init__(self):
+        self._memo: dict[str, asyncio.Task] = {}  # 캐시 키 -> 분석 태스크 (동시 호출도 한 번만)
+        self._looked_up: set[str] = set()  # 이미 content_analyses를 조회한 해시 (없던 해시도 다시 조회하지 않음)
     
-    # 각 사진 개별 분석
-    for path in photo_paths:
+    async def analyze(self, photo: Photo) -> dict:
+        """사진 하나 분석 (실패도 요청 안에서는 다시 시도하지 않음)"""
+        key = _cache_key(photo)
+        task = self._memo.get(key)
+        if task is None:
+            task = self._memo[key] = asyncio.create_task(self._analyze(photo))
+        result = await task
+        
+        if not photo.analysis_result:
+            photo.analysis_result = result
+        return result
+    
+    async def _analyze(self, photo: Photo) -> dict:
+        key = _cache_key(photo)
+        result = _photo_cache.get(key) or photo.analysis_result
+        if result is None and photo.content_hash:
+            await self._prefetch([photo])
+            result = _photo_cache.get(key)
+        
+        if result is None:
+            result = await analyze_photo_from_path(photo.file_path)
+            if photo.content_hash:
+                await self._save(photo.content_hash, result)
+        
+        _photo_cache.set(key, result)
+        return result
+    
+    async def _prefetch(self, photos: list[Photo]) -> None:
+        """캐시에 없는 사진들의 내용 해시 분석 결과를 한 번에 조회해 LRU에 채움"""
+        hashes = {
+            photo.content_hash for photo in photos
+            if photo.content_hash and not photo.analysis_result
+            and photo.content_hash not in _photo_cache and photo.content_hash not in self._looked_up
+        }
+        if not hashes:
+            return
+        self._looked_up |= hashes
+        
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(ContentAnalysis.content_hash, ContentAnalysis.result)
+                .where(ContentAnalysis.content_hash.in_(hashes))
+            )
+            for content_hash, analysis in result:
+                _photo_cache.set(content_hash, analysis)
+    
+    async def _save(self, content_hash: str, result: dict) -> None:
+        """새 분석 결과를 내용 해시로 저장 (짧은 트랜잭션, 실패해도 분석 결과는 그대로 사용)"""
         try:
-            analysis = analyze_photo_from_path(path)
-            results.append({
-                "path": path,
-                "keywords": analysis["keywords"],
-                "emotion": analysis["emotion"],
-                "description": analysis["description"]
-            })
-            
-            # 전체 키워드 모으기
-            all_keywords.extend(analysis["keywords"])
-            emotions.append(analysis["emotion"])
-            
+            async with SessionLocal() as db:
+                # 동시에 같은 파일을 분석한 다른 요청이 먼저 저장했으면 그대로 둠
+                await db.execute(
+                    insert(ContentAnalysis)
+                    .values(content_hash=content_hash, result=result)
+                    .on_conflict_do_nothing()
+                )
+                await db.commit()
         except Exception as e:
-            print(f"사진 분석 실패 ({path}): {e}")
-            failed_count += 1
-            # 실패해도 계속 진행
-            continue
-    
-    # 최소 1장이라도 성공해야 함
-    if not results:
-        raise Exception("모든 사진 분석 실패")
-    
-    # 키워드 빈도 계산
-    from collections import Counter
-    keyword_counts = Counter(all_keywords)
-    top_keywords = [k for k, v in keyword_counts.most_common(5)]
-    
-    # 주요 감정
-    emotion_counts = Counter(emotions)
-    primary_emotion = emotion_counts.most_common(1)[0][0] if emotions else "peaceful"
-    
-    return {
-        "total_photos": len(photo_paths),
-        "analyzed_photos": len(results),
-        "failed_photos": failed_count,
-        "individual_results": results,
-        "overall_keywords": top_keywords,
-        "primary_emotion": primary_emotion,
-        "emotion_distribution": dict(emotion_counts)
-    }
+            logger.error(f"내용 해시 분석 결과 저장 실패 ({content_hash}): {e}")
+    
+    async def analyze_many(self, photos: list[Photo]) -> dict:
+        """여러 사진 배치 분석 (에러 핸들링 강화)"""
+        
+        results = []
+        all_keywords = []
+        emotions = []
+        failed_count = 0
+        
+        # 저장된 내용 해시 분석 결과는 한 번에 조회
+        await self._prefetch(photos)
+        
+        # 각 사진 개별 분석
+        for photo in photos:
+            try:
+                analysis = await self.analyze(photo)
+                results.append({
+                    "path": photo.file_path,
+                    "keywords": analysis["keywords"],
+                    "emotion": analysis["emotion"],
+                    "description": analysis["description"]
+                })
+    
+                # 전체 키워드 모으기
+                all_keywords.extend(analysis["keywords"])
+                emotions.append(analysis["emotion"])
+    
+            except Exception as e:
+                print(f"사진 분석 실패 ({photo.file_path}): {e}")
+                failed_count += 1
+                # 실패해도 계속 진행
+                continue
+    
+        # 최소 1장이라도 성공해야 함
+        if not results:
+            raise Exception("모든 사진 분석 실패")
+    
+        # 키워드 빈도 계산
+        from collections import Counter
+        keyword_counts = Counter(all_keywords)
+        top_keywords = [k for k, v in keyword_counts.most_common(5)]
+    
+        # 주요 감정
+        emotion_counts = Counter(emotions)
+        primary_emotion = emotion_counts.most_common(1)[0][0] if emotions else "peaceful"
+    
+        return {
+            "total_photos": len(photos),
+            "analyzed_photos": len(results),
+            "failed_photos": failed_count,
+            "individual_results": results,
+            "overall_keywords": top_keywords,
+            "primary_emotion": primary_emotion,
+            "emotion_distribution": dict(emotion_counts)
+        }
 
 @retry(
     stop=stop_after_attempt(3),
@@ -140,7 +215,7 @@ def analyze_multiple_photos(photo_paths: list[str]) -> dict:
     retry=retry_if_exception_type((APIError, APITimeoutError, RateLimitError)),
     reraise=True
 )
-def generate_insight_story(analysis_result: dict, winner_photo_analysis: dict) -> str:
+async def generate_insight_story(analysis_result: dict, winner_photo_analysis: dict) -> str:
     """AI 인사이트 스토리 생성 (재시도 포함)"""
     
     try:
@@ -162,7 +237,7 @@ JSON 형식으로만 답변:
   "detail": "상세 설명"
 }}"""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=200
@@ -192,10 +267,10 @@ JSON 형식으로만 답변:
             "detail": "소중한 추억이 담긴 사진들입니다."
         }
 
-def test_openai_connection() -> bool:
+async def test_openai_connection() -> bool:
     """OpenAI 연결 테스트"""
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "Hello"}],
             max_tokens=10
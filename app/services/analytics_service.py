@@ -0,0 +1,264 @@
+# app/services/analytics_service.py
+"""
+투표 분석 (Borda 점수, 평균 순위/표준편차, 만든 사람 순위와의 Kendall tau, 합의 순위)
+
+투표 × 사진 순위 행렬을 NumPy로 만들어 한 번에 계산하고, 결과를 만드는 데 필요한 누적값만
+월드컵별로 캐시 (워커 메모리 LRU + vote_analytics 스냅샷)
+- 이후 요청은 마지막 반영 시각(settled_until) 이후 투표만 읽어 누적값에 더함
+- 최근 vote_late_slack_seconds 안의 투표는 커밋 순서가 뒤바뀔 수 있어 누적하지 않고 요청마다 따로 계산해 합침
+- 누적 + 최근 투표 수가 실제 투표 수보다 적으면 (아주 늦게 저장된 투표) 처음부터 다시 계산
+"""
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import select, func, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.cache import LRUCache
+from app.core.logger import logger
+from app.database import SessionLocal
+from app.models.worldcup import Worldcup
+from app.models.vote import Vote
+from app.models.vote_ranking import VoteRanking
+from app.models.vote_analytics import VoteAnalytics
+from app.services import vote_service, worldcup_service
+
+# 스냅샷(vote_analytics) 저장 최소 간격
+SNAPSHOT_INTERVAL = timedelta(minutes=1)
+
+# Kendall tau를 계산할 때 한 번에 처리하는 투표 수 (투표 × 사진 쌍 행렬 메모리 제한)
+TAU_CHUNK_VOTES = 50_000
+
+# 월드컵 ID -> (settled_until, 스냅샷 저장 시각, 누적값) (워커 단위)
+_cache = LRUCache(maxsize=1000)
+
+class RankAccumulator:
+    """투표 분석 누적값 (모두 합이라 새 투표분만 더하면 됨)"""
+    
+    ARRAY_FIELDS = ("ranked_count", "rank_sum", "rank_sq_sum", "borda")
+    SCALAR_FIELDS = ("tau_sum", "tau_voters", "tau_agree")
+    
+    def __init__(self, size: int, vote_count: int = 0, stats: dict | None = None):
+        stats = stats or {}
+        self.size = size
+        self.vote_count = vote_count
+        for field in self.ARRAY_FIELDS:
+            setattr(self, field, np.asarray(stats.get(field, np.zeros(size)), dtype=np.float64))
+        for field in self.SCALAR_FIELDS:
+            setattr(self, field, float(stats.get(field, 0)))
+    
+    @classmethod
+    def from_ranks(cls, ranks: np.ndarray, owner_ranks: np.ndarray) -> "RankAccumulator":
+        """순위 행렬(투표 × 사진, 순위 안 매긴 칸은 NaN)의 누적값"""
+        size = ranks.shape[1]
+        acc = cls(size, vote_count=len(ranks))
+    
+        # 사진별 순위 합/제곱합 (평균, 표준편차용)
+        acc.ranked_count = (~np.isnan(ranks)).sum(axis=0).astype(np.float64)
+        acc.rank_sum = np.nansum(ranks, axis=0, dtype=np.float64)
+        acc.rank_sq_sum = np.nansum(np.square(ranks, dtype=np.float64), axis=0)
+    
+        # Borda 점수: 1위 = size-1점, 순위가 내려갈수록 1점씩 감소 (순위 안 매김 = 0점)
+        acc.borda = np.nansum(np.clip(size - ranks, 0, None), axis=0, dtype=np.float64)
+    
+        # 투표별 만든 사람 순위와의 Kendall tau (나눠서 계산)
+        for start in range(0, len(ranks), TAU_CHUNK_VOTES):
+            tau = kendall_tau(ranks[start:start + TAU_CHUNK_VOTES], owner_ranks)
+            tau = tau[~np.isnan(tau)]
+            acc.tau_sum += float(tau.sum())
+            acc.tau_voters += len(tau)
+            acc.tau_agree += int((tau > 0).sum())
+    
+        return acc
+    
+    def __add__(self, other: "RankAccumulator") -> "RankAccumulator":
+        result = RankAccumulator(self.size, vote_count=self.vote_count + other.vote_count)
+        for field in self.ARRAY_FIELDS + self.SCALAR_FIELDS:
+            setattr(result, field, getattr(self, field) + getattr(other, field))
+        return result
+    
+    def to_stats(self) -> dict:
+        """스냅샷 저장용"""
+        stats = {field: getattr(self, field).tolist() for field in self.ARRAY_FIELDS}
+        stats.update({field: getattr(self, field) for field in self.SCALAR_FIELDS})
+        return stats
+
+def kendall_tau(ranks: np.ndarray, owner_ranks: np.ndarray) -> np.ndarray:
+    """각 행(투표)과 만든 사람 순위의 Kendall tau (어느 한쪽이 동률/순위 없음인 쌍은 제외, 비교할 쌍이 없으면 NaN)"""
+    i, j = np.triu_indices(len(owner_ranks), k=1)
+    owner_signs = np.nan_to_num(np.sign(owner_ranks[i] - owner_ranks[j]))
+    
+    # 사진 쌍마다 +1 (같은 방향), -1 (반대 방향), 0/NaN (비교 불가)
+    agreement = np.sign(ranks[:, i] - ranks[:, j]) * owner_signs
+    concordant = (agreement > 0).sum(axis=1)
+    discordant = (agreement < 0).sum(axis=1)
+    compared = concordant + discordant
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(compared > 0, (concordant - discordant) / compared, np.nan)
+
+async def get_vote_analytics(db: AsyncSession, worldcup: Worldcup) -> dict:
+    """월드컵 투표 분석 (누적값 캐시 + 새 투표만 반영, bracket이 있는 월드컵만)"""
+    entrants = worldcup.bracket["entrants"]
+    
+    # 투표 수를 먼저 읽어야 이후 조회하는 투표가 이를 모두 포함
+    total_votes = await vote_service.get_vote_count(db, worldcup.id)
+    
+    # 만든 사람의 순위 (entrants 순서, 순위 없으면 NaN)
+    owner_rankings = await worldcup_service.get_worldcup_rankings(db, worldcup.id, max_rank=None)
+    owner_rank_of = {item["photo_id"]: item["rank"] for item in owner_rankings}
+    owner_ranks = np.array([owner_rank_of.get(photo_id, np.nan) for photo_id in entrants], dtype=np.float64)
+    
+    # 캐시 → 스냅샷 → 처음부터 순으로 누적값 준비
+    cached = _cache.get(worldcup.id)
+    if cached is None:
+        cached = await _load_snapshot(db, worldcup.id, len(entrants))
+    settled_until, snapshot_until, settled = cached
+    
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.vote_late_slack_seconds)
+    new_settled, recent = await _fetch_new_votes(db, worldcup.id, entrants, owner_ranks, settled_until, cutoff)
+    
+    if settled.vote_count + new_settled.vote_count + recent.vote_count < total_votes:
+        # 누적한 뒤에 저장된 오래된 투표가 있음 - 처음부터 다시 계산
+        settled_until, snapshot_until, settled = None, None, RankAccumulator(len(entrants))
+        new_settled, recent = await _fetch_new_votes(db, worldcup.id, entrants, owner_ranks, None, cutoff)
+    
+    # 누적값 갱신 (기존 객체는 고치지 않음 - 동시 요청이 같은 누적값을 보고 있을 수 있음)
+    settled = settled + new_settled
+    settled_until = cutoff if settled_until is None else max(settled_until, cutoff)
+    
+    # 새로 누적한 투표가 있으면 가끔씩 스냅샷 저장 (다른 워커/재시작 후에도 이어서 계산)
+    if new_settled.vote_count and (snapshot_until is None or settled_until - snapshot_until >= SNAPSHOT_INTERVAL):
+        if await _save_snapshot(worldcup.id, settled_until, settled):
+            snapshot_until = settled_until
+    
+    _cache.set(worldcup.id, (settled_until, snapshot_until, settled))
+    
+    return _summarize(entrants, owner_ranks, settled + recent)
+
+async def _load_snapshot(db: AsyncSession, worldcup_id: str, size: int) -> tuple:
+    """저장된 누적값 (없으면 빈 누적값)"""
+    snapshot = await db.get(VoteAnalytics, worldcup_id)
+    if snapshot is None or len(snapshot.stats["borda"]) != size:
+        return None, None, RankAccumulator(size)
+    
+    return snapshot.settled_until, snapshot.settled_until, RankAccumulator(size, snapshot.vote_count, snapshot.stats)
+
+async def _save_snapshot(worldcup_id: str, settled_until: datetime, acc: RankAccumulator) -> bool:
+    """누적값 스냅샷 저장 (더 최신 스냅샷이 있으면 덮어쓰지 않음, 실패해도 응답에는 영향 없음)"""
+    stmt = insert(VoteAnalytics).values(
+        worldcup_id=worldcup_id,
+        settled_until=settled_until,
+        vote_count=acc.vote_count,
+        stats=acc.to_stats()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VoteAnalytics.worldcup_id],
+        set_={
+            "settled_until": stmt.excluded.settled_until,
+            "vote_count": stmt.excluded.vote_count,
+            "stats": stmt.excluded.stats,
+            "updated_at": func.now()
+        },
+        where=VoteAnalytics.settled_until < stmt.excluded.settled_until
+    )
+    
+    # 조회 전용 세션으로 들어온 요청이라 쓰기는 primary에 따로
+    try:
+        async with SessionLocal() as write_db:
+            await write_db.execute(stmt)
+            await write_db.commit()
+        return True
+    except Exception as e:
+        logger.error(f"투표 분석 스냅샷 저장 실패: {e}")
+        return False
+
+async def _fetch_new_votes(
+    db: AsyncSession,
+    worldcup_id: str,
+    entrants: list[str],
+    owner_ranks: np.ndarray,
+    since: datetime | None,
+    cutoff: datetime
+) -> tuple[RankAccumulator, RankAccumulator]:
+    """since 이후 투표를 한 번에 조회해 (cutoff 이전 투표, 최근 투표) 누적값으로"""
+    
+    # 새 투표에 0부터 번호를 매기고, 순위 행은 (투표 번호, 사진 번호, 순위) 배열 세 개로 받음 (행 하나)
+    new_votes = select(
+        Vote.id,
+        (Vote.created_at > cutoff).label("recent"),
+        (func.row_number().over() - 1).label("vote_index")
+    ).where(Vote.worldcup_id == worldcup_id)
+    if since is not None:
+        new_votes = new_votes.where(Vote.created_at > since)
+    new_votes = new_votes.cte("new_votes")
+    
+    photo_index = func.array_position(bindparam("entrants", entrants, type_=ARRAY(String)), VoteRanking.photo_id)
+    result = await db.execute(
+        select(
+            func.array_agg(new_votes.c.vote_index),
+            func.array_agg(new_votes.c.recent),
+            func.array_agg(func.coalesce(photo_index, 0)),  # 순위 없는 투표 = 0
+            func.array_agg(func.coalesce(VoteRanking.rank, 0))
+        )
+        .select_from(new_votes.outerjoin(VoteRanking, VoteRanking.vote_id == new_votes.c.id))
+    )
+    vote_index, recent, photo_index, rank = result.one()
+    
+    size = len(entrants)
+    if vote_index is None:
+        return RankAccumulator(size), RankAccumulator(size)
+    
+    vote_index = np.array(vote_index, dtype=np.int64)
+    photo_index = np.array(photo_index, dtype=np.int64)
+    rank = np.array(rank, dtype=np.float32)
+    
+    # 투표 × 사진 순위 행렬 (모든 새 투표가 한 행 이상 나오므로 투표 수 = 최대 번호 + 1)
+    ranks = np.full((vote_index.max() + 1, size), np.nan, dtype=np.float32)
+    ranked = photo_index > 0
+    ranks[vote_index[ranked], photo_index[ranked] - 1] = rank[ranked]
+    
+    is_recent = np.zeros(len(ranks), dtype=bool)
+    is_recent[vote_index[np.array(recent, dtype=bool)]] = True
+    
+    return (
+        RankAccumulator.from_ranks(ranks[~is_recent], owner_ranks),
+        RankAccumulator.from_ranks(ranks[is_recent], owner_ranks)
+    )
+
+def _summarize(entrants: list[str], owner_ranks: np.ndarray, acc: RankAccumulator) -> dict:
+    """누적값으로 응답 만들기"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_rank = acc.rank_sum / acc.ranked_count
+        rank_std = np.sqrt(np.maximum(acc.rank_sq_sum / acc.ranked_count - mean_rank ** 2, 0))
+    
+    # 합의 순위: Borda 점수 내림차순, 같으면 평균 순위 오름차순 (아무도 순위를 안 매긴 사진은 뒤로)
+    order = np.lexsort((np.nan_to_num(mean_rank, nan=np.inf), -acc.borda))
+    consensus_ranks = np.empty(len(entrants), dtype=np.float64)
+    consensus_ranks[order] = np.arange(1, len(entrants) + 1)
+    consensus_tau = kendall_tau(consensus_ranks[np.newaxis, :], owner_ranks)[0] if acc.vote_count else np.nan
+    
+    def number(value, digits=3):
+        return None if np.isnan(value) else round(float(value), digits)
+    
+    return {
+        "total_votes": acc.vote_count,
+        "photos": [
+            {
+                "photo_id": entrants[i],
+                "consensus_rank": int(consensus_ranks[i]),
+                "owner_rank": None if np.isnan(owner_ranks[i]) else int(owner_ranks[i]),
+                "borda_score": int(acc.borda[i]),
+                "mean_rank": number(mean_rank[i]),
+                "rank_std": number(rank_std[i]),
+                "ranked_count": int(acc.ranked_count[i])
+            }
+            for i in order
+        ],
+        "owner_agreement": {
+            "mean_kendall_tau": round(acc.tau_sum / acc.tau_voters, 4) if acc.tau_voters else None,
+            "agreeing_ratio": round(acc.tau_agree / acc.tau_voters, 4) if acc.tau_voters else None,  # tau > 0인 투표 비율
+            "compared_votes": int(acc.tau_voters)
+        },
+        "consensus_kendall_tau": number(consensus_tau, 4)
+    }
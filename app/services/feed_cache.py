@@ -0,0 +1,24 @@
+# app/services/feed_cache.py
+"""
+공개 월드컵 목록 응답 캐시 (워커 단위, TTL + stale-while-revalidate)
+
+GET /api/v1/worldcup/public 중 커서 없이 앞쪽 public_feed_cache_pages 페이지만 캐시
+(익명 방문자 모두에게 같은 응답, 키는 (정렬, 페이지, 개수, 전체 개수 포함 여부))
+- public_feed_cache_ttl_seconds 이내면 그대로, 그 뒤 stale 시간까지는 이전 응답을 주고 백그라운드에서 한 번만 다시 조회
+- 만료된 페이지에 요청이 몰려도 워커당 조회는 한 번 (나머지는 그 결과를 기다림)
+- 공유 생성/공개 여부 변경 시 invalidate_first_page()로 첫 페이지 삭제
+  (요청을 받은 워커에만 적용 - 다른 워커와 뒤 페이지는 TTL + stale 안에 반영)
+"""
+from app.config import settings
+from app.core.cache import SWRCache
+
+# 키: (정렬, 페이지, 개수, 전체 개수 포함 여부)
+public_feed_cache = SWRCache(
+    ttl_seconds=settings.public_feed_cache_ttl_seconds,
+    stale_seconds=settings.public_feed_cache_stale_seconds,
+    maxsize=settings.public_feed_cache_size
+)
+
+def invalidate_first_page() -> None:
+    """모든 정렬/개수의 첫 페이지 삭제"""
+    public_feed_cache.invalidate_where(lambda key: key[1] == 1)
@@ -0,0 +1,122 @@
+# app/services/pairwise_service.py
+"""
+브라켓 재현 투표의 사진 간 맞대결 승수 행렬 (NumPy, 워커 단위 캐시)
+
+wins[i, j] = entrants i번 사진이 j번 사진을 직접 이긴 투표 수
+- 새 투표는 bracket_mask별 개수만 읽어 (GROUP BY) 마스크 하나당 매치 n-1개를 한 번에 누적
+- analytics_service와 같이 vote_late_slack_seconds 이전 투표만 캐시에 누적하고, 최근 투표는 요청마다 따로 더함
+- 누적 + 최근 투표 수가 실제 투표 수보다 적으면 (아주 늦게 저장된 투표) 처음부터 다시 계산
+- 두 사진의 맞대결 조회는 행렬 두 칸 읽기 (O(1))
+"""
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.worldcup import Worldcup
+from app.models.vote import Vote
+from app.services import vote_service
+
+# 월드컵 ID -> (settled_until, 누적한 투표 수, 누적한 브라켓 재현 투표 수, 승수 행렬) (워커 단위)
+_cache = LRUCache(maxsize=1000)
+
+def decode_masks(masks: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """브라켓 마스크 배열을 매치(노드 1..size-1)별 (승자, 패자) entrants 번호 행렬 두 개로 (투표 × 매치)"""
+    masks = masks.astype(np.int64)
+    
+    # 힙 인덱스 브라켓을 리프부터 올라가며 노드별 승자를 채움 (TournamentBracket과 같은 배치)
+    players = np.empty((len(masks), 2 * size), dtype=np.int64)
+    players[:, size:] = np.arange(size)
+    losers = np.empty((len(masks), size), dtype=np.int64)
+    for node in range(size - 1, 0, -1):
+        right_won = (masks >> (node - 1) & 1).astype(bool)
+        left, right = players[:, 2 * node], players[:, 2 * node + 1]
+        players[:, node] = np.where(right_won, right, left)
+        losers[:, node] = np.where(right_won, left, right)
+    
+    return players[:, 1:size], losers[:, 1:]
+
+def pairwise_wins(masks: np.ndarray, counts: np.ndarray, size: int) -> np.ndarray:
+    """마스크별 투표 수로 맞대결 승수 행렬 계산"""
+    winners, losers = decode_masks(masks, size)
+    cells = (winners * size + losers).ravel()
+    wins = np.bincount(cells, weights=np.repeat(counts, size - 1), minlength=size * size)
+    return wins.reshape(size, size).astype(np.int64)
+
+async def get_pairwise_wins(db: AsyncSession, worldcup: Worldcup) -> tuple[np.ndarray, int]:
+    """월드컵의 (맞대결 승수 행렬, 브라켓 재현 투표 수) - 누적값 캐시 + 새 투표만 반영 (bracket이 있는 월드컵만)"""
+    size = len(worldcup.bracket["entrants"])
+    
+    # 투표 수를 먼저 읽어야 이후 조회하는 투표가 이를 모두 포함
+    total_votes = await vote_service.get_vote_count(db, worldcup.id)
+    
+    settled_until, settled_votes, settled_replays, settled_wins = _cache.get(
+        worldcup.id, (None, 0, 0, np.zeros((size, size), dtype=np.int64))
+    )
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.vote_late_slack_seconds)
+    new_settled, recent = await _fetch_new_votes(db, worldcup.id, size, settled_until, cutoff)
+    
+    if settled_votes + new_settled[0] + recent[0] < total_votes:
+        # 누적한 뒤에 저장된 오래된 투표가 있음 - 처음부터 다시 계산
+        settled_until, settled_votes, settled_replays = None, 0, 0
+        settled_wins = np.zeros((size, size), dtype=np.int64)
+        new_settled, recent = await _fetch_new_votes(db, worldcup.id, size, None, cutoff)
+    
+    # 누적값 갱신 (기존 배열은 고치지 않음 - 동시 요청이 같은 행렬을 보고 있을 수 있음)
+    settled_votes += new_settled[0]
+    settled_replays += new_settled[1]
+    settled_wins = settled_wins + new_settled[2]
+    settled_until = cutoff if settled_until is None else max(settled_until, cutoff)
+    _cache.set(worldcup.id, (settled_until, settled_votes, settled_replays, settled_wins))
+    
+    return settled_wins + recent[2], settled_replays + recent[1]
+
+async def _fetch_new_votes(
+    db: AsyncSession,
+    worldcup_id: str,
+    size: int,
+    since: datetime | None,
+    cutoff: datetime
+) -> tuple[tuple, tuple]:
+    """since 이후 투표를 마스크별 개수로 조회해 (cutoff 이전, 최근) 각각 (투표 수, 재현 투표 수, 승수 행렬)로"""
+    recent = (Vote.created_at > cutoff).label("recent")
+    query = (
+        select(Vote.bracket_mask, recent, func.count())
+        .where(Vote.worldcup_id == worldcup_id)
+        .group_by(Vote.bracket_mask, recent)
+    )
+    if since is not None:
+        query = query.where(Vote.created_at > since)
+    
+    result = await db.execute(query)
+    rows = result.all()
+    
+    def accumulate(is_recent: bool) -> tuple:
+        votes = sum(count for _, row_recent, count in rows if row_recent == is_recent)
+        replays = [(mask, count) for mask, row_recent, count in rows if row_recent == is_recent and mask is not None]
+        if not replays:
+            return votes, 0, np.zeros((size, size), dtype=np.int64)
+        masks, counts = np.array(replays, dtype=np.int64).T
+        return votes, int(counts.sum()), pairwise_wins(masks, counts, size)
+    
+    return accumulate(False), accumulate(True)
+
+async def get_head_to_head(db: AsyncSession, worldcup: Worldcup, photo_a_id: str, photo_b_id: str) -> dict:
+    """두 사진이 브라켓 재현 투표에서 직접 맞붙은 결과"""
+    wins, replay_votes = await get_pairwise_wins(db, worldcup)
+    
+    entrants = worldcup.bracket["entrants"]
+    a, b = entrants.index(photo_a_id), entrants.index(photo_b_id)
+    a_wins, b_wins = int(wins[a, b]), int(wins[b, a])
+    meetings = a_wins + b_wins
+    
+    return {
+        "photo_a_id": photo_a_id,
+        "photo_b_id": photo_b_id,
+        "photo_a_wins": a_wins,
+        "photo_b_wins": b_wins,
+        "meetings": meetings,  # 둘이 맞붙은 투표 수
+        "photo_a_win_rate": round(a_wins / meetings, 3) if meetings else None,
+        "replay_votes": replay_votes
+    }
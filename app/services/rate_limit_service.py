@@ -1,5 +1,5 @@
 # app/services/rate_limit_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 from app.models.user import User
 from fastapi import HTTPException, status
@@ -8,7 +8,7 @@ from fastapi import HTTPException, status
 FREE_LIMIT = 5  # 무료: 평생 5번
 PREMIUM_MONTHLY_LIMIT = 50  # 프리미엄: 월 50번
 
-def check_worldcup_limit(db: Session, user: User) -> None:
+async def check_worldcup_limit(db: AsyncSession, user: User) -> None:
     """
     월드컵 생성 제한 체크
     - 무료: 평생 5번
@@ -23,8 +23,7 @@ def check_worldcup_limit(db: Session, user: User) -> None:
            (now.year > user.last_reset_at.year or now.month > user.last_reset_at.month):
             # 새 달 시작 - 카운터 리셋
             user.monthly_worldcup_count = 0
-            user.last_reset_at = now
-            db.commit()
+            user.last_reset_at = now  # 요청 마지막 커밋에 함께 반영
         
         # 월 제한 체크
         if user.monthly_worldcup_count >= PREMIUM_MONTHLY_LIMIT:
@@ -41,15 +40,14 @@ def check_worldcup_limit(db: Session, user: User) -> None:
                 detail=f"무료 유저는 최대 {FREE_LIMIT}번까지 생성 가능합니다. 프리미엄으로 업그레이드하세요!"
             )
 
-def increment_worldcup_count(db: Session, user: User) -> None:
+async def increment_worldcup_count(db: AsyncSession, user: User) -> None:
     """월드컵 생성 카운터 증가"""
     
     user.worldcup_count += 1
     
     if user.is_premium:
         user.monthly_worldcup_count += 1
-    
-    db.commit()
+    # 커밋은 호출한 핸들러에서 (요청 단위 트랜잭션)
 
 def get_remaining_count(user: User) -> dict:
     """남은 생성 횟수 조회"""
@@ -0,0 +1,91 @@
+# app/services/rollup_service.py
+"""
+일별 운영 지표 (daily_rollups)
+
+쓰기 경로가 같은 트랜잭션에서 날짜별 카운터를 올려두고, 조회는 날짜 수만큼의 행만 읽음
+- 월드컵 생성 / 완료, 투표: 요청(또는 투표 배치) 트랜잭션에 포함
+- AI 사진 분석: OpenAI 호출이 성공할 때마다 별도 세션으로 바로 기록
+- 날짜는 UTC 기준, 이후 월드컵/투표가 삭제돼도 줄어들지 않음
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.logger import logger
+from app.database import SessionLocal
+from app.models.daily_rollup import DailyRollup
+
+# 지표
+WORLDCUPS_CREATED = "worldcups_created"
+WORLDCUPS_COMPLETED = "worldcups_completed"
+VOTES = "votes"
+AI_ANALYSES = "ai_analyses"
+METRICS = (WORLDCUPS_CREATED, WORLDCUPS_COMPLETED, VOTES, AI_ANALYSES)
+
+def today() -> date:
+    return datetime.now(timezone.utc).date()
+
+async def increment(db: AsyncSession, metric: str, amount: int = 1) -> None:
+    """오늘 지표 증가 (커밋은 호출한 쪽에서)"""
+    await increment_many(db, {(today(), metric): amount})
+
+async def increment_many(db: AsyncSession, counts: dict[tuple[date, str], int]) -> None:
+    """(날짜, 지표)별 증가 (각각 임의의 샤드 한 행, 한 문장으로)"""
+    if not counts:
+        return
+    
+    stmt = insert(DailyRollup).values([
+        {
+            "day": day,
+            "metric": metric,
+            "shard": random.randrange(settings.rollup_shards),
+            "count": count
+        }
+        for (day, metric), count in counts.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[DailyRollup.day, DailyRollup.metric, DailyRollup.shard],
+        set_={"count": DailyRollup.count + stmt.excluded.count}
+    ))
+
+async def record(metric: str, amount: int = 1) -> None:
+    """요청 트랜잭션과 별개로 바로 기록 (실패해도 호출한 쪽에는 영향 없음)"""
+    try:
+        async with SessionLocal() as db:
+            await increment(db, metric, amount)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"운영 지표 기록 실패 ({metric}): {e}")
+
+async def get_daily_rollups(db: AsyncSession, start: date, end: date) -> dict:
+    """start ~ end 날짜별 지표 (기록이 없는 날은 0)"""
+    result = await db.execute(
+        select(DailyRollup.day, DailyRollup.metric, func.sum(DailyRollup.count))
+        .where(DailyRollup.day >= start, DailyRollup.day <= end)
+        .group_by(DailyRollup.day, DailyRollup.metric)
+    )
+    
+    days = {}
+    day = start
+    while day <= end:
+        days[day] = dict.fromkeys(METRICS, 0)
+        day += timedelta(days=1)
+    for day, metric, count in result.all():
+        if metric in days[day]:
+            days[day][metric] = int(count)
+    
+    totals = {metric: sum(values[metric] for values in days.values()) for metric in METRICS}
+    return {
+        "start": start,
+        "end": end,
+        "days": [{"date": day, **values, "completion_rate": _completion_rate(values)} for day, values in days.items()],
+        "totals": {**totals, "completion_rate": _completion_rate(totals)}
+    }
+
+def _completion_rate(values: dict) -> float | None:
+    """완료 / 생성 (같은 기간에 생성된 월드컵이 완료됐다는 뜻은 아님)"""
+    if not values[WORLDCUPS_CREATED]:
+        return None
+    return round(values[WORLDCUPS_COMPLETED] / values[WORLDCUPS_CREATED], 3)
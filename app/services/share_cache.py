@@ -0,0 +1,112 @@
+# app/services/share_cache.py
+"""
+공유 페이지 응답 캐시 (워커 단위, TTL + LRU)
+
+GET /api/v1/share/{share_id} 응답을 직렬화한 JSON 그대로 share_cache_ttl_seconds 동안 보관
+- 강한 ETag (본문 SHA-256) - If-None-Match가 같으면 304
+- single-flight: 같은 공유 링크의 캐시 미스가 동시에 몰려도 계산(조회 + AI 분석)은 한 번, 나머지는 그 결과를 기다림
+  (계산은 별도 태스크라 먼저 요청한 클라이언트가 끊겨도 계속 진행)
+- 공유 설정 변경은 invalidate(), 월드컵 분석 결과 저장은 invalidate_worldcup()으로 무효화
+- 무효화는 요청을 받은 워커에만 적용 - 다른 워커는 TTL이 지나야 반영 (투표 수도 최대 TTL만큼 늦게 반영)
+- 404/403/410 같은 오류는 캐시하지 않음 (같이 기다리던 요청은 같은 오류를 받음)
+"""
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+from pydantic import BaseModel
+from app.config import settings
+from app.core.cache import LRUCache
+from app.core.logger import logger
+
+# build()가 돌려주는 값: (응답, 월드컵 ID, 공유 링크 만료 시각)
+PageBuilder = Callable[[], Awaitable[tuple[BaseModel, str, datetime | None]]]
+
+class SharePageCache:
+    """공유 링크 ID -> (직렬화한 응답, ETag)"""
+    
+    def __init__(self, ttl_seconds: float, maxsize: int):
+        self.ttl = ttl_seconds
+        # 공유 링크 ID -> (계산 시각, 월드컵 ID, 공유 링크 만료 시각, 본문, ETag)
+        self._pages = LRUCache(maxsize=maxsize)
+        # 월드컵 ID -> 마지막 무효화 시각 (이보다 먼저 계산한 페이지는 버림, TTL 동안만 의미 있음)
+        self._invalidated = LRUCache(maxsize=maxsize)
+        self._inflight: dict[str, asyncio.Task] = {}
+    
+    async def get_or_build(self, share_id: str, build: PageBuilder) -> tuple[bytes, str]:
+        """캐시된 (본문, ETag), 없으면 build()로 계산 (동시 미스는 한 번만 계산)"""
+        page = self._fresh(share_id)
+        if page is not None:
+            return page
+    
+        task = self._inflight.get(share_id)
+        if task is None:
+            task = self._inflight[share_id] = asyncio.create_task(self._build(share_id, build))
+            # 기다리던 요청이 모두 끊긴 뒤 실패해도 오류가 기록되도록 (결과를 받지 않은 태스크 경고 대신)
+            task.add_done_callback(lambda t: _log_build_error(share_id, t))
+    
+        # 기다리던 요청이 끊겨도 계산은 취소하지 않음
+        return await asyncio.shield(task)
+    
+    def invalidate(self, share_id: str) -> None:
+        """공유 링크 하나의 캐시 삭제 (진행 중인 계산 결과도 저장하지 않음)"""
+        self._pages.pop(share_id)
+        self._inflight.pop(share_id, None)
+    
+    def invalidate_worldcup(self, worldcup_id: str) -> None:
+        """월드컵의 모든 공유 페이지 무효화 (O(1), 다음 조회 때 다시 계산)"""
+        self._invalidated.set(worldcup_id, time.monotonic())
+    
+    def _fresh(self, share_id: str) -> tuple[bytes, str] | None:
+        entry = self._pages.get(share_id)
+        if entry is None:
+            return None
+    
+        built_at, worldcup_id, share_expires_at, body, etag = entry
+        if (
+            time.monotonic() - built_at >= self.ttl
+            or built_at <= self._invalidated.get(worldcup_id, 0.0)
+            or (share_expires_at is not None and datetime.now(timezone.utc) >= share_expires_at)
+        ):
+            self._pages.pop(share_id)
+            return None
+        return body, etag
+    
+    async def _build(self, share_id: str, build: PageBuilder) -> tuple[bytes, str]:
+        built_at = time.monotonic()
+        task = asyncio.current_task()
+        try:
+            response, worldcup_id, share_expires_at = await build()
+            body = response.model_dump_json().encode("utf-8")
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    
+            # 계산 중에 invalidate()됐으면 이번 요청들에만 쓰고 저장하지 않음
+            if self._inflight.get(share_id) is task:
+                self._pages.set(share_id, (built_at, worldcup_id, share_expires_at, body, etag))
+            return body, etag
+        finally:
+            if self._inflight.get(share_id) is task:
+                del self._inflight[share_id]
+
+def _log_build_error(share_id: str, task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    error = task.exception()
+    # 404/403/410 등은 요청 오류라 기록하지 않음
+    if error is not None and not isinstance(error, HTTPException):
+        logger.error(f"공유 페이지 계산 실패 ({share_id}): {error}")
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (여러 개, *, W/ 접두어 허용)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+# 워커당 하나
+share_page_cache = SharePageCache(
+    ttl_seconds=settings.share_cache_ttl_seconds,
+    maxsize=settings.share_cache_size
+)
@@ -0,0 +1,73 @@
+# app/services/token_revocation.py
+"""
+액세스 토큰 무효화 목록 (워커 단위)
+
+토큰의 ver 클레임이 유저의 token_version보다 작으면 무효 (전체 로그아웃 시 token_version + 1)
+- token_version을 올린 적 있는 유저만 메모리에 보관 (user_id -> token_version, 부분 인덱스로 전체 조회)
+- token_revocation_refresh_seconds마다 다시 읽고, 버전은 줄지 않으므로 큰 값만 반영 (복제 지연으로 되돌아가지 않음)
+- 전체 로그아웃한 워커에는 바로, 다른 워커에는 다음 갱신 때 반영 (그 사이에는 이전 토큰도 통과)
+"""
+import asyncio
+from sqlalchemy import select
+from app.config import settings
+from app.core.logger import logger
+from app.database import ReadSessionLocal
+from app.models.user import User
+
+class TokenRevocations:
+    """유저별 유효한 최소 토큰 버전"""
+    
+    def __init__(self, refresh_seconds: float):
+        self.refresh_interval = refresh_seconds
+        self._versions: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+    
+    def is_revoked(self, user_id: str, token_version: int) -> bool:
+        """토큰이 전체 로그아웃 이전에 발급됐는지"""
+        return token_version < self._versions.get(user_id, 0)
+    
+    def revoke(self, user_id: str, token_version: int) -> None:
+        """이 워커에 바로 반영 (token_version 미만 토큰 거절)"""
+        if token_version > self._versions.get(user_id, 0):
+            self._versions[user_id] = token_version
+    
+    async def refresh(self) -> int:
+        """DB에서 무효화 목록 다시 읽기 (목록 크기 반환)"""
+        async with ReadSessionLocal() as db:
+            result = await db.execute(
+                select(User.id, User.token_version).where(User.token_version > 0)
+            )
+            for user_id, token_version in result:
+                self.revoke(user_id, token_version)
+        return len(self._versions)
+    
+    async def start(self) -> None:
+        """첫 목록을 읽고 주기적 갱신 시작 (startup에서 호출)"""
+        try:
+            count = await self.refresh()
+            logger.info(f"토큰 무효화 목록 준비 완료: {count}명")
+        except Exception as e:
+            logger.error(f"토큰 무효화 목록 조회 실패: {e}")
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """주기적 갱신 중지 (shutdown에서 호출)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"토큰 무효화 목록 갱신 실패: {e}")
+
+# 워커당 하나
+token_revocations = TokenRevocations(refresh_seconds=settings.token_revocation_refresh_seconds)
@@ -0,0 +1,146 @@
+# app/services/trending_service.py
+"""
+공개 월드컵 인기순 점수 (shares.trending_score, 워커 단위 반영)
+
+점수 = 투표 하나당 1점, trending_half_life_hours마다 절반으로 감쇠 (지수 감쇠)
+- 투표는 워커 메모리에 월드컵별 개수로 모았다가 trending_flush_seconds마다 한 문장으로 반영
+  (투표마다 공유 행을 갱신하지 않음, 인기 월드컵 공유 행에 락이 몰리지 않도록)
+- 행마다 마지막 감쇠 시각(trending_decayed_at)부터 지난 시간만큼만 감쇠 후 더함 - 몇 번을 나눠 적용해도 결과가 같음
+- 투표가 끊긴 공유는 trending_decay_minutes마다 감쇠 작업으로 (점수 있는 공개 공유만, 인덱스 범위)
+  TRENDING_MIN_SCORE 밑으로 떨어지면 0으로 만들어 작업 대상에서 빠짐
+- 정렬은 감쇠 작업 사이에 최대 한 주기만큼 어긋날 수 있음 (근사 순위)
+- 워커가 비정상 종료되면 아직 반영 안 된 투표는 점수에서 빠짐 (투표 자체는 저장됨)
+"""
+import asyncio
+import math
+import time
+from collections import Counter
+from datetime import timedelta
+from sqlalchemy import update, values, column, case, cast, func, String, Integer, Float
+from app.config import settings
+from app.core.logger import logger
+from app.database import SessionLocal
+from app.models.share import Share
+
+# 이보다 작은 점수는 0으로 (감쇠 작업 대상에서 제외)
+TRENDING_MIN_SCORE = 0.01
+
+# 한 UPDATE에 반영하는 월드컵 수
+TRENDING_FLUSH_BATCH = 1000
+
+def decayed_score(half_life_hours: float):
+    """지금 시각 기준으로 감쇠한 trending_score (SQL 식)"""
+    elapsed = cast(
+        func.extract("epoch", func.now() - func.coalesce(Share.trending_decayed_at, func.now())),
+        Float
+    )
+    return Share.trending_score * func.exp(-math.log(2) * elapsed / (half_life_hours * 3600))
+
+class TrendingUpdater:
+    """투표를 모아 인기순 점수에 반영하고 주기적으로 감쇠"""
+    
+    def __init__(self, half_life_hours: float, flush_seconds: float, decay_minutes: float):
+        self.half_life_hours = half_life_hours
+        self.flush_interval = flush_seconds
+        self.decay_interval = decay_minutes * 60
+        self._pending: Counter[str] = Counter()  # 월드컵 ID -> 아직 반영 안 된 투표 수
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+    
+    def record_vote(self, worldcup_id: str, count: int = 1) -> None:
+        """저장된 투표를 다음 반영 때 점수에 더함 (꺼져 있으면 무시)"""
+        if self.running:
+            self._pending[worldcup_id] += count
+    
+    def start(self) -> None:
+        """백그라운드 반영/감쇠 시작 (startup에서 호출)"""
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """중지 후 남은 투표 반영 (shutdown에서 호출)"""
+        if self._task is None:
+            return
+    
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self.flush()
+    
+    async def _run(self) -> None:
+        """flush 주기마다 반영, 감쇠 주기마다 감쇠"""
+        last_decay = 0.0
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+            await self.flush()
+            if time.monotonic() - last_decay >= self.decay_interval:
+                last_decay = time.monotonic()
+                try:
+                    await self.decay()
+                except Exception as e:
+                    logger.error(f"인기순 점수 감쇠 실패: {e}")
+    
+    async def flush(self) -> int:
+        """모아 둔 투표를 공개 공유 점수에 반영 (반영한 월드컵 수 반환)"""
+        if not self._pending:
+            return 0
+    
+        pending, self._pending = self._pending, Counter()
+        items = list(pending.items())
+        try:
+            async with SessionLocal() as db:
+                for start in range(0, len(items), TRENDING_FLUSH_BATCH):
+                    batch = values(
+                        column("worldcup_id", String), column("votes", Integer), name="pending"
+                    ).data(items[start:start + TRENDING_FLUSH_BATCH])
+                    await db.execute(
+                        update(Share)
+                        .where(Share.worldcup_id == batch.c.worldcup_id, Share.is_public == True)
+                        .values(
+                            trending_score=decayed_score(self.half_life_hours) + batch.c.votes,
+                            trending_decayed_at=func.now()
+                        )
+                    )
+                await db.commit()
+        except Exception as e:
+            # DB 장애 등 - 다음 주기에 재시도
+            self._pending.update(pending)
+            logger.error(f"인기순 점수 반영 실패 ({len(items)}개 월드컵, 재시도 예정): {e}")
+            return 0
+    
+        return len(items)
+    
+    async def decay(self) -> int:
+        """점수 있는 공개 공유를 지금 시각까지 감쇠 (감쇠한 행 수 반환)"""
+        score = decayed_score(self.half_life_hours)
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Share)
+                .where(
+                    Share.is_public == True,
+                    Share.trending_score > 0,
+                    # 다른 워커가 이번 주기에 이미 감쇠한 행은 건너뜀
+                    Share.trending_decayed_at < func.now() - timedelta(seconds=self.decay_interval / 2)
+                )
+                .values(
+                    trending_score=case((score < TRENDING_MIN_SCORE, 0.0), else_=score),
+                    trending_decayed_at=func.now()
+                )
+            )
+            await db.commit()
+        return result.rowcount
+
+# 워커당 하나
+trending_updater = TrendingUpdater(
+    half_life_hours=settings.trending_half_life_hours,
+    flush_seconds=settings.trending_flush_seconds,
+    decay_minutes=settings.trending_decay_minutes
+)
@@ -0,0 +1,160 @@
+# app/services/vote_buffer.py
+"""
+투표 write-behind 버퍼 (VOTE_BUFFER_ENABLED=true일 때만 사용, 워커 단위)
+
+검증이 끝난 투표를 메모리에 모았다가 vote_buffer_flush_ms마다, 또는 vote_buffer_max_size개가
+쌓이면 바로 한 트랜잭션(votes/vote_rankings multi-row INSERT + 카운터 갱신)으로 저장
+
+내구성 (응답 "투표 완료"는 DB 저장 전에 나감):
+- 워커가 비정상 종료(kill -9, OOM 등)되면 아직 flush 안 된 투표는 사라짐
+  (최대 flush 주기 또는 max_size개 분량)
+- 정상 종료(shutdown) 시에는 남은 투표를 모두 flush
+- flush 중 DB 오류가 나면 배치를 버퍼 앞에 되돌려 다음 주기에 재시도
+- 버퍼에 vote_buffer_max_pending개 넘게 밀려 있으면 (DB 장애 등) 새 투표는 기존처럼 요청 안에서 바로 저장
+- 같은 (월드컵, IP) 중복은 버퍼에서 먼저 거르고, 다른 워커와의 중복은 DB 유니크 제약으로 건너뜀
+  (이미 응답이 나간 뒤라 클라이언트는 알 수 없음)
+- 투표 수/통계에는 flush 후 반영 (최대 flush 주기만큼 지연)
+"""
+import asyncio
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.core.logger import logger
+from app.database import SessionLocal
+from app.services import vote_service
+from app.services.vote_stream import vote_stats_hub
+from app.services.trending_service import trending_updater
+
+class VoteBuffer:
+    """투표 write-behind 버퍼"""
+    
+    def __init__(self, flush_ms: int, max_size: int, max_pending: int):
+        self.flush_interval = flush_ms / 1000
+        self.max_size = max_size
+        self.max_pending = max_pending
+        self._votes: list[dict] = []
+        self._pending: set[tuple[str, str]] = set()  # 버퍼에 있는 (월드컵 ID, IP)
+        self._full: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+    
+    def start(self) -> None:
+        """백그라운드 flush 시작 (startup에서 호출)"""
+        self._stopping = False
+        self._full = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """flush 중지 후 남은 투표 모두 저장 (shutdown에서 호출)"""
+        if self._task is None:
+            return
+    
+        # 진행 중인 flush가 끝날 때까지 기다림 (취소하면 배치가 사라짐)
+        self._stopping = True
+        self._full.set()
+        await self._task
+        self._task = None
+        await self.flush()
+    
+    def is_pending(self, worldcup_id: str, ip_address: str) -> bool:
+        """아직 저장 안 된 투표가 버퍼에 있는지"""
+        return (worldcup_id, ip_address) in self._pending
+    
+    def add(
+        self,
+        worldcup_id: str,
+        ip_address: str,
+        rankings: list[dict],
+        bracket_mask: int | None = None
+    ) -> bool:
+        """투표를 버퍼에 추가 (버퍼가 꺼져 있거나 너무 밀려 있으면 False - 호출한 쪽에서 바로 저장)"""
+        if not self.running or len(self._votes) >= self.max_pending:
+            return False
+    
+        self._votes.append(vote_service.new_vote(worldcup_id, ip_address, rankings, bracket_mask))
+        self._pending.add((worldcup_id, ip_address))
+        if len(self._votes) >= self.max_size:
+            self._full.set()
+        return True
+    
+    async def _run(self) -> None:
+        """flush 주기마다 (또는 max_size개가 차면 바로) 저장"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # 한 번 실패해도 flush 루프는 계속 (멈추면 이후 투표가 종료 때까지 저장되지 않음)
+                logger.error(f"투표 버퍼 flush 실패: {e}")
+    
+    async def flush(self) -> int:
+        """버퍼의 투표를 max_size개씩 저장 (저장 시도한 투표 수 반환)"""
+        flushed = 0
+        while self._votes:
+            batch = self._votes[:self.max_size]
+            del self._votes[:self.max_size]
+    
+            dropped = set()  # 버린 투표 ID
+            interrupted = False  # 한 건씩 저장하다 DB 장애로 멈춤 (남은 투표는 버퍼로)
+            try:
+                saved = await self._save(batch)
+            except IntegrityError:
+                # 그 사이 월드컵/사진이 삭제된 투표가 섞인 경우 - 한 건씩 저장하고 그런 투표만 버림
+                saved = []
+                for i, vote in enumerate(batch):
+                    try:
+                        saved += await self._save([vote])
+                    except IntegrityError:
+                        dropped.add(vote["id"])
+                        logger.warning(f"저장할 수 없는 투표 버림: {vote['worldcup_id']} {vote['ip_address']}")
+                    except Exception as e:
+                        # DB 장애 등 - 아직 시도 안 한 투표는 다음 주기에 재시도
+                        self._votes[:0] = batch[i:]
+                        logger.error(f"투표 저장 실패 ({len(batch) - i}개, 재시도 예정): {e}")
+                        batch = batch[:i]
+                        interrupted = True
+                        break
+            except Exception as e:
+                # DB 장애 등 - 다음 주기에 재시도
+                self._votes[:0] = batch
+                logger.error(f"투표 배치 저장 실패 ({len(batch)}개, 재시도 예정): {e}")
+                break
+    
+            # 저장됐거나 DB에 이미 있는 투표(중복) - 이후 중복은 LRU에서 거름
+            for vote in batch:
+                key = (vote["worldcup_id"], vote["ip_address"])
+                self._pending.discard(key)
+                if vote["id"] not in dropped:
+                    vote_service.remember_vote(*key)
+    
+            # 실제로 저장된 투표만 (중복으로 건너뛴 투표는 카운터/지표처럼 제외)
+            for vote in saved:
+                trending_updater.record_vote(vote["worldcup_id"])  # 인기순 점수 (다음 반영 주기에)
+            for worldcup_id in {vote["worldcup_id"] for vote in saved}:
+                vote_stats_hub.notify(worldcup_id)  # 실시간 통계 구독자에게
+            flushed += len(batch)
+            if interrupted:
+                break
+    
+        return flushed
+    
+    async def _save(self, votes: list[dict]) -> list[dict]:
+        """투표 배치를 한 트랜잭션으로 저장 (실제로 저장된 투표 반환, 중복은 제외)"""
+        async with SessionLocal() as db:
+            saved = await vote_service.insert_votes(db, votes)
+            await db.commit()
+        return saved
+
+# 워커당 하나
+vote_buffer = VoteBuffer(
+    flush_ms=settings.vote_buffer_flush_ms,
+    max_size=settings.vote_buffer_max_size,
+    max_pending=settings.vote_buffer_max_pending
+)
@@ -0,0 +1,85 @@
+# app/services/vote_export.py
+"""
+투표 원본 내보내기 (NDJSON / CSV 스트리밍)
+
+서버 사이드 커서(yield_per)로 EXPORT_BATCH_SIZE개씩 읽어 바로 내보내므로 투표 수와 관계없이 메모리 사용량이 일정
+- 정렬은 (created_at, id) 오름차순, 행마다 이어받기용 cursor 포함
+- 중간에 끊기면 마지막으로 받은 행의 cursor로 이어서 요청
+- 최근 vote_late_slack_seconds 안의 투표는 내보내지 않음 (다음 이어받기 때 포함)
+  투표는 created_at 순서대로 커밋되지 않으므로 (버퍼 flush, 긴 트랜잭션) 방금 것까지 내보내면
+  그 cursor 이전에 늦게 커밋된 투표를 이어받기에서 건너뛸 수 있음
+- 브라켓 재현 투표는 rankings 대신 bracket_mask
+- 투표자 IP는 내보내지 않음
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+from sqlalchemy import select
+from app.config import settings
+from app.core.pagination import encode_cursor, keyset_after
+from app.database import ReadSessionLocal
+from app.models.vote import Vote
+
+# 서버 사이드 커서에서 한 번에 가져와 한 덩어리로 내보내는 행 수
+EXPORT_BATCH_SIZE = 1000
+
+CSV_COLUMNS = ["vote_id", "created_at", "user_id", "rankings", "bracket_mask", "cursor"]
+
+def export_votes(worldcup_id: str, export_format: str, cursor: str | None = None) -> AsyncIterator[str]:
+    """월드컵 투표를 export_format(ndjson/csv) 문자열 덩어리로 내보내는 제너레이터 (잘못된 커서는 여기서 바로 400)"""
+    # 아직 앞선 투표가 커밋 전일 수 있는 최근 투표는 제외 (cursor는 이 시각 이전 행에만)
+    until = datetime.now(timezone.utc) - timedelta(seconds=settings.vote_late_slack_seconds)
+    query = (
+        select(Vote.id, Vote.created_at, Vote.user_id, Vote.rankings, Vote.bracket_mask)
+        .where(Vote.worldcup_id == worldcup_id, Vote.created_at < until)
+        .order_by(Vote.created_at, Vote.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if cursor:
+        query = query.where(keyset_after(Vote.created_at, Vote.id, cursor, descending=False))
+    
+    return _stream(query, export_format)
+
+async def _stream(query, export_format: str) -> AsyncIterator[str]:
+    format_rows = _format_csv if export_format == "csv" else _format_ndjson
+    
+    # 응답이 끝날 때까지 커넥션을 쓰므로 요청 세션과 별개로 (복제본)
+    async with ReadSessionLocal() as db:
+        result = await db.stream(query)
+        if export_format == "csv":
+            yield _csv_lines([CSV_COLUMNS])
+        async for rows in result.partitions():
+            yield format_rows(rows)
+
+def _format_ndjson(rows) -> str:
+    return "".join(
+        json.dumps({
+            "vote_id": row.id,
+            "created_at": row.created_at.isoformat(),
+            "user_id": row.user_id,
+            "rankings": row.rankings,
+            "bracket_mask": row.bracket_mask,
+            "cursor": encode_cursor(row.created_at, row.id)
+        }, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def _format_csv(rows) -> str:
+    return _csv_lines(
+        [
+            row.id,
+            row.created_at.isoformat(),
+            row.user_id or "",
+            json.dumps(row.rankings, ensure_ascii=False) if row.rankings is not None else "",
+            "" if row.bracket_mask is None else row.bracket_mask,
+            encode_cursor(row.created_at, row.id)
+        ]
+        for row in rows
+    )
+
+def _csv_lines(lines) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue()
@@ -0,0 +1,160 @@
+# app/services/vote_service.py
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import select, func, null
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models.vote import Vote
+from app.models.vote_counter import VoteCounter
+from app.models.vote_ranking import VoteRanking
+from app.services import rollup_service
+
+# multi-row INSERT 한 문장에 넣는 최대 행 수 (asyncpg 바인드 파라미터 32767개 제한)
+MAX_ROWS_PER_INSERT = 5000
+
+# 이미 투표한 (월드컵 ID, IP) - DB에 있는 것이 확인된 것만 담음 (워커 단위)
+recent_votes = LRUCache(maxsize=settings.vote_dedup_cache_size)
+
+def is_known_duplicate(worldcup_id: str, ip_address: str) -> bool:
+    """최근에 확인된 중복 투표인지 (DB 조회 없음)"""
+    return (worldcup_id, ip_address) in recent_votes
+
+def remember_vote(worldcup_id: str, ip_address: str) -> None:
+    """DB에 저장된 것이 확인된 투표 기억"""
+    recent_votes.set((worldcup_id, ip_address))
+
+async def insert_vote(
+    db: AsyncSession,
+    worldcup_id: str,
+    ip_address: str,
+    rankings: list[dict],
+    bracket_mask: int | None = None
+) -> str | None:
+    """투표 저장 (이미 같은 IP로 투표했으면 None, 커밋은 호출한 핸들러에서)"""
+    vote = new_vote(worldcup_id, ip_address, rankings, bracket_mask)
+    saved = await insert_votes(db, [vote])
+    return vote["id"] if saved else None
+
+def new_vote(
+    worldcup_id: str,
+    ip_address: str,
+    rankings: list[dict],
+    bracket_mask: int | None = None
+) -> dict:
+    """insert_votes에 넘길 투표 한 건 (id, 투표 시각은 여기서 정함, 브라켓 재현 투표는 bracket_mask + 마스크에서 뽑은 순위)"""
+    return {
+        "id": str(uuid.uuid4()),
+        "worldcup_id": worldcup_id,
+        "user_id": None,  # 일단 익명만
+        "ip_address": ip_address,
+        "rankings": rankings,
+        "bracket_mask": bracket_mask,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+async def insert_votes(db: AsyncSession, votes: list[dict]) -> list[dict]:
+    """투표 여러 건을 multi-row INSERT로 저장하고 실제로 저장된 투표만 반환 (커밋은 호출한 쪽에서)"""
+    
+    # 유니크 제약으로 중복을 DB가 판단 (SELECT 후 INSERT 사이의 경합 없음, 같은 배치 안의 중복도 건너뜀)
+    inserted_ids = set()
+    for chunk in _chunks(votes):
+        result = await db.execute(
+            insert(Vote)
+            .values([_vote_row(vote) for vote in chunk])
+            .on_conflict_do_nothing(constraint="uq_votes_worldcup_ip")
+            .returning(Vote.id)
+        )
+        inserted_ids.update(result.scalars())
+    saved = [vote for vote in votes if vote["id"] in inserted_ids]
+    
+    # 통계용 정규화 순위
+    ranking_rows = [
+        {"vote_id": vote["id"], "worldcup_id": vote["worldcup_id"], "photo_id": item["photo_id"], "rank": item["rank"]}
+        for vote in saved
+        for item in vote["rankings"]
+    ]
+    for chunk in _chunks(ranking_rows):
+        await db.execute(insert(VoteRanking).values(chunk))
+    
+    # 투표 수 카운터 증가 (월드컵별로 묶어서)
+    counts = Counter(vote["worldcup_id"] for vote in saved)
+    if counts:
+        await increment_vote_counts(db, counts)
+    
+    # 일별 투표 수 (투표 시각 기준 날짜)
+    await rollup_service.increment_many(
+        db, Counter((vote["created_at"].date(), rollup_service.VOTES) for vote in saved)
+    )
+    
+    return saved
+
+def _vote_row(vote: dict) -> dict:
+    """votes 테이블 행 (브라켓 재현 투표는 마스크로 결과 전체를 복원할 수 있으므로 순위 JSON은 저장 안 함)"""
+    if vote["bracket_mask"] is None:
+        return vote
+    return {**vote, "rankings": null()}
+
+def _chunks(rows: list, size: int = MAX_ROWS_PER_INSERT):
+    """multi-row INSERT 한 번에 넣을 만큼씩 나누기 (바인드 파라미터 수 제한)"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def increment_vote_count(db: AsyncSession, worldcup_id: str) -> None:
+    """투표 수 +1 (임의의 샤드 한 행만 갱신, 커밋은 호출한 핸들러에서)"""
+    await increment_vote_counts(db, {worldcup_id: 1})
+
+async def increment_vote_counts(db: AsyncSession, counts: dict[str, int]) -> None:
+    """월드컵별 투표 수 증가 (월드컵마다 임의의 샤드 한 행, 한 문장으로)"""
+    stmt = insert(VoteCounter).values([
+        {
+            "worldcup_id": worldcup_id,
+            "shard": random.randrange(settings.vote_counter_shards),
+            "count": count
+        }
+        for worldcup_id, count in counts.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[VoteCounter.worldcup_id, VoteCounter.shard],
+        set_={"count": VoteCounter.count + stmt.excluded.count}
+    ))
+
+def vote_count_subquery(worldcup_id_column):
+    """월드컵별 투표 수 (목록 쿼리에 넣는 상관 서브쿼리, votes 테이블은 읽지 않음)"""
+    return (
+        select(func.coalesce(func.sum(VoteCounter.count), 0))
+        .where(VoteCounter.worldcup_id == worldcup_id_column)
+        .scalar_subquery()
+    )
+
+async def get_vote_count(db: AsyncSession, worldcup_id: str) -> int:
+    """월드컵 투표 수"""
+    return await db.scalar(
+        select(func.coalesce(func.sum(VoteCounter.count), 0))
+        .where(VoteCounter.worldcup_id == worldcup_id)
+    )
+
+async def get_rank_stats(db: AsyncSession, worldcup_id: str, max_rank: int = 4) -> list:
+    """사진별 순위 득표 수 (photo_id, rank로 GROUP BY 한 번)"""
+    result = await db.execute(
+        select(VoteRanking.photo_id, VoteRanking.rank, func.count())
+        .where(
+            VoteRanking.worldcup_id == worldcup_id,
+            VoteRanking.rank <= max_rank
+        )
+        .group_by(VoteRanking.photo_id, VoteRanking.rank)
+        .order_by(VoteRanking.photo_id)
+    )
+    
+    photo_stats = {}
+    for photo_id, rank, count in result.all():
+        if photo_id not in photo_stats:
+            photo_stats[photo_id] = {"photo_id": photo_id}
+            for r in range(1, max_rank + 1):
+                photo_stats[photo_id][f"rank_{r}_count"] = 0
+        photo_stats[photo_id][f"rank_{rank}_count"] = count
+    
+    return list(photo_stats.values())
@@ -0,0 +1,103 @@
+# app/services/vote_stream.py
+"""
+투표 통계 실시간 전송 허브 (워커 단위 pub/sub)
+
+월드컵마다 구독자가 있는 동안만 발행 태스크 하나가 돌면서 통계를 한 번 집계해 모든 구독자에게 전달
+- 투표 저장 경로(요청 커밋, 배치 flush)가 notify()로 알리면 바로 다시 집계
+- 집계는 월드컵당 vote_stream_interval_ms에 최대 한 번 (그 사이 투표는 한 번에 합쳐짐)
+- 다른 워커에서 들어온 투표는 vote_stream_poll_seconds마다 투표 수(카운터 합)만 확인해 바뀌었으면 집계
+- 구독자 큐는 최신 통계 하나만 보관 (느린 구독자는 중간 통계를 건너뜀)
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from app.config import settings
+from app.core.logger import logger
+from app.database import ReadSessionLocal
+from app.services import vote_service
+
+class _Channel:
+    """월드컵 하나의 구독자와 발행 상태"""
+    
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.latest: dict | None = None  # 마지막으로 보낸 통계
+
+class VoteStatsHub:
+    """월드컵별 투표 통계 구독/발행"""
+    
+    def __init__(self, interval_ms: int, poll_seconds: float):
+        self.interval = interval_ms / 1000
+        self.poll_seconds = poll_seconds
+        self._channels: dict[str, _Channel] = {}
+    
+    def notify(self, worldcup_id: str) -> None:
+        """투표가 저장됐음을 알림 (구독자가 없으면 아무것도 안 함)"""
+        channel = self._channels.get(worldcup_id)
+        if channel is not None:
+            channel.changed.set()
+    
+    def subscriber_count(self, worldcup_id: str) -> int:
+        channel = self._channels.get(worldcup_id)
+        return len(channel.subscribers) if channel else 0
+    
+    @asynccontextmanager
+    async def subscribe(self, worldcup_id: str):
+        """통계 큐 구독 (나가면 구독 해제, 마지막 구독자면 발행 태스크 종료)"""
+        channel = self._channels.get(worldcup_id)
+        if channel is None:
+            channel = self._channels[worldcup_id] = _Channel()
+            channel.task = asyncio.create_task(self._publish(worldcup_id, channel))
+    
+        queue = asyncio.Queue(maxsize=1)
+        if channel.latest is not None:
+            queue.put_nowait(channel.latest)  # 이미 집계된 통계부터 바로
+        channel.subscribers.add(queue)
+    
+        try:
+            yield queue
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and self._channels.get(worldcup_id) is channel:
+                del self._channels[worldcup_id]
+                channel.task.cancel()
+    
+    async def _publish(self, worldcup_id: str, channel: _Channel) -> None:
+        """투표 수가 바뀌면 통계를 집계해 모든 구독자에게 전달"""
+        vote_count = None
+        while True:
+            try:
+                async with ReadSessionLocal() as db:
+                    current_count = await vote_service.get_vote_count(db, worldcup_id)
+                    if current_count != vote_count:
+                        stats = {
+                            "total_votes": current_count,
+                            "photo_stats": await vote_service.get_rank_stats(db, worldcup_id)
+                        }
+                        vote_count = current_count
+                        channel.latest = stats
+                        for queue in channel.subscribers:
+                            _offer(queue, stats)
+            except Exception as e:
+                logger.error(f"투표 통계 집계 실패 ({worldcup_id}): {e}")
+    
+            # 최소 간격만큼 쉬고, 알림이 오거나 폴링 주기가 되면 다시 확인
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.wait_for(channel.changed.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            channel.changed.clear()
+
+def _offer(queue: asyncio.Queue, stats: dict) -> None:
+    """큐에 최신 통계만 남김"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(stats)
+
+# 워커당 하나
+vote_stats_hub = VoteStatsHub(
+    interval_ms=settings.vote_stream_interval_ms,
+    poll_seconds=settings.vote_stream_poll_seconds
+)
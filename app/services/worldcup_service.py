@@ -1,144 +1,326 @@
 # app/services/worldcup_service.py
 import random
+import uuid
+from datetime import datetime, timezone
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.worldcup import Worldcup, WorldcupStatus
 from app.models.match import Match
 from app.models.photo import Photo
+from app.models.ranking import WorldcupRanking
+from app.services import rollup_service
 
-def create_tournament_bracket(
-    db: Session,
+class TournamentBracket:
+    """힙 인덱스 토너먼트 브라켓
+    
+    노드 1..n-1이 매치, 리프 n..2n-1이 참가 사진 (노드 i의 두 자식은 2i, 2i+1)
+    - urls: entrants와 같은 순서의 사진 URL (매치 응답용, 조회 불필요)
+    - decided: 노드별 승부 결정 여부 비트마스크
+    - right_won: 노드별 오른쪽(photo_b) 승리 여부 비트마스크
+    """
+    
+    def __init__(
+        self,
+        worldcup_id: str,
+        entrants: List[str],
+        urls: List[str],
+        decided: int = 0,
+        right_won: int = 0
+    ):
+        self.worldcup_id = worldcup_id
+        self.entrants = entrants
+        self.urls = urls
+        self.size = len(entrants)
+        self.decided = decided
+        self.right_won = right_won
+    
+    @classmethod
+    def from_worldcup(cls, worldcup: Worldcup) -> "TournamentBracket":
+        """worldcup.bracket 컬럼에서 복원"""
+        data = worldcup.bracket
+        return cls(worldcup.id, data["entrants"], data["urls"], data["decided"], data["right_won"])
+    
+    @classmethod
+    def from_replay(cls, worldcup: Worldcup, bracket_mask: int) -> "TournamentBracket":
+        """브라켓 재현 투표 결과로 모든 매치가 끝난 브라켓 복원 (bracket_mask = right_won >> 1)"""
+        data = worldcup.bracket
+        size = len(data["entrants"])
+        return cls(worldcup.id, data["entrants"], data["urls"], decided=(1 << size) - 2, right_won=bracket_mask << 1)
+    
+    def to_dict(self) -> dict:
+        """worldcup.bracket 컬럼에 저장할 형태"""
+        return {
+            "entrants": self.entrants,
+            "urls": self.urls,
+            "decided": self.decided,
+            "right_won": self.right_won
+        }
+    
+    def round_of(self, node: int) -> int:
+        """노드의 라운드 번호 (첫 라운드 = 1, 결승 = log2(n))"""
+        return self.size.bit_length() - node.bit_length()
+    
+    def order_of(self, node: int) -> int:
+        """같은 라운드 내 매치 순서 (1부터)"""
+        return node - (self.size >> self.round_of(node)) + 1
+    
+    def match_id(self, node: int) -> str:
+        """노드의 매치 ID (월드컵 ID + 노드 번호로 고정)"""
+        return str(uuid.uuid5(uuid.UUID(self.worldcup_id), str(node)))
+    
+    def node_of(self, match_id: str) -> int | None:
+        """매치 ID로 노드 찾기"""
+        for node in range(1, self.size):
+            if self.match_id(node) == match_id:
+                return node
+        return None
+    
+    def is_decided(self, node: int) -> bool:
+        return bool(self.decided >> node & 1)
+    
+    def winner_of(self, node: int) -> str | None:
+        """노드(매치 또는 리프)의 승자 사진 ID (아직 안 정해졌으면 None)"""
+        while node < self.size:
+            if not self.is_decided(node):
+                return None
+            node = node * 2 + (self.right_won >> node & 1)
+        return self.entrants[node - self.size]
+    
+    def players(self, node: int) -> tuple[str | None, str | None]:
+        """매치에 올라온 두 사진 ID (photo_a, photo_b)"""
+        return self.winner_of(node * 2), self.winner_of(node * 2 + 1)
+    
+    def select(self, node: int, photo_id: str):
+        """승자 기록 (비트 두 개만 갱신)"""
+        bit = 1 << node
+        self.decided |= bit
+        if photo_id == self.winner_of(node * 2 + 1):
+            self.right_won |= bit
+    
+    def next_node(self) -> int | None:
+        """다음에 진행할 매치 노드 (라운드 순, 같은 라운드는 match_order 순)"""
+        for round_number in range(1, self.size.bit_length()):
+            first = self.size >> round_number
+            for node in range(first, first * 2):
+                if not self.is_decided(node):
+                    return node
+        return None
+    
+    def url_of(self, photo_id: str) -> str:
+        return self.urls[self.entrants.index(photo_id)]
+    
+    @property
+    def is_complete(self) -> bool:
+        return self.is_decided(1)
+    
+    @property
+    def champion(self) -> str | None:
+        return self.winner_of(1)
+    
+    def match_row(self, node: int) -> dict:
+        """노드를 matches 테이블 행으로 변환"""
+        photo_a_id, photo_b_id = self.players(node)
+        return {
+            "id": self.match_id(node),
+            "worldcup_id": self.worldcup_id,
+            "round_number": self.round_of(node),
+            "match_order": self.order_of(node),
+            "photo_a_id": photo_a_id,
+            "photo_b_id": photo_b_id,
+            "winner_photo_id": self.winner_of(node)
+        }
+
+async def get_owned_photo_urls(db: AsyncSession, user_id: str, photo_ids: List[str]) -> dict:
+    """유저 본인의 사진만 골라 {사진 ID: URL}로 반환 (IN 쿼리 한 번)"""
+    result = await db.execute(
+        select(Photo.id, Photo.url).where(
+            Photo.id.in_(photo_ids),
+            Photo.user_id == user_id
+        )
+    )
+    return dict(result.all())
+
+async def create_tournament_bracket(
+    db: AsyncSession,
     worldcup: Worldcup,
-    photo_ids: List[str]
-) -> List[Match]:
-    """토너먼트 브라켓 생성"""
+    photo_urls: dict
+) -> TournamentBracket:
+    """토너먼트 브라켓 생성 (photo_urls: 검증된 {사진 ID: URL})"""
     
     # 사진 순서 랜덤 섞기
-    shuffled_photos = photo_ids.copy()
+    shuffled_photos = list(photo_urls)
     random.shuffle(shuffled_photos)
     
-    # 첫 라운드 매치 생성 (준결승 또는 그 이전)
-    matches = []
-    total_matches = len(photo_ids) // 2
-    
-    for i in range(total_matches):
-        match = Match(
-            worldcup_id=worldcup.id,
-            round_number=1,
-            match_order=i + 1,
-            photo_a_id=shuffled_photos[i * 2],
-            photo_b_id=shuffled_photos[i * 2 + 1]
-        )
-        db.add(match)
-        matches.append(match)
+    # 매치 ID를 월드컵 ID로 만들기 때문에 INSERT 전에 미리 발급
+    if worldcup.id is None:
+        worldcup.id = str(uuid.uuid4())
     
-    db.commit()
+    bracket = TournamentBracket(
+        worldcup.id,
+        shuffled_photos,
+        [photo_urls[photo_id] for photo_id in shuffled_photos]
+    )
+    worldcup.bracket = bracket.to_dict()
+    await db.flush()  # 월드컵 INSERT (id, created_at 확정)
     
-    return matches
+    # 첫 라운드 매치를 multi-row INSERT 한 번으로 생성 (이후 라운드는 완료 시 한 번에 기록)
+    await db.execute(insert(Match).values([
+        bracket.match_row(node) for node in range(bracket.size // 2, bracket.size)
+    ]))
+    
+    return bracket
 
-def get_next_match(db: Session, worldcup_id: str) -> Match | None:
-    """다음 매치 가져오기 (아직 승자가 없는 것)"""
-    return db.query(Match)\
-        .filter(
-            Match.worldcup_id == worldcup_id,
-            Match.winner_photo_id == None
-        )\
-        .order_by(Match.round_number, Match.match_order)\
-        .first()
+def get_next_match(bracket: TournamentBracket) -> dict | None:
+    """다음 매치 가져오기 (아직 승자가 없는 것, 브라켓만으로 구성)"""
+    node = bracket.next_node()
+    if node is None:
+        return None
+    
+    photo_a_id, photo_b_id = bracket.players(node)
+    return {
+        "id": bracket.match_id(node),
+        "round_number": bracket.round_of(node),
+        "match_order": bracket.order_of(node),
+        "photo_a": {"id": photo_a_id, "url": bracket.url_of(photo_a_id)},
+        "photo_b": {"id": photo_b_id, "url": bracket.url_of(photo_b_id)}
+    }
 
-def advance_to_next_round(db: Session, worldcup: Worldcup):
-    """다음 라운드로 진행"""
-    
-    # 현재 라운드의 모든 매치가 끝났는지 확인
-    current_round = db.query(Match.round_number)\
-        .filter(Match.worldcup_id == worldcup.id)\
-        .order_by(Match.round_number.desc())\
-        .first()[0]
-    
-    current_matches = db.query(Match)\
-        .filter(
-            Match.worldcup_id == worldcup.id,
-            Match.round_number == current_round
-        )\
-        .all()
-    
-    # 모든 매치에 승자가 있는지 확인
-    if not all(m.winner_photo_id for m in current_matches):
-        return  # 아직 끝나지 않음
-    
-    # 승자들 모으기
-    winners = [m.winner_photo_id for m in current_matches]
-    
-    # 승자가 1명이면 월드컵 종료
-    if len(winners) == 1:
+async def select_match_winner(
+    db: AsyncSession,
+    worldcup: Worldcup,
+    bracket: TournamentBracket,
+    node: int,
+    photo_id: str
+):
+    """매치 승자 기록 (커밋은 호출한 핸들러에서)"""
+    
+    # 진행 중에는 월드컵 행의 bracket 컬럼만 갱신
+    bracket.select(node, photo_id)
+    worldcup.bracket = bracket.to_dict()
+    
+    # 결승까지 끝나면 월드컵 종료
+    if bracket.is_complete:
         worldcup.status = WorldcupStatus.COMPLETED
-        worldcup.winner_photo_id = winners[0]
-        from datetime import datetime, timezone
+        worldcup.winner_photo_id = bracket.champion
         worldcup.completed_at = datetime.now(timezone.utc)
-        db.commit()
-        return
-    
-    # 다음 라운드 매치 생성
-    next_round = current_round + 1
-    for i in range(len(winners) // 2):
-        match = Match(
-            worldcup_id=worldcup.id,
-            round_number=next_round,
-            match_order=i + 1,
-            photo_a_id=winners[i * 2],
-            photo_b_id=winners[i * 2 + 1]
-        )
-        db.add(match)
+        
+        # 전체 매치 기록을 한 번에 저장 (첫 라운드는 승자만 갱신)
+        rows = [bracket.match_row(node) for node in range(1, bracket.size)]
+        stmt = insert(Match).values(rows)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[Match.id],
+            set_={"winner_photo_id": stmt.excluded.winner_photo_id}
+        ))
+        
+        # 전체 참가 사진의 최종 순위를 한 번만 계산해 저장
+        db.add_all(calculate_rankings([Match(**row) for row in rows]))
+        
+        # 일별 완료 수
+        await rollup_service.increment(db, rollup_service.WORLDCUPS_COMPLETED)
     
-    db.commit()
+    await db.flush()
 
-def get_worldcup_rankings(db: Session, worldcup_id: str) -> List[dict]:
-    """월드컵 순위 계산"""
-    
-    # 모든 매치 가져오기
-    matches = db.query(Match)\
-        .filter(Match.worldcup_id == worldcup_id)\
-        .order_by(Match.round_number.desc(), Match.match_order)\
-        .all()
+def calculate_rankings(matches: List[Match]) -> List[WorldcupRanking]:
+    """매치 결과로 전체 참가 사진의 순위 계산 (같은 라운드 탈락자는 공동 순위)"""
     
     if not matches:
         return []
     
-    # 결승전 (마지막 라운드)
-    final_round = matches[0].round_number
-    final_match = matches[0]
+    final_round = max(m.round_number for m in matches)
+    rankings = []
     
-    # 1위: 결승 승자
-    winner_id = final_match.winner_photo_id
+    for match in matches:
+        if not match.winner_photo_id:
+            continue
+        
+        # 패자: 결승 2위, 준결승 3위, 8강 5위, 16강 9위
+        loser_id = match.photo_a_id if match.photo_b_id == match.winner_photo_id else match.photo_b_id
+        rankings.append(WorldcupRanking(
+            worldcup_id=match.worldcup_id,
+            photo_id=loser_id,
+            rank=2 ** (final_round - match.round_number) + 1,
+            eliminated_round=match.round_number
+        ))
+        
+        # 결승 승자: 1위
+        if match.round_number == final_round:
+            rankings.append(WorldcupRanking(
+                worldcup_id=match.worldcup_id,
+                photo_id=match.winner_photo_id,
+                rank=1,
+                eliminated_round=None
+            ))
     
-    # 2위: 결승 패자
-    runner_up_id = final_match.photo_a_id if final_match.photo_b_id == winner_id else final_match.photo_b_id
+    return rankings
+
+def replay_rankings(worldcup: Worldcup, bracket_mask: int) -> List[dict]:
+    """브라켓 재현 투표의 상위 순위 (결승 1, 2위 + 준결승 탈락 3위 두 장)"""
+    bracket = TournamentBracket.from_replay(worldcup, bracket_mask)
+    rankings = calculate_rankings([Match(**bracket.match_row(node)) for node in (1, 2, 3)])
+    return [
+        {"photo_id": ranking.photo_id, "rank": ranking.rank}
+        for ranking in sorted(rankings, key=lambda ranking: ranking.rank)
+    ]
+
+async def get_worldcup_rankings(
+    db: AsyncSession,
+    worldcup_id: str,
+    max_rank: int | None = 3
+) -> List[dict]:
+    """저장된 월드컵 순위 조회 (max_rank=None이면 전체 참가 사진)"""
     
-    # 3-4위: 준결승 패자들
-    semifinal_losers = []
-    if final_round > 1:  # 4강 이상일 때만 준결승 있음
-        semifinal_matches = [m for m in matches if m.round_number == final_round - 1]
-        for match in semifinal_matches:
-            loser_id = match.photo_a_id if match.photo_b_id == match.winner_photo_id else match.photo_b_id
-            semifinal_losers.append(loser_id)
+    # 순위 + 사진을 한 쿼리로 조회
+    query = (
+        select(WorldcupRanking, Photo)
+        .join(Photo, Photo.id == WorldcupRanking.photo_id)
+        .where(WorldcupRanking.worldcup_id == worldcup_id)
+        .order_by(WorldcupRanking.rank, WorldcupRanking.photo_id)
+    )
+    if max_rank is not None:
+        query = query.where(WorldcupRanking.rank <= max_rank)
     
-    # 순위 매기기
-    rankings = []
+    result = await db.execute(query)
+    rows = result.all()
     
-    # 1위
-    winner_photo = db.query(Photo).filter(Photo.id == winner_id).first()
-    if winner_photo:
-        rankings.append({"rank": 1, "photo_id": winner_id, "photo": winner_photo})
+    # 순위가 저장되지 않은 월드컵은 매치 기록으로 계산만 함 (조회 전용 세션에서도 동작하도록 쓰기 없음)
+    if not rows:
+        rows = await _calculate_rankings_from_matches(db, worldcup_id, max_rank)
     
-    # 2위
-    runner_up_photo = db.query(Photo).filter(Photo.id == runner_up_id).first()
-    if runner_up_photo:
-        rankings.append({"rank": 2, "photo_id": runner_up_id, "photo": runner_up_photo})
+    return [
+        {
+            "rank": ranking.rank,
+            "photo_id": ranking.photo_id,
+            "photo": photo,
+            "eliminated_round": ranking.eliminated_round
+        }
+        for ranking, photo in rows
+    ]
+
+async def _calculate_rankings_from_matches(
+    db: AsyncSession,
+    worldcup_id: str,
+    max_rank: int | None
+) -> list:
+    """저장된 순위가 없을 때 매치 기록으로 (순위, 사진) 목록 계산"""
+    worldcup_status = await db.scalar(
+        select(Worldcup.status).where(Worldcup.id == worldcup_id)
+    )
+    if worldcup_status != WorldcupStatus.COMPLETED:
+        return []
     
-    # 3-4위
-    for i, loser_id in enumerate(semifinal_losers):
-        loser_photo = db.query(Photo).filter(Photo.id == loser_id).first()
-        if loser_photo:
-            rankings.append({"rank": 3, "photo_id": loser_id, "photo": loser_photo})
+    result = await db.execute(
+        select(Match).where(Match.worldcup_id == worldcup_id)
+    )
+    rankings = [
+        ranking for ranking in calculate_rankings(result.scalars().all())
+        if max_rank is None or ranking.rank <= max_rank
+    ]
+    rankings.sort(key=lambda ranking: (ranking.rank, ranking.photo_id))
     
-    return rankings
+    result = await db.execute(
+        select(Photo).where(Photo.id.in_([ranking.photo_id for ranking in rankings]))
+    )
+    photos = {photo.id: photo for photo in result.scalars().all()}
+    return [(ranking, photos[ranking.photo_id]) for ranking in rankings if ranking.photo_id in photos]
@@ -1,12 +1,17 @@
 # main.py
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.api.routes import auth, photos, worldcup, share
+from app.api.routes import auth, photos, worldcup, share, admin
 from app.core.logging_middleware import log_requests
 from app.core.logger import logger
+from app.database import warm_up_pool, dispose_engines, get_pool_status
+from app.api.deps import get_admin_user, Principal
+from app.services.vote_buffer import vote_buffer
+from app.services.trending_service import trending_updater
+from app.services.token_revocation import token_revocations
 from starlette.middleware.sessions import SessionMiddleware
 
 
@@ -64,6 +69,7 @@ app.include_router(auth.router)
 app.include_router(photos.router)
 app.include_router(worldcup.router)
 app.include_router(share.router)
+app.include_router(admin.router)
 
 # 정적 파일 서빙
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
@@ -72,10 +78,32 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 @app.on_event("startup")
 async def startup_event():
     logger.info("MyCup API 서버 시작")
+    
+    # DB 커넥션 풀 미리 채우기 (실패해도 서버는 시작, 첫 요청 시 연결)
+    try:
+        opened = await warm_up_pool()
+        logger.info(f"DB 커넥션 풀 준비 완료: {opened}개")
+    except Exception as e:
+        logger.error(f"DB 커넥션 풀 준비 실패: {e}")
+    
+    # 투표 write-behind 버퍼 (opt-in)
+    if settings.vote_buffer_enabled:
+        vote_buffer.start()
+        logger.info("투표 배치 저장 모드 사용")
+    
+    # 공개 월드컵 인기순 점수 반영/감쇠
+    trending_updater.start()
+    
+    # 전체 로그아웃한 유저의 토큰 무효화 목록 (인증 시 DB 조회 대신)
+    await token_revocations.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("MyCup API 서버 종료")
+    await vote_buffer.stop()  # 버퍼에 남은 투표 저장
+    await trending_updater.stop()  # 모아 둔 투표를 인기순 점수에 반영
+    await token_revocations.stop()
+    await dispose_engines()
 # ==========================
 
 @app.get("/health")
@@ -85,3 +113,8 @@ def health_check():
         "status": "healthy",
         "service": settings.app_name
     }
+
+@app.get("/health/db")
+async def db_pool_health(admin: Principal = Depends(get_admin_user)):
+    """DB 커넥션 풀 현황 (워커 단위, 관리자만 - 풀 내부 정보는 외부에 노출하지 않음)"""
+    return get_pool_status()
@@ -0,0 +1,95 @@
+# scripts/backfill_content_hashes.py
+"""
+기존 사진의 content_hash와 content_analyses 채우기 (d4a8f6c3e917 마이그레이션 이후 한 번)
+
+content_hash가 없는 사진을 BATCH_SIZE개씩 (id 순 keyset) 읽어 파일 SHA-256을 저장하고,
+이미 분석 결과가 있는 사진은 그 결과를 content_analyses에 넣음 (같은 해시는 처음 것만)
+- 파일이 없는 사진은 건너뜀 (content_hash는 NULL로 남고 기존처럼 사진 단위로만 캐시)
+- 중간에 멈춰도 다시 실행하면 남은 사진부터
+실행: uv run python scripts/backfill_content_hashes.py
+"""
+import asyncio
+import hashlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import SessionLocal, dispose_engines
+from app.models.photo import Photo
+from app.models.content_analysis import ContentAnalysis
+
+BATCH_SIZE = 500
+
+
+def file_sha256(path: str) -> str | None:
+    """파일 SHA-256 (hex), 파일이 없으면 None"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+async def backfill() -> tuple[int, int, int]:
+    hashed = missing = analyses = 0
+    last_id = ""
+
+    while True:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Photo.id, Photo.file_path, Photo.analysis_result)
+                .where(Photo.content_hash.is_(None), Photo.id > last_id)
+                .order_by(Photo.id)
+                .limit(BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            # 파일 읽기/해시는 스레드에서 (이벤트 루프 블로킹 방지)
+            hashes = await asyncio.gather(*[asyncio.to_thread(file_sha256, row.file_path) for row in rows])
+
+            updates, known = [], {}
+            for row, content_hash in zip(rows, hashes):
+                if content_hash is None:
+                    missing += 1
+                    continue
+                updates.append({"id": row.id, "content_hash": content_hash})
+                if row.analysis_result and content_hash not in known:
+                    known[content_hash] = row.analysis_result
+
+            # 기본 키 기준 일괄 UPDATE (executemany)
+            if updates:
+                await db.execute(update(Photo), updates)
+                hashed += len(updates)
+
+            if known:
+                result = await db.execute(
+                    insert(ContentAnalysis)
+                    .values([{"content_hash": h, "result": r} for h, r in known.items()])
+                    .on_conflict_do_nothing()
+                    .returning(ContentAnalysis.content_hash)
+                )
+                analyses += len(result.all())
+            await db.commit()
+
+        print(f"사진 {hashed}장 해시, 파일 없음 {missing}장, 분석 결과 {analyses}개 등록")
+
+    return hashed, missing, analyses
+
+
+async def main():
+    try:
+        hashed, missing, analyses = await backfill()
+    finally:
+        await dispose_engines()
+    print(f"완료: 해시 {hashed}장, 파일 없음 {missing}장, content_analyses {analyses}개")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
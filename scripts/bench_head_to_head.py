@@ -0,0 +1,139 @@
+# scripts/bench_head_to_head.py
+"""
+브라켓 재현 투표 맞대결(GET /api/v1/worldcup/{id}/votes/head-to-head) 벤치마크
+
+16강 완료 월드컵 하나에 브라켓 재현 투표 VOTES개를 채우고
+- 투표 한 건 저장 크기 비교 (bracket_mask vs 순위 JSON)
+- 맞대결 조회 시간: cold(처음부터), cached(새 투표 없음), incremental(새 투표 DELTA개)
+- 증분 행렬이 처음부터 계산한 행렬, 파이썬으로 브라켓을 하나씩 진행한 결과와 같은지 확인
+한 뒤 생성한 데이터 삭제
+실행: uv run python scripts/bench_head_to_head.py [VOTES] [DELTA]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import delete, text
+
+from app.config import settings
+from app.database import SessionLocal, dispose_engines
+from app.models.user import User
+from app.models.photo import Photo
+from app.models.worldcup import Worldcup, WorldcupStatus
+from app.services import pairwise_service
+from app.services.worldcup_service import TournamentBracket
+
+VOTES = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+DELTA = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+ROUND = 16
+
+# 투표 k의 마스크 (15비트, 투표마다 다르게)
+VOTE_SQL = """
+INSERT INTO votes (id, worldcup_id, ip_address, bracket_mask, created_at)
+SELECT CAST(:worldcup_id AS varchar) || '-' || k, :worldcup_id, 'ip-' || k, CAST(k AS bigint) * 7919 % 32768, now()
+FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) k
+"""
+COUNTER_SQL = """
+INSERT INTO vote_counters (worldcup_id, shard, count) VALUES (:worldcup_id, 0, :count)
+ON CONFLICT (worldcup_id, shard) DO UPDATE SET count = vote_counters.count + excluded.count
+"""
+ROW_SIZE_SQL = """
+SELECT pg_column_size(CAST(:mask AS int)), pg_column_size(CAST(:rankings AS json))
+"""
+
+
+async def seed() -> tuple[str, Worldcup]:
+    """테스트용 유저 + 사진 16장 + 완료된 16강 월드컵 (브라켓 포함)"""
+    async with SessionLocal() as db:
+        user = User(email=f"h2h-bench-{uuid.uuid4().hex[:8]}@example.com", username="h2h-bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        photos = [
+            Photo(user_id=user.id, filename=f"{i}.jpg", file_path=f"uploads/{i}.jpg", url=f"/uploads/{i}.jpg", file_size="1024")
+            for i in range(ROUND)
+        ]
+        db.add_all(photos)
+        await db.flush()
+
+        worldcup = Worldcup(user_id=user.id, round_type=ROUND, status=WorldcupStatus.COMPLETED)
+        db.add(worldcup)
+        await db.flush()
+        bracket = TournamentBracket(worldcup.id, [photo.id for photo in photos], [photo.url for photo in photos])
+        worldcup.bracket = bracket.to_dict()
+
+        await db.commit()
+        return user.id, worldcup
+
+
+async def add_votes(worldcup_id: str, start: int, stop: int):
+    """start ~ stop번 투표 추가"""
+    async with SessionLocal() as db:
+        await db.execute(text(VOTE_SQL), {"worldcup_id": worldcup_id, "start": start, "stop": stop})
+        await db.execute(text(COUNTER_SQL), {"worldcup_id": worldcup_id, "count": stop - start + 1})
+        await db.commit()
+
+
+async def timed_wins(label: str, worldcup: Worldcup) -> np.ndarray:
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        wins, replay_votes = await pairwise_service.get_pairwise_wins(db, worldcup)
+        print(f"{label:<12} {(time.perf_counter() - started) * 1000:>9.1f}ms  replay votes={replay_votes}")
+        return wins
+
+
+def brute_force(worldcup: Worldcup, masks: range) -> np.ndarray:
+    """파이썬으로 브라켓을 하나씩 진행해 승수 행렬 계산"""
+    entrants = worldcup.bracket["entrants"]
+    wins = np.zeros((ROUND, ROUND), dtype=np.int64)
+    for k in masks:
+        bracket = TournamentBracket.from_replay(worldcup, k * 7919 % 32768)
+        for node in range(1, ROUND):
+            photo_a, photo_b = bracket.players(node)
+            winner = bracket.winner_of(node)
+            loser = photo_b if winner == photo_a else photo_a
+            wins[entrants.index(winner), entrants.index(loser)] += 1
+    return wins
+
+
+async def main():
+    # 벤치에서는 방금 넣은 투표도 바로 누적 대상으로 (실제로는 vote_late_slack_seconds 뒤부터)
+    settings.vote_late_slack_seconds = 0
+
+    user_id, worldcup = await seed()
+    try:
+        # 투표 한 건 결과 저장 크기 (16강 전체 순위 JSON vs 마스크)
+        rankings = [{"photo_id": photo_id, "rank": rank} for rank, photo_id in enumerate(worldcup.bracket["entrants"], start=1)]
+        async with SessionLocal() as db:
+            mask_size, json_size = (await db.execute(text(ROW_SIZE_SQL), {"mask": 12345, "rankings": json.dumps(rankings)})).one()
+        print(f"vote result size: bracket_mask {mask_size}B vs rankings JSON {json_size}B")
+
+        await add_votes(worldcup.id, 1, VOTES)
+        async with SessionLocal() as db:
+            await db.execute(text("ANALYZE votes"))  # 대량 INSERT 후 autovacuum이 하는 통계 갱신
+        await timed_wins("cold", worldcup)
+        await timed_wins("cached", worldcup)
+
+        await add_votes(worldcup.id, VOTES + 1, VOTES + DELTA)
+        incremental = await timed_wins("incremental", worldcup)
+
+        pairwise_service._cache.pop(worldcup.id)
+        full = await timed_wins("full", worldcup)
+        assert (incremental == full).all()
+        assert (full == brute_force(worldcup, range(1, VOTES + DELTA + 1))).all()
+        print("OK: 증분 행렬 == 처음부터 계산한 행렬 == 브라켓 하나씩 진행한 결과")
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
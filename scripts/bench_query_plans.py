@@ -0,0 +1,221 @@
+# scripts/bench_query_plans.py
+"""
+핫 쿼리 실행 계획 점검 (인덱스 회귀 방지)
+
+별도 스키마(bench_plans)에 모델 그대로 테이블/인덱스를 만들고 실제 규모에 가까운
+데이터를 채운 뒤 (VACUUM ANALYZE까지) EXPLAIN ANALYZE로 각 핫 쿼리가 기대한
+인덱스를 타는지 확인, 끝나면 스키마째 삭제 (기존 데이터는 건드리지 않음)
+실행: uv run python scripts/bench_query_plans.py
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, func, tuple_, text
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.database import Base
+import app.models  # noqa: F401 (모든 테이블 등록)
+from app.models.user import User
+from app.models.photo import Photo
+from app.models.worldcup import Worldcup
+from app.models.match import Match
+from app.models.share import Share
+from app.models.vote import Vote
+from app.models.vote_ranking import VoteRanking
+from app.services import vote_service
+
+USERS = 2_000
+PHOTOS_PER_USER = 50
+WORLDCUPS = 20_000
+VOTES_PER_WORLDCUP = 10
+VIRAL_VOTES = 100_000  # 인기 월드컵 하나 (bench-w-1)의 투표 수
+SCHEMA = "bench_plans"
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (id, email, username, hashed_password, worldcup_count, monthly_worldcup_count)
+    SELECT 'bench-u-' || u, 'bench-' || u || '@example.com', 'bench' || u, 'x', 0, 0
+    FROM generate_series(1, {USERS}) u
+    """,
+    f"""
+    INSERT INTO photos (id, user_id, filename, file_path, url, file_size, uploaded_at)
+    SELECT 'bench-p-' || u || '-' || k, 'bench-u-' || u, k || '.jpg', 'uploads/' || k || '.jpg',
+           '/uploads/' || k || '.jpg', '1024', now() - (k || ' minutes')::interval
+    FROM generate_series(1, {USERS}) u, generate_series(1, {PHOTOS_PER_USER}) k
+    """,
+    f"""
+    INSERT INTO worldcups (id, user_id, round_type, status, created_at)
+    SELECT 'bench-w-' || w, 'bench-u-' || (w % {USERS} + 1), 4, 'COMPLETED', now() - (w || ' seconds')::interval
+    FROM generate_series(1, {WORLDCUPS}) w
+    """,
+    f"""
+    INSERT INTO matches (id, worldcup_id, round_number, match_order, photo_a_id, photo_b_id, winner_photo_id)
+    SELECT 'bench-m-' || w || '-' || k, 'bench-w-' || w, CASE WHEN k = 3 THEN 2 ELSE 1 END, CASE WHEN k = 2 THEN 2 ELSE 1 END,
+           'bench-p-' || (w % {USERS} + 1) || '-' || k, 'bench-p-' || (w % {USERS} + 1) || '-' || (k + 1),
+           'bench-p-' || (w % {USERS} + 1) || '-' || k
+    FROM generate_series(1, {WORLDCUPS}) w, generate_series(1, 3) k
+    """,
+    f"""
+    INSERT INTO shares (id, worldcup_id, user_id, is_public, created_at, trending_score, trending_decayed_at)
+    SELECT 'b' || w, 'bench-w-' || w, 'bench-u-' || (w % {USERS} + 1), w % 5 <> 0, now() - (w || ' seconds')::interval,
+           CASE WHEN w % 20 = 1 THEN w % 997 + 0.5 ELSE 0 END, now() - interval '1 hour'
+    FROM generate_series(1, {WORLDCUPS}) w
+    """,
+    f"""
+    INSERT INTO votes (id, worldcup_id, ip_address, rankings)
+    SELECT 'bench-v-' || w || '-' || k, 'bench-w-' || w, '10.0.' || (w % 250) || '.' || k, '[]'
+    FROM generate_series(1, {WORLDCUPS}) w, generate_series(1, {VOTES_PER_WORLDCUP}) k
+    """,
+    f"""
+    INSERT INTO vote_counters (worldcup_id, shard, count)
+    SELECT 'bench-w-' || w, k, 1
+    FROM generate_series(1, {WORLDCUPS}) w, generate_series(0, {VOTES_PER_WORLDCUP} - 1) k
+    """,
+    f"""
+    INSERT INTO vote_rankings (vote_id, photo_id, worldcup_id, rank)
+    SELECT 'bench-v-' || w || '-' || k, 'bench-p-' || (w % {USERS} + 1) || '-' || r, 'bench-w-' || w, r
+    FROM generate_series(1, {WORLDCUPS}) w, generate_series(1, {VOTES_PER_WORLDCUP}) k, generate_series(1, 4) r
+    """,
+    f"""
+    INSERT INTO votes (id, worldcup_id, ip_address, rankings)
+    SELECT 'bench-vv-' || k, 'bench-w-1', 'viral-' || k, '[]'
+    FROM generate_series(1, {VIRAL_VOTES}) k
+    """,
+    f"""
+    INSERT INTO vote_rankings (vote_id, photo_id, worldcup_id, rank)
+    SELECT 'bench-vv-' || k, 'bench-p-2-' || r, 'bench-w-1', (k + r) % 4 + 1
+    FROM generate_series(1, {VIRAL_VOTES}) k, generate_series(1, 4) r
+    """,
+    "VACUUM ANALYZE",
+]
+
+
+def hot_queries(conn) -> list[tuple[str, object, str]]:
+    """(이름, 쿼리, 기대 인덱스) 목록 - 라우트에서 실행하는 쿼리와 같은 형태"""
+    share = conn.execute(
+        select(Share.created_at, Share.id).where(Share.is_public == True)
+        .order_by(Share.created_at.desc(), Share.id.desc()).offset(5_000).limit(1)
+    ).one()
+    photo = conn.execute(
+        select(Photo.uploaded_at, Photo.id).where(Photo.user_id == "bench-u-7")
+        .order_by(Photo.uploaded_at.desc(), Photo.id.desc()).offset(20).limit(1)
+    ).one()
+    trending = conn.execute(
+        select(Share.trending_score, Share.id).where(Share.is_public == True)
+        .order_by(Share.trending_score.desc(), Share.id.desc()).offset(500).limit(1)
+    ).one()
+    vote = conn.execute(
+        select(Vote.created_at, Vote.id).where(Vote.worldcup_id == "bench-w-1")
+        .order_by(Vote.created_at, Vote.id).offset(50_000).limit(1)
+    ).one()
+
+    feed = (
+        select(
+            Share.id, Share.created_at, Worldcup.id, Worldcup.round_type, User.username,
+            vote_service.vote_count_subquery(Worldcup.id)
+        )
+        .join(Worldcup, Worldcup.id == Share.worldcup_id)
+        .join(User, User.id == Share.user_id)
+        .where(Share.is_public == True)
+        .order_by(Share.created_at.desc(), Share.id.desc())
+        .limit(21)
+    )
+    trending_feed = feed.order_by(None).order_by(Share.trending_score.desc(), Share.id.desc())
+    trending_decay = select(Share.id).where(
+        Share.is_public == True, Share.trending_score > 0, Share.trending_decayed_at < func.now()
+    )
+    photos = (
+        select(Photo)
+        .where(Photo.user_id == "bench-u-7")
+        .order_by(Photo.uploaded_at.desc(), Photo.id.desc())
+        .limit(21)
+    )
+
+    vote_export = (
+        select(Vote.id, Vote.created_at, Vote.user_id, Vote.rankings)
+        .where(Vote.worldcup_id == "bench-w-1", tuple_(Vote.created_at, Vote.id) > tuple_(*vote))
+        .order_by(Vote.created_at, Vote.id)
+    )
+    rank_stats = (
+        select(VoteRanking.photo_id, VoteRanking.rank, func.count())
+        .where(VoteRanking.worldcup_id == "bench-w-1", VoteRanking.rank <= 4)
+        .group_by(VoteRanking.photo_id, VoteRanking.rank)
+        .order_by(VoteRanking.photo_id)
+    )
+
+    return [
+        ("public feed (first page)", feed, "idx_shares_public_created"),
+        ("public feed (cursor)", feed.where(tuple_(Share.created_at, Share.id) < tuple_(*share)), "idx_shares_public_created"),
+        ("public feed vote count", feed, "vote_counters_pkey"),
+        ("trending feed (first page)", trending_feed, "idx_shares_public_trending"),
+        ("trending feed (cursor)", trending_feed.where(tuple_(Share.trending_score, Share.id) < tuple_(*trending)), "idx_shares_public_trending"),
+        ("trending decay targets", trending_decay, "idx_shares_public_trending"),
+        ("my photos (first page)", photos, "idx_photos_user_uploaded"),
+        ("my photos (cursor)", photos.where(tuple_(Photo.uploaded_at, Photo.id) < tuple_(*photo)), "idx_photos_user_uploaded"),
+        ("duplicate vote check", select(Vote.id).where(Vote.worldcup_id == "bench-w-42", Vote.ip_address == "10.0.42.3").limit(1), "uq_votes_worldcup_ip"),
+        ("vote stats (100k votes)", rank_stats, "idx_vote_rankings_worldcup_photo_rank"),
+        ("vote analytics new votes", select(Vote.id).where(Vote.worldcup_id == "bench-w-1", Vote.created_at > datetime.now(timezone.utc)), "idx_votes_worldcup_created"),
+        ("vote export (cursor)", vote_export, "idx_votes_worldcup_created"),
+        ("existing share link", select(Share).where(Share.worldcup_id == "bench-w-42", Share.user_id == "bench-u-43"), "idx_shares_worldcup_user"),
+        ("worldcup matches", select(Match).where(Match.worldcup_id == "bench-w-42"), "idx_matches_worldcup_id"),
+    ]
+
+
+def plan_nodes(node: dict):
+    """실행 계획 트리를 평탄화"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, query) -> dict:
+    compiled = query.compile(dialect=postgresql.psycopg2.dialect())
+    return conn.exec_driver_sql(
+        "EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) " + compiled.string, compiled.params
+    ).scalar()[0]
+
+
+def main():
+    # search_path를 벤치 스키마로 고정 (VACUUM을 위해 autocommit)
+    engine = create_engine(
+        settings.database_url,
+        isolation_level="AUTOCOMMIT",
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    failures = []
+
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        try:
+            Base.metadata.create_all(conn)
+            for sql in SEED_SQL:
+                conn.execute(text(sql))
+
+            for name, query, expected_index in hot_queries(conn):
+                plan = explain(conn, query)
+                nodes = list(plan_nodes(plan["Plan"]))
+                indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+                seq_scans = {n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}
+
+                ok = expected_index in indexes and not seq_scans
+                if not ok:
+                    failures.append(name)
+                print(
+                    f"{'OK  ' if ok else 'FAIL'} {name:<28} {plan['Execution Time']:>8.3f}ms  "
+                    f"indexes={sorted(indexes)}" + (f"  seq_scan={sorted(seq_scans)}" if seq_scans else "")
+                )
+        finally:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))  # 시드 데이터 제거
+
+    if failures:
+        raise SystemExit(f"인덱스를 타지 않는 쿼리: {failures}")
+    print("OK: 모든 핫 쿼리가 인덱스 스캔 사용")
+
+
+if __name__ == "__main__":
+    main()
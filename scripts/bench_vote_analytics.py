@@ -0,0 +1,149 @@
+# scripts/bench_vote_analytics.py
+"""
+투표 분석(GET /api/v1/worldcup/{id}/votes/analytics) 계산 시간 벤치마크
+
+16강 완료 월드컵 하나에 VOTES개 투표(투표당 4위까지)를 채우고 다음 경우의 시간을 측정,
+증분 계산 결과가 처음부터 계산한 결과와 같은지 확인한 뒤 생성한 데이터 삭제
+- cold: 캐시/스냅샷 없이 처음부터
+- cached: 새 투표 없음
+- incremental: 새 투표 DELTA개
+- snapshot: 워커 메모리 캐시 없이 스냅샷 + 새 투표
+실행: uv run python scripts/bench_vote_analytics.py [VOTES] [DELTA]
+"""
+import asyncio
+import math
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text
+
+from app.config import settings
+from app.database import SessionLocal, dispose_engines
+from app.models.user import User
+from app.models.photo import Photo
+from app.models.worldcup import Worldcup, WorldcupStatus
+from app.models.ranking import WorldcupRanking
+from app.models.vote_analytics import VoteAnalytics
+from app.services import analytics_service
+
+VOTES = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+DELTA = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+ROUND = 16
+
+# 투표 k의 r위 사진 번호 (투표마다 다른 순서, 앞쪽 사진이 조금 더 높은 순위를 받도록)
+VOTE_SQL = """
+INSERT INTO votes (id, worldcup_id, ip_address, rankings, created_at)
+SELECT CAST(:worldcup_id AS varchar) || '-' || k, :worldcup_id, 'ip-' || k, '[]', now()
+FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) k
+"""
+VOTE_RANKING_SQL = """
+INSERT INTO vote_rankings (vote_id, worldcup_id, photo_id, rank)
+SELECT CAST(:worldcup_id AS varchar) || '-' || k, :worldcup_id, (CAST(:photo_ids AS varchar[]))[(k * 7 + r * 5 + (k % 3) * r) % 16 + 1], r
+FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) k, generate_series(1, 4) r
+"""
+COUNTER_SQL = """
+INSERT INTO vote_counters (worldcup_id, shard, count) VALUES (:worldcup_id, 0, :count)
+ON CONFLICT (worldcup_id, shard) DO UPDATE SET count = vote_counters.count + excluded.count
+"""
+
+
+async def seed() -> tuple[str, Worldcup, list[str]]:
+    """테스트용 유저 + 사진 16장 + 완료된 16강 월드컵"""
+    async with SessionLocal() as db:
+        user = User(email=f"analytics-bench-{uuid.uuid4().hex[:8]}@example.com", username="analytics-bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        photos = [
+            Photo(user_id=user.id, filename=f"{i}.jpg", file_path=f"uploads/{i}.jpg", url=f"/uploads/{i}.jpg", file_size="1024")
+            for i in range(ROUND)
+        ]
+        db.add_all(photos)
+        await db.flush()
+
+        photo_ids = [photo.id for photo in photos]
+        worldcup = Worldcup(user_id=user.id, round_type=ROUND, status=WorldcupStatus.COMPLETED, bracket={"entrants": photo_ids})
+        db.add(worldcup)
+        await db.flush()
+        db.add_all([
+            WorldcupRanking(worldcup_id=worldcup.id, photo_id=photo_id, rank=rank)
+            for photo_id, rank in zip(photo_ids, [1, 2, 3, 3] + [5] * 4 + [9] * 8)
+        ])
+
+        await db.commit()
+        return user.id, worldcup, photo_ids
+
+
+async def add_votes(worldcup_id: str, photo_ids: list[str], start: int, stop: int):
+    """start ~ stop번 투표 추가"""
+    async with SessionLocal() as db:
+        params = {"worldcup_id": worldcup_id, "photo_ids": photo_ids, "start": start, "stop": stop}
+        await db.execute(text(VOTE_SQL), params)
+        await db.execute(text(VOTE_RANKING_SQL), params)
+        await db.execute(text(COUNTER_SQL), {"worldcup_id": worldcup_id, "count": stop - start + 1})
+        await db.commit()
+
+
+async def timed_analytics(label: str, worldcup: Worldcup) -> dict:
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        result = await analytics_service.get_vote_analytics(db, worldcup)
+        print(f"{label:<12} {(time.perf_counter() - started) * 1000:>9.1f}ms  votes={result['total_votes']}")
+        return result
+
+
+async def reset(worldcup_id: str):
+    """워커 캐시 + 스냅샷 삭제"""
+    analytics_service._cache.pop(worldcup_id)
+    async with SessionLocal() as db:
+        await db.execute(delete(VoteAnalytics).where(VoteAnalytics.worldcup_id == worldcup_id))
+        await db.commit()
+
+
+def assert_same(a: dict, b: dict):
+    """증분 결과 == 처음부터 계산한 결과 (부동소수 합 순서 차이만 허용)"""
+    assert a["total_votes"] == b["total_votes"], (a["total_votes"], b["total_votes"])
+    for x, y in zip(a["photos"] + [a["owner_agreement"]], b["photos"] + [b["owner_agreement"]]):
+        for key in x:
+            if isinstance(x[key], float):
+                assert math.isclose(x[key], y[key], abs_tol=1e-3), (key, x, y)
+            else:
+                assert x[key] == y[key], (key, x, y)
+
+
+async def main():
+    # 벤치에서는 방금 넣은 투표도 바로 누적 대상으로 (실제로는 vote_late_slack_seconds 뒤부터)
+    settings.vote_late_slack_seconds = 0
+
+    user_id, worldcup, photo_ids = await seed()
+    try:
+        await add_votes(worldcup.id, photo_ids, 1, VOTES)
+        async with SessionLocal() as db:
+            await db.execute(text("ANALYZE votes, vote_rankings"))  # 대량 INSERT 후 autovacuum이 하는 통계 갱신
+        await timed_analytics("cold", worldcup)
+        await timed_analytics("cached", worldcup)
+
+        await add_votes(worldcup.id, photo_ids, VOTES + 1, VOTES + DELTA)
+        await timed_analytics("incremental", worldcup)
+
+        await add_votes(worldcup.id, photo_ids, VOTES + DELTA + 1, VOTES + 2 * DELTA)
+        analytics_service._cache.pop(worldcup.id)
+        incremental = await timed_analytics("snapshot", worldcup)
+
+        await reset(worldcup.id)
+        full = await timed_analytics("full", worldcup)
+        assert_same(incremental, full)
+        print("OK: 증분 계산 결과가 처음부터 계산한 결과와 같음")
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
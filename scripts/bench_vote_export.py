@@ -0,0 +1,118 @@
+# scripts/bench_vote_export.py
+"""
+투표 내보내기(GET /api/v1/worldcup/{id}/votes/export) 메모리 사용량 벤치마크
+
+완료된 월드컵 하나에 투표를 단계별로(기본 10k → 100k → 300k) 채우면서 NDJSON/CSV 전체를 내보내는 동안의
+파이썬 메모리 최대 사용량(tracemalloc)과 처리 속도를 측정 (투표 수와 관계없이 비슷해야 함),
+중간 cursor로 이어받은 결과가 끊김/중복 없이 이어지는지 확인한 뒤 생성한 데이터 삭제
+실행: uv run python scripts/bench_vote_export.py [VOTES ...]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text
+
+from app.database import SessionLocal, dispose_engines
+from app.models.user import User
+from app.models.photo import Photo
+from app.models.worldcup import Worldcup, WorldcupStatus
+from app.services import vote_export
+
+STEPS = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 300_000]
+
+VOTE_SQL = """
+INSERT INTO votes (id, worldcup_id, ip_address, rankings, created_at)
+SELECT CAST(:worldcup_id AS varchar) || '-' || k, :worldcup_id, 'ip-' || k,
+       CAST('[{"photo_id": "' || (CAST(:photo_ids AS varchar[]))[k % 4 + 1] || '", "rank": 1}]' AS json),
+       now() - make_interval(secs => CAST(:stop AS int) - k)
+FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) k
+"""
+
+
+async def seed() -> tuple[str, str, list[str]]:
+    """테스트용 유저 + 사진 4장 + 완료된 월드컵"""
+    async with SessionLocal() as db:
+        user = User(email=f"export-bench-{uuid.uuid4().hex[:8]}@example.com", username="export-bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        photos = [
+            Photo(user_id=user.id, filename=f"{i}.jpg", file_path=f"uploads/{i}.jpg", url=f"/uploads/{i}.jpg", file_size="1024")
+            for i in range(4)
+        ]
+        db.add_all(photos)
+        await db.flush()
+
+        worldcup = Worldcup(user_id=user.id, round_type=4, status=WorldcupStatus.COMPLETED)
+        db.add(worldcup)
+        await db.commit()
+        return user.id, worldcup.id, [photo.id for photo in photos]
+
+
+async def add_votes(worldcup_id: str, photo_ids: list[str], start: int, stop: int):
+    """start ~ stop번 투표 추가 (번호 순서대로 created_at 증가)"""
+    async with SessionLocal() as db:
+        await db.execute(text(VOTE_SQL), {"worldcup_id": worldcup_id, "photo_ids": photo_ids, "start": start, "stop": stop})
+        await db.commit()
+
+
+async def measure(worldcup_id: str, export_format: str) -> tuple[int, float, int]:
+    """(내보낸 바이트 수, 걸린 시간, 파이썬 메모리 최대 사용량) - 받은 덩어리는 바로 버림"""
+    size = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    async for chunk in vote_export.export_votes(worldcup_id, export_format):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def check_resume(worldcup_id: str, total: int):
+    """중간 cursor로 이어받으면 나머지 투표만 순서대로 나오는지"""
+    lines = []
+    async for chunk in vote_export.export_votes(worldcup_id, "ndjson"):
+        lines.extend(chunk.splitlines())
+    first = [json.loads(line) for line in lines]
+    assert len(first) == total, (len(first), total)
+
+    cut = total // 3
+    resumed = []
+    async for chunk in vote_export.export_votes(worldcup_id, "ndjson", cursor=first[cut - 1]["cursor"]):
+        resumed.extend(json.loads(line) for line in chunk.splitlines())
+    assert [vote["vote_id"] for vote in resumed] == [vote["vote_id"] for vote in first[cut:]]
+    print(f"OK: cursor 이어받기 ({cut}번째 이후 {len(resumed)}개)")
+
+
+async def main():
+    user_id, worldcup_id, photo_ids = await seed()
+    try:
+        stored = 0
+        for votes in STEPS:
+            await add_votes(worldcup_id, photo_ids, stored + 1, votes)
+            stored = votes
+            for export_format in ("ndjson", "csv"):
+                size, elapsed, peak = await measure(worldcup_id, export_format)
+                print(
+                    f"{votes:>8} votes {export_format:<6} {size / 1e6:>7.1f}MB  "
+                    f"{votes / elapsed:>8.0f} rows/s  peak memory {peak / 1e6:.2f}MB"
+                )
+
+        await check_resume(worldcup_id, stored)
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
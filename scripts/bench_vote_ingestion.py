@@ -0,0 +1,136 @@
+# scripts/bench_vote_ingestion.py
+"""
+투표 저장 처리량 벤치마크 (요청마다 커밋 vs write-behind 배치 저장)
+
+완료된 월드컵을 모드별로 하나씩 만들고 POST /api/v1/worldcup/{id}/vote에 서로 다른 IP로
+VOTES개를 CONCURRENCY개씩 동시에 보내 초당 처리 투표 수를 비교, 끝나면 생성한 데이터 삭제
+- 배치 모드는 응답 기준(ack)과 마지막 flush까지 끝난 시점(durable) 두 가지로 측정
+실행: uv run python scripts/bench_vote_ingestion.py [VOTES] [CONCURRENCY]
+"""
+import asyncio
+import itertools
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import select, func, delete
+
+from main import app
+from app.core.logger import logger
+from app.database import SessionLocal, dispose_engines
+from app.models.user import User
+from app.models.photo import Photo
+from app.models.worldcup import Worldcup, WorldcupStatus
+from app.models.ranking import WorldcupRanking
+from app.models.vote import Vote
+from app.services import vote_service
+from app.services.vote_buffer import vote_buffer
+
+VOTES = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+
+def with_unique_client_ip(asgi_app):
+    """요청마다 다른 클라이언트 IP로 보이게 (IP당 한 표라서)"""
+    counter = itertools.count(1)
+
+    async def wrapped(scope, receive, send):
+        if scope["type"] == "http":
+            n = next(counter)
+            scope = {**scope, "client": (f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", 0)}
+        await asgi_app(scope, receive, send)
+
+    return wrapped
+
+
+async def seed() -> tuple[str, list[str], list[str]]:
+    """테스트용 유저 + 사진 4장 + 완료된 월드컵 2개 (모드별)"""
+    async with SessionLocal() as db:
+        user = User(email=f"vote-bench-{uuid.uuid4().hex[:8]}@example.com", username="vote-bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        photos = [
+            Photo(user_id=user.id, filename=f"{i}.jpg", file_path=f"uploads/{i}.jpg", url=f"/uploads/{i}.jpg", file_size="1024")
+            for i in range(4)
+        ]
+        db.add_all(photos)
+        await db.flush()
+
+        worldcup_ids = []
+        for _ in range(2):
+            worldcup = Worldcup(user_id=user.id, round_type=4, status=WorldcupStatus.COMPLETED)
+            db.add(worldcup)
+            await db.flush()
+            db.add_all([
+                WorldcupRanking(worldcup_id=worldcup.id, photo_id=photo.id, rank=rank)
+                for photo, rank in zip(photos, [1, 2, 3, 3])
+            ])
+            worldcup_ids.append(worldcup.id)
+
+        await db.commit()
+        return user.id, worldcup_ids, [photo.id for photo in photos]
+
+
+async def cleanup(user_id: str):
+    """생성한 데이터 삭제 (CASCADE)"""
+    async with SessionLocal() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def send_votes(client: httpx.AsyncClient, worldcup_id: str, photo_ids: list[str]) -> None:
+    """VOTES개 투표를 CONCURRENCY개씩 동시에 보냄"""
+    rankings = [{"photo_id": photo_id, "rank": rank} for rank, photo_id in enumerate(photo_ids, start=1)]
+    remaining = iter(range(VOTES))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.post(f"/api/v1/worldcup/{worldcup_id}/vote", json=rankings)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+
+async def stored_votes(worldcup_id: str) -> tuple[int, int]:
+    """(votes 행 수, 카운터 합계)"""
+    async with SessionLocal() as db:
+        rows = await db.scalar(select(func.count()).select_from(Vote).where(Vote.worldcup_id == worldcup_id))
+        return rows, await vote_service.get_vote_count(db, worldcup_id)
+
+
+async def main():
+    logger.remove()  # 요청 로그 끄기
+    user_id, (sync_worldcup, buffered_worldcup), photo_ids = await seed()
+    transport = httpx.ASGITransport(app=with_unique_client_ip(app))
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # 1) 요청마다 커밋
+            started = time.perf_counter()
+            await send_votes(client, sync_worldcup, photo_ids)
+            elapsed = time.perf_counter() - started
+            assert await stored_votes(sync_worldcup) == (VOTES, VOTES)
+            print(f"per-request commit   {VOTES / elapsed:>8.0f} votes/s  ({elapsed:.2f}s)")
+
+            # 2) write-behind 배치 저장
+            vote_buffer.start()
+            started = time.perf_counter()
+            await send_votes(client, buffered_worldcup, photo_ids)
+            acked = time.perf_counter() - started
+            await vote_buffer.stop()  # 남은 투표 flush
+            saved = time.perf_counter() - started
+            assert await stored_votes(buffered_worldcup) == (VOTES, VOTES)
+            print(f"write-behind (ack)   {VOTES / acked:>8.0f} votes/s  ({acked:.2f}s)")
+            print(f"write-behind (saved) {VOTES / saved:>8.0f} votes/s  ({saved:.2f}s)")
+    finally:
+        await cleanup(user_id)
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+# scripts/check_public_feed_queries.py
+"""
+공개 월드컵 목록(GET /api/v1/worldcup/public)의 쿼리 수 점검
+
+페이지 크기와 상관없이 실행되는 SQL 문 수가 일정한지 확인 (N+1 회귀 방지)
+각 월드컵의 vote_count가 넣은 투표 수와 같은지도 확인 (투표는 실제 저장 경로로 넣어 카운터까지 채움)
+실행: uv run python scripts/check_public_feed_queries.py
+"""
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, delete
+
+from main import app
+from app.database import engine, SessionLocal
+from app.models.user import User
+from app.models.worldcup import Worldcup
+from app.models.share import Share
+from app.services import vote_service
+
+SHARE_COUNT = 25
+PAGE_SIZES = [1, 5, 20]
+
+
+async def seed() -> tuple[str, dict[str, int]]:
+    """테스트용 유저 + 공개 월드컵 + 투표 생성 (유저 ID, 월드컵 ID -> 넣은 투표 수)"""
+    async with SessionLocal() as db:
+        user = User(
+            email=f"feed-check-{uuid.uuid4().hex[:8]}@example.com",
+            username="feed-check",
+            hashed_password="x"
+        )
+        db.add(user)
+        await db.flush()
+
+        expected_votes = {}
+        votes = []
+        for i in range(SHARE_COUNT):
+            worldcup = Worldcup(user_id=user.id, round_type=4)
+            db.add(worldcup)
+            await db.flush()
+            db.add(Share(worldcup_id=worldcup.id, user_id=user.id, is_public=True))
+            expected_votes[worldcup.id] = i % 4
+            votes += [vote_service.new_vote(worldcup.id, f"10.0.{i}.{j}", []) for j in range(i % 4)]
+
+        # 투표 행 + vote_counters (+ 일별 지표)를 API와 같은 경로로
+        await db.flush()
+        await vote_service.insert_votes(db, votes)
+        await db.commit()
+        return user.id, expected_votes
+
+
+async def cleanup(user_id: str):
+    """생성한 데이터 삭제 (CASCADE)"""
+    async with SessionLocal() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+def main():
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with TestClient(app) as client:
+        user_id, expected_votes = client.portal.call(seed)
+        try:
+            counts = {}
+            for limit in PAGE_SIZES:
+                statements.clear()
+                response = client.get("/api/v1/worldcup/public", params={"limit": limit})
+                assert response.status_code == 200, response.text
+                worldcups = response.json()["worldcups"]
+                assert len(worldcups) == limit
+                for item in worldcups:
+                    # 가장 최근 공유라 첫 페이지는 모두 방금 넣은 월드컵
+                    assert item["worldcup_id"] in expected_votes, item
+                    assert item["vote_count"] == expected_votes[item["worldcup_id"]], item
+                counts[limit] = len(statements)
+                print(f"limit={limit:>3}  statements={counts[limit]}")
+
+            assert len(set(counts.values())) == 1, f"페이지 크기에 따라 쿼리 수가 달라짐: {counts}"
+            print("OK: 쿼리 수가 페이지 크기와 무관하게 일정, vote_count가 넣은 투표 수와 같음")
+        finally:
+            client.portal.call(cleanup, user_id)
+
+
+if __name__ == "__main__":
+    main()